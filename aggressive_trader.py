@@ -9,18 +9,25 @@ Strategy:
 - Macro Correlation Protection (BTC Check) - NEW
 - Spread & Slippage Protection - NEW
 - Wide stops + trailing (let winners run)
+
+Usage: python aggressive_trader.py [--async]
+  --async  concurrent scanner (all symbols fetched in parallel each scan)
 """
 
+import sys
 import time
+import asyncio
 import hmac
 import hashlib
 import base64
 import requests
+import httpx
 import json
 import threading
 from datetime import datetime
 from typing import Optional, Tuple, Dict, List
 from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
 # =============================================================================
 # CONFIGURATION - GOD MODE
@@ -48,6 +55,7 @@ TRAILING_ACTIVATION_PCT = 10.0   # Activate at +10%
 TRAILING_DISTANCE_PCT = 5.0      # Trail by 5%
 MAX_HOLD_TIME = 14400            # 4 hours max per trade
 MAX_CONCURRENT_POSITIONS = 5     
+POSITION_TICK_INTERVAL = 0.5     # Async supervisor: seconds between batched price polls
 
 # All tradeable symbols with BIGGER sizes (~$250-350 per trade)
 SYMBOLS = [
@@ -75,26 +83,25 @@ consecutive_losses = 0
 # API FUNCTIONS
 # =============================================================================
 
-def send_get(path: str, qs: str = "") -> requests.Response:
+def signed_headers(method: str, path: str, payload: str = "") -> dict:
+    """WEEX auth headers; payload is the query string (GET) or JSON body (POST)"""
     ts = str(int(time.time() * 1000))
-    msg = ts + "GET" + path + qs
+    msg = ts + method + path + payload
     sig = base64.b64encode(hmac.new(SECRET_KEY.encode(), msg.encode(), hashlib.sha256).digest()).decode()
-    headers = {
+    return {
         "ACCESS-KEY": API_KEY, "ACCESS-SIGN": sig, "ACCESS-TIMESTAMP": ts,
         "ACCESS-PASSPHRASE": PASSPHRASE, "Content-Type": "application/json", "locale": "en-US"
     }
+
+
+def send_get(path: str, qs: str = "") -> requests.Response:
+    headers = signed_headers("GET", path, qs)
     return requests.get(BASE_URL + path + qs, headers=headers, timeout=30)
 
 
 def send_post(path: str, body: dict) -> requests.Response:
-    ts = str(int(time.time() * 1000))
     body_str = json.dumps(body)
-    msg = ts + "POST" + path + body_str
-    sig = base64.b64encode(hmac.new(SECRET_KEY.encode(), msg.encode(), hashlib.sha256).digest()).decode()
-    headers = {
-        "ACCESS-KEY": API_KEY, "ACCESS-SIGN": sig, "ACCESS-TIMESTAMP": ts,
-        "ACCESS-PASSPHRASE": PASSPHRASE, "Content-Type": "application/json", "locale": "en-US"
-    }
+    headers = signed_headers("POST", path, body_str)
     return requests.post(BASE_URL + path, headers=headers, data=body_str, timeout=30)
 
 
@@ -182,6 +189,83 @@ def upload_ai_log(order_id: int, symbol: str, action: str, reasoning: str, confi
     return safe_json(r)
 
 
+# =============================================================================
+# ASYNC API - SHARED POOLED CLIENT
+# =============================================================================
+
+def build_async_client() -> httpx.AsyncClient:
+    """One keep-alive connection pool shared by every request of the async scanner"""
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        timeout=15,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+    )
+
+
+async def get_json_async(client: httpx.AsyncClient, path: str, params: dict, default):
+    """Public market GET; returns `default` on any failure (like the sync helpers)"""
+    try:
+        r = await client.get(path, params=params)
+        if r.status_code == 200:
+            return r.json()
+    except Exception:
+        pass
+    return default
+
+
+async def get_candles_async(client: httpx.AsyncClient, symbol: str, granularity: str = "1m", limit: int = 50) -> List:
+    return await get_json_async(
+        client, "/capi/v2/market/candles",
+        {"symbol": symbol, "granularity": granularity, "limit": limit}, []
+    )
+
+
+async def get_order_book_async(client: httpx.AsyncClient, symbol: str, limit: int = 20) -> dict:
+    return await get_json_async(client, "/capi/v2/market/depth", {"symbol": symbol, "limit": limit}, {})
+
+
+async def get_price_async(client: httpx.AsyncClient, symbol: str) -> float:
+    ticker = await get_json_async(client, "/capi/v2/market/ticker", {"symbol": symbol}, {})
+    try:
+        return float(ticker.get("last", 0))
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+async def get_all_prices_async(client: httpx.AsyncClient, symbols: List[str]) -> Dict[str, float]:
+    """
+    Last prices for many symbols: one batched /tickers call, falling back to
+    concurrent per-symbol tickers if the batched response is unusable
+    """
+    tickers = await get_json_async(client, "/capi/v2/market/tickers", {}, [])
+    prices = {}
+    if isinstance(tickers, list):
+        for t in tickers:
+            try:
+                prices[t["symbol"]] = float(t["last"])
+            except (KeyError, TypeError, ValueError):
+                continue
+    missing = [s for s in symbols if prices.get(s, 0) <= 0]
+    if missing:
+        fetched = await asyncio.gather(*(get_price_async(client, s) for s in missing))
+        prices.update(zip(missing, fetched))
+    return {s: prices[s] for s in symbols if prices.get(s, 0) > 0}
+
+
+async def get_balance_async(client: httpx.AsyncClient) -> float:
+    path = "/capi/v2/account/assets"
+    try:
+        r = await client.get(path, headers=signed_headers("GET", path))
+        assets = r.json()
+    except Exception:
+        return 0
+    if isinstance(assets, list):
+        for asset in assets:
+            if asset.get("coinName") == "USDT":
+                return float(asset.get("equity", 0))
+    return 0
+
+
 # =============================================================================
 # ADVANCED INDICATORS - GOD MODE
 # =============================================================================
@@ -239,12 +323,18 @@ def calculate_atr(candles: List[dict], period: int = 14) -> float:
     return sum(true_ranges[-period:]) / period if true_ranges else 0
 
 
-def calculate_obi(symbol: str) -> float:
+def calculate_obi(symbol: str, book=None) -> float:
     """
     Calculate Order Book Imbalance (OBI)
     Range: -1.0 (Sell Pressure) to 1.0 (Buy Pressure)
+    
+    `book` can be an already-fetched depth dict or a local OrderBookEngine
+    (backend/data/orderbook_engine.py); only when omitted is depth fetched over HTTP.
     """
-    book = get_order_book(symbol, 20)
+    if hasattr(book, "imbalance"):
+        return book.imbalance(20)
+    if book is None:
+        book = get_order_book(symbol, 20)
     if not book or 'bids' not in book or 'asks' not in book:
         return 0
     
@@ -258,7 +348,11 @@ def calculate_obi(symbol: str) -> float:
 
 def get_btc_trend() -> str:
     """Get the master trend of BTC - Don't fight the king"""
-    candles = get_candles("cmt_btcusdt", "15m", 50)
+    return btc_trend_from_candles(get_candles("cmt_btcusdt", "15m", 50))
+
+
+def btc_trend_from_candles(candles: List) -> str:
+    """BTC macro trend from already-fetched 15m candles"""
     if not candles:
         return "UNCLEAR"
     closes = [float(c[4]) for c in candles]
@@ -286,47 +380,11 @@ def detect_trend(closes: List[float]) -> str:
     return "SIDEWAYS"
 
 
-def analyze_symbol_god_mode(symbol: str) -> Tuple[str, float, str, dict]:
-    """
-    God Mode Analysis:
-    1. 4H Trend (Macro)
-    2. 15m RSI (Pullback)
-    3. BTC Correlation (Market Safety)
-    4. Order Book Imbalance (Microstructure)
-    """
-    btc_trend = get_btc_trend()
-    candles = get_candles(symbol, "5m", 50)
-    
-    if len(candles) < 30:
-        return "HOLD", 0.0, "Insufficient data", {}
-    
-    try:
-        closes = [float(c[4]) for c in candles]
-        volumes = [float(c[5]) for c in candles]
-    except:
-        return "HOLD", 0.0, "Data parse error", {}
-    
-    # Calculate indicators
-    rsi = calculate_rsi(closes)
-    macd_line, signal, macd_hist = calculate_macd(closes)
-    trend = detect_trend(closes)
-    atr = calculate_atr(candles)
-    obi = calculate_obi(symbol)
-    
-    # Volume analysis
-    avg_volume = sum(volumes[-20:]) / 20 if volumes else 1
-    volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 1
-    momentum = ((closes[-1] - closes[-10]) / closes[-10]) * 100 if len(closes) >= 10 else 0
-    
-    indicators = {
-        "rsi": round(rsi, 2),
-        "macd": round(macd_hist, 4),
-        "trend": trend,
-        "btc_trend": btc_trend,
-        "obi": round(obi, 2),
-        "vol_ratio": round(volume_ratio, 2)
-    }
-    
+def score_setup(
+    symbol: str, trend: str, btc_trend: str, rsi: float,
+    obi: float, macd_hist: float, volume_ratio: float
+) -> Tuple[str, float, str]:
+    """God Mode scoring rules shared by the per-symbol and batched analyzers"""
     long_score = 0
     short_score = 0
     reasons = []
@@ -390,9 +448,228 @@ def analyze_symbol_god_mode(symbol: str) -> Tuple[str, float, str, dict]:
     if signal != "HOLD":
         reasoning = " | ".join(reasons)
         
+    return signal, confidence, reasoning
+
+
+def analyze_symbol_god_mode(symbol: str) -> Tuple[str, float, str, dict]:
+    """
+    God Mode Analysis:
+    1. 4H Trend (Macro)
+    2. 15m RSI (Pullback)
+    3. BTC Correlation (Market Safety)
+    4. Order Book Imbalance (Microstructure)
+    """
+    btc_trend = get_btc_trend()
+    candles = get_candles(symbol, "5m", 50)
+    
+    if len(candles) < 30:
+        return "HOLD", 0.0, "Insufficient data", {}
+    
+    try:
+        closes = [float(c[4]) for c in candles]
+        volumes = [float(c[5]) for c in candles]
+    except:
+        return "HOLD", 0.0, "Data parse error", {}
+    
+    # Calculate indicators
+    rsi = calculate_rsi(closes)
+    macd_line, signal, macd_hist = calculate_macd(closes)
+    trend = detect_trend(closes)
+    atr = calculate_atr(candles)
+    obi = calculate_obi(symbol)
+    
+    # Volume analysis
+    avg_volume = sum(volumes[-20:]) / 20 if volumes else 1
+    volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 1
+    momentum = ((closes[-1] - closes[-10]) / closes[-10]) * 100 if len(closes) >= 10 else 0
+    
+    indicators = {
+        "rsi": round(rsi, 2),
+        "macd": round(macd_hist, 4),
+        "trend": trend,
+        "btc_trend": btc_trend,
+        "obi": round(obi, 2),
+        "vol_ratio": round(volume_ratio, 2)
+    }
+    
+    signal, confidence, reasoning = score_setup(
+        symbol, trend, btc_trend, rsi, obi, macd_hist, volume_ratio
+    )
     return signal, confidence, reasoning, indicators
 
 
+# =============================================================================
+# BATCHED ANALYSIS - WHOLE UNIVERSE IN ONE VECTORIZED PASS
+# =============================================================================
+
+def batch_ema(matrix: np.ndarray, period: int) -> np.ndarray:
+    """
+    calculate_ema for every row of a (symbols x bars) matrix.
+    The SMA-seeded recurrence is unrolled into one weighted sum:
+    ema = decay^k * seed + sum(multiplier * decay^(k-1-j) * x_j)
+    """
+    bars = matrix.shape[1]
+    if bars < period:
+        return matrix.sum(axis=1) / bars
+    multiplier = 2 / (period + 1)
+    decay = 1 - multiplier
+    steps = bars - period
+    seed = matrix[:, :period].sum(axis=1) / period
+    weights = multiplier * decay ** np.arange(steps - 1, -1, -1)
+    return seed * decay ** steps + matrix[:, period:] @ weights
+
+
+def batch_indicators(
+    highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """
+    Per-row EMA20/EMA50, RSI, MACD histogram, ATR, volume ratio, momentum and
+    trend for equal-length (symbols x bars) matrices. Same definitions as the
+    scalar calculate_* helpers above (equal up to float rounding).
+    """
+    rows, bars = closes.shape
+    price = closes[:, -1]
+    
+    ema20 = batch_ema(closes, 20)
+    ema50 = batch_ema(closes, 50)
+    
+    # RSI over the last 14 close-to-close moves
+    if bars >= 15:
+        diffs = np.diff(closes, axis=1)[:, -14:]
+        avg_gain = np.where(diffs > 0, diffs, 0.0).sum(axis=1) / 14
+        avg_loss = np.where(diffs < 0, -diffs, 0.0).sum(axis=1) / 14
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - (100 / (1 + avg_gain / avg_loss)))
+    else:
+        rsi = np.full(rows, 50.0)
+    
+    # MACD (same signal-line shortcut as calculate_macd)
+    if bars >= 26:
+        macd_line = batch_ema(closes, 12) - batch_ema(closes, 26)
+        macd_hist = macd_line - closes[:, -9:].mean(axis=1) * 0.1
+    else:
+        macd_hist = np.zeros(rows)
+    
+    # ATR: mean of the last 14 true ranges
+    if bars >= 15:
+        prev_close = closes[:, :-1]
+        true_range = np.maximum.reduce([
+            highs[:, 1:] - lows[:, 1:],
+            np.abs(highs[:, 1:] - prev_close),
+            np.abs(lows[:, 1:] - prev_close)
+        ])
+        atr = true_range[:, -14:].sum(axis=1) / 14
+    else:
+        atr = np.zeros(rows)
+    
+    avg_volume = volumes[:, -20:].sum(axis=1) / 20
+    with np.errstate(divide="ignore", invalid="ignore"):
+        volume_ratio = np.where(avg_volume > 0, volumes[:, -1] / avg_volume, 1.0)
+    if bars >= 10:
+        momentum = ((price - closes[:, -10]) / closes[:, -10]) * 100
+    else:
+        momentum = np.zeros(rows)
+    
+    # detect_trend
+    if bars >= 50:
+        up = (price > ema20 * 1.002) & (ema20 > ema50 * 1.001)
+        down = (price < ema20 * 0.998) & (ema20 < ema50 * 0.999)
+        trend = np.where(up, "UPTREND", np.where(down, "DOWNTREND", "SIDEWAYS"))
+    else:
+        trend = np.full(rows, "UNCLEAR")
+    
+    return {
+        "ema20": ema20, "ema50": ema50, "rsi": rsi, "macd_hist": macd_hist,
+        "atr": atr, "volume_ratio": volume_ratio, "momentum": momentum, "trend": trend
+    }
+
+
+def batch_analyze_god_mode(
+    symbols: List[str],
+    candles_by_symbol: Optional[Dict[str, List]] = None,
+    books: Optional[Dict[str, object]] = None,
+    btc_trend: Optional[str] = None
+) -> Dict[str, Tuple[str, float, str, dict]]:
+    """
+    analyze_symbol_god_mode for a whole universe: candles are stacked into
+    (symbols x bars) matrices and every indicator is computed once per matrix.
+    Returns {symbol: (signal, confidence, reasoning, indicators)}.
+    `candles_by_symbol` / `books` may be pre-fetched; BTC trend is computed once.
+    """
+    if btc_trend is None:
+        btc_trend = get_btc_trend()
+    candles_by_symbol = candles_by_symbol or {}
+    books = books or {}
+    
+    results = {}
+    groups: Dict[int, List[Tuple[str, np.ndarray]]] = {}
+    for symbol in symbols:
+        candles = candles_by_symbol.get(symbol)
+        if candles is None:
+            candles = get_candles(symbol, "5m", 50)
+        if len(candles) < 30:
+            results[symbol] = ("HOLD", 0.0, "Insufficient data", {})
+            continue
+        try:
+            table = np.array([[float(c[2]), float(c[3]), float(c[4]), float(c[5])] for c in candles])
+        except:
+            results[symbol] = ("HOLD", 0.0, "Data parse error", {})
+            continue
+        # Rows stack only with equal bar counts (same windows as the scalar path)
+        groups.setdefault(len(table), []).append((symbol, table))
+    
+    for members in groups.values():
+        stacked = np.stack([table for _, table in members])
+        values = batch_indicators(stacked[:, :, 0], stacked[:, :, 1], stacked[:, :, 2], stacked[:, :, 3])
+    
+        for row, (symbol, _) in enumerate(members):
+            rsi = float(values["rsi"][row])
+            macd_hist = float(values["macd_hist"][row])
+            volume_ratio = float(values["volume_ratio"][row])
+            trend = str(values["trend"][row])
+            obi = calculate_obi(symbol, books.get(symbol))
+    
+            indicators = {
+                "rsi": round(rsi, 2),
+                "macd": round(macd_hist, 4),
+                "trend": trend,
+                "btc_trend": btc_trend,
+                "obi": round(obi, 2),
+                "vol_ratio": round(volume_ratio, 2)
+            }
+            signal, confidence, reasoning = score_setup(
+                symbol, trend, btc_trend, rsi, obi, macd_hist, volume_ratio
+            )
+            results[symbol] = (signal, confidence, reasoning, indicators)
+    
+    return results
+
+
+async def scan_universe_async(
+    client: httpx.AsyncClient, symbols: List[str]
+) -> Tuple[Dict[str, Tuple[str, float, str, dict]], float]:
+    """
+    Fetch BTC 15m candles plus every symbol's 5m candles and depth concurrently
+    (about one round-trip in total), then run the batched analysis.
+    Returns (results by symbol, wall time in seconds).
+    """
+    start = time.perf_counter()
+    responses = await asyncio.gather(
+        get_candles_async(client, "cmt_btcusdt", "15m", 50),
+        *(get_candles_async(client, s, "5m", 50) for s in symbols),
+        *(get_order_book_async(client, s, 20) for s in symbols)
+    )
+    btc_candles = responses[0]
+    candles = dict(zip(symbols, responses[1:1 + len(symbols)]))
+    books = dict(zip(symbols, responses[1 + len(symbols):]))
+    
+    results = batch_analyze_god_mode(
+        symbols, candles_by_symbol=candles, books=books,
+        btc_trend=btc_trend_from_candles(btc_candles)
+    )
+    return results, time.perf_counter() - start
+
+
 # =============================================================================
 # POSITION MANAGEMENT - GOD MODE
 # =============================================================================
@@ -401,6 +678,18 @@ def log(msg: str):
     print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}")
 
 
+def spread_too_wide(symbol: str, book: dict) -> bool:
+    """True (and logged) when the top-of-book spread exceeds 0.15%"""
+    if book and book.get('bids') and book.get('asks'):
+        best_bid = float(book['bids'][0][0])
+        best_ask = float(book['asks'][0][0])
+        spread = (best_ask - best_bid) / best_bid * 100
+        if spread > 0.15: # 0.15% spread limit
+            log(f"⚠️ {symbol} Spread too high ({spread:.3f}%), skipping.")
+            return True
+    return False
+
+
 def manage_position_god_mode(symbol: str, signal: str, confidence: float, reasoning: str) -> Optional[float]:
     """
     God Mode Management:
@@ -410,14 +699,8 @@ def manage_position_god_mode(symbol: str, signal: str, confidence: float, reason
     global open_positions, consecutive_losses
     
     # 1. SPREAD CHECK - Don't enter if spread is bad
-    book = get_order_book(symbol, 1)
-    if book and book.get('bids') and book.get('asks'):
-        best_bid = float(book['bids'][0][0])
-        best_ask = float(book['asks'][0][0])
-        spread = (best_ask - best_bid) / best_bid * 100
-        if spread > 0.15: # 0.15% spread limit
-            log(f"⚠️ {symbol} Spread too high ({spread:.3f}%), skipping.")
-            return None
+    if spread_too_wide(symbol, get_order_book(symbol, 1)):
+        return None
     
     size = POSITION_SIZES.get(symbol, "0.001")
     price = get_price(symbol)
@@ -498,8 +781,175 @@ def manage_position_god_mode(symbol: str, signal: str, confidence: float, reason
     return final_pnl
 
 
-def run_god_mode():
-    """Main Loop"""
+# =============================================================================
+# POSITION SUPERVISOR - ONE EVENT LOOP FOR ALL POSITIONS
+# =============================================================================
+
+class ManagedPosition:
+    """Exit state of one open position, evaluated on every price tick"""
+    
+    def __init__(self, symbol: str, signal: str, size: str, entry_price: float):
+        self.symbol = symbol
+        self.signal = signal
+        self.size = size
+        self.entry_price = entry_price
+        self.direction = 1 if signal == "LONG" else 2
+        self.coin = symbol.replace("cmt_", "").replace("usdt", "").upper()
+        self.opened_at = time.time()
+        self.highest_pnl = 0
+        self.trailing_active = False
+        self.closing = False
+    
+    def leveraged_pnl(self, price: float) -> float:
+        if self.entry_price <= 0:
+            return 0.0  # No valid entry price - nothing to measure against
+        if self.signal == "LONG":
+            pnl_pct = ((price - self.entry_price) / self.entry_price) * 100
+        else:
+            pnl_pct = ((self.entry_price - price) / self.entry_price) * 100
+        return pnl_pct * MAX_LEVERAGE
+    
+    def check_exit(self, price: float, now: Optional[float] = None) -> Optional[str]:
+        """Same rules as manage_position_god_mode; returns the exit log line or None"""
+        leveraged_pnl = self.leveraged_pnl(price)
+        if leveraged_pnl > self.highest_pnl: self.highest_pnl = leveraged_pnl
+        
+        # Trailing Logic
+        if leveraged_pnl >= TRAILING_ACTIVATION_PCT: self.trailing_active = True
+        
+        if self.trailing_active and leveraged_pnl < (self.highest_pnl - TRAILING_DISTANCE_PCT):
+            return f"   🔔 {self.coin} Trailing Stop Hit: +{leveraged_pnl:.2f}%"
+        if leveraged_pnl >= PROFIT_TARGET_PCT:
+            return f"   💰 {self.coin} Target Hit: +{leveraged_pnl:.2f}%"
+        if leveraged_pnl <= -STOP_LOSS_PCT:
+            return f"   🛑 {self.coin} Stop Loss: {leveraged_pnl:.2f}%"
+        if (now or time.time()) - self.opened_at >= MAX_HOLD_TIME:
+            return f"   ⏰ {self.coin} Max Hold Reached: {leveraged_pnl:+.2f}%"
+        return None
+
+
+class PositionSupervisor:
+    """
+    Manages every open position from one event loop: a shared batched price
+    poller feeds ticks, and SL/TP/trailing/max-hold are evaluated for all
+    positions on each tick (no thread or sleep per position).
+    """
+    
+    def __init__(self, client: httpx.AsyncClient, tick_interval: float = POSITION_TICK_INTERVAL):
+        self.client = client
+        self.tick_interval = tick_interval
+        self.positions: Dict[str, ManagedPosition] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.ticks = 0
+        self._tasks = set()  # Strong refs to in-flight entry/close tasks
+    
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    async def open(self, symbol: str, signal: str, confidence: float, reasoning: str):
+        """Entry: spread check, market order, AI log; then the position is supervised"""
+        try:
+            if spread_too_wide(symbol, await get_order_book_async(self.client, symbol, 1)):
+                return self._release(symbol)
+            
+            size = POSITION_SIZES.get(symbol, "0.001")
+            price = await get_price_async(self.client, symbol)
+            if price <= 0:
+                log(f"   ❌ {symbol} No price available - skipping entry")
+                return self._release(symbol)
+            position = ManagedPosition(symbol, signal, size, price)
+            
+            log(f"⚡ GOD MODE ENTRY: {signal} {position.coin} @ ${price:,.2f} | Conf: {confidence:.0%}")
+            log(f"   📊 {reasoning}")
+            
+            result = await asyncio.to_thread(place_order, symbol, position.direction, size)
+            if not result.get("order_id"):
+                log(f"   ❌ {position.coin} Order failed: {result}")
+                return self._release(symbol)
+            
+            await asyncio.to_thread(
+                upload_ai_log, result.get("order_id"), symbol, signal, reasoning, confidence, price
+            )
+            position.opened_at = time.time()
+            self.positions[symbol] = position
+        except Exception as e:
+            log(f"   ❌ {symbol} Entry error: {e}")
+            self._release(symbol)
+    
+    def _release(self, symbol: str):
+        self.positions.pop(symbol, None)
+        with positions_lock:
+            open_positions.pop(symbol, None)
+    
+    def on_tick(self, prices: Dict[str, float], now: Optional[float] = None) -> List[Tuple[ManagedPosition, str, float]]:
+        """Evaluate every position against the latest prices; returns positions to close"""
+        self.ticks += 1
+        self.last_prices.update(prices)
+        exits = []
+        for position in list(self.positions.values()):
+            price = prices.get(position.symbol, 0)
+            if position.closing or price <= 0:
+                continue
+            try:
+                reason = position.check_exit(price, now)
+            except Exception as e:
+                log(f"   ⚠️ {position.coin} Exit check error: {e}")  # Keep supervising the others
+                continue
+            if reason:
+                position.closing = True
+                exits.append((position, reason, price))
+        return exits
+    
+    async def close(self, position: ManagedPosition, reason: str, price: float):
+        """Close with up to 3 attempts and record the result"""
+        global consecutive_losses
+        log(reason)
+        
+        close_dir = 3 if position.direction == 1 else 4
+        closed = False
+        for _ in range(3):
+            try:
+                res = await asyncio.to_thread(place_order, position.symbol, close_dir, position.size)
+                if res.get("order_id"):
+                    closed = True
+                    break
+                log(f"   ❌ {position.coin} Close failed: {res}")
+            except Exception as e:
+                log(f"   ❌ {position.coin} Close error: {e}")
+            await asyncio.sleep(1)
+        
+        if not closed:
+            # Still open on the exchange: keep supervising it, the next tick retries
+            log(f"   ⚠️ {position.coin} Close not confirmed - retrying next tick")
+            position.closing = False
+            return None
+        
+        final_pnl = position.leveraged_pnl(price)
+        if final_pnl < 0: consecutive_losses += 1
+        else: consecutive_losses = 0
+        
+        log(f"   🏁 {position.coin} Closed: {final_pnl:+.2f}%")
+        self._release(position.symbol)
+        return final_pnl
+    
+    async def run(self):
+        """Tick loop: one batched price fetch per tick for all open positions"""
+        while True:
+            try:
+                symbols = [s for s, p in self.positions.items() if not p.closing]
+                if symbols:
+                    prices = await get_all_prices_async(self.client, symbols)
+                    for position, reason, price in self.on_tick(prices):
+                        self.spawn(self.close(position, reason, price))
+            except Exception as e:
+                log(f"Supervisor error: {e}")
+            await asyncio.sleep(self.tick_interval)
+
+
+def log_banner():
     log("=" * 60)
     log("⚡ WEEX GOD MODE BOT ACTIVATED")
     log("=" * 60)
@@ -509,6 +959,34 @@ def run_god_mode():
     log("✅ Smart Spreads (Slippage Protection)")
     log("✅ Winner Strategy (Trend Following)")
     log("-" * 60)
+
+
+def collect_opportunities(results: Dict[str, Tuple[str, float, str, dict]]) -> List[Tuple[str, str, float, str]]:
+    """High-conviction signals from a scan, best first"""
+    opportunities = []
+    for s, (sig, conf, reas, _) in results.items():
+        if sig != "HOLD" and conf >= MIN_CONFIDENCE:
+            opportunities.append((s, sig, conf, reas))
+            log(f"   📊 {s}: {sig} ({conf:.0%}) - {reas[:50]}")
+    
+    if not opportunities:
+        log(f"   ⏳ No high-conviction signals. Waiting for setup...")
+    
+    # Sort best first
+    opportunities.sort(key=lambda x: x[2], reverse=True)
+    return opportunities
+
+
+def dispatch_opportunities(executor: ThreadPoolExecutor, opportunities: List, busy: int):
+    for opp in opportunities[:(MAX_CONCURRENT_POSITIONS - busy)]:
+        with positions_lock:
+            open_positions[opp[0]] = True
+        executor.submit(manage_position_god_mode, *opp)
+
+
+def run_god_mode():
+    """Main Loop"""
+    log_banner()
     
     executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_POSITIONS)
     
@@ -522,27 +1000,12 @@ def run_god_mode():
             log(f"🔍 Scanning {len(SYMBOLS)} symbols... Balance: ${balance:.2f} | Open: {busy}/{MAX_CONCURRENT_POSITIONS}")
             
             if busy < MAX_CONCURRENT_POSITIONS:
-                # Scan symbols
-                opportunities = []
-                for s in SYMBOLS:
-                    with positions_lock:
-                        if s in open_positions: continue
-                    
-                    sig, conf, reas, _ = analyze_symbol_god_mode(s)
-                    if sig != "HOLD" and conf >= MIN_CONFIDENCE:
-                        opportunities.append((s, sig, conf, reas))
-                        log(f"   📊 {s}: {sig} ({conf:.0%}) - {reas[:50]}")
-                
-                if not opportunities:
-                    log(f"   ⏳ No high-conviction signals. Waiting for setup...")
+                # Scan symbols (one batched indicator pass for the whole universe)
+                with positions_lock:
+                    candidates = [s for s in SYMBOLS if s not in open_positions]
                 
-                # Sort best first
-                opportunities.sort(key=lambda x: x[2], reverse=True)
-                
-                for opp in opportunities[:(MAX_CONCURRENT_POSITIONS - busy)]:
-                    with positions_lock:
-                        open_positions[opp[0]] = True
-                    executor.submit(manage_position_god_mode, *opp)
+                opportunities = collect_opportunities(batch_analyze_god_mode(candidates))
+                dispatch_opportunities(executor, opportunities, busy)
                     
             time.sleep(MIN_TRADE_INTERVAL)
             
@@ -552,5 +1015,53 @@ def run_god_mode():
             log(f"Error: {e}")
             time.sleep(5)
 
+
+async def run_god_mode_async():
+    """Main Loop - concurrent scanner (all market data fetched in parallel per scan)"""
+    log_banner()
+    log("✅ Async Scanner (concurrent fetch, pooled connections)")
+    log("✅ Position Supervisor (all positions on one tick loop)")
+    
+    async with build_async_client() as client:
+        supervisor = PositionSupervisor(client)
+        supervisor_task = asyncio.create_task(supervisor.run())
+        
+        try:
+            while True:
+                try:
+                    with positions_lock:
+                        busy = len(open_positions)
+                        candidates = [s for s in SYMBOLS if s not in open_positions]
+                    
+                    balance = await get_balance_async(client)
+                    log(f"🔍 Scanning {len(candidates)} symbols... Balance: ${balance:.2f} | Open: {busy}/{MAX_CONCURRENT_POSITIONS}")
+                    
+                    if busy < MAX_CONCURRENT_POSITIONS:
+                        results, elapsed = await scan_universe_async(client, candidates)
+                        log(f"   ⏱️ Scan took {elapsed * 1000:.0f} ms")
+                        for opp in collect_opportunities(results)[:(MAX_CONCURRENT_POSITIONS - busy)]:
+                            with positions_lock:
+                                open_positions[opp[0]] = True
+                            supervisor.spawn(supervisor.open(*opp))
+                    
+                    await asyncio.sleep(MIN_TRADE_INTERVAL)
+                    
+                except Exception as e:
+                    log(f"Error: {e}")
+                    await asyncio.sleep(5)
+        finally:
+            supervisor_task.cancel()
+            try:
+                await supervisor_task
+            except asyncio.CancelledError:
+                pass
+
+
 if __name__ == "__main__":
-    run_god_mode()
+    if "--async" in sys.argv:
+        try:
+            asyncio.run(run_god_mode_async())
+        except KeyboardInterrupt:
+            pass
+    else:
+        run_god_mode()
\ No newline at end of file
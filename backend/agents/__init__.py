@@ -1,13 +1,27 @@
+from .llm_transport import bedrock_transport, BedrockTransport, LLMTimeoutError
+from .response_cache import response_cache, ResponseCache
+from .context_manager import ConversationContext, estimate_tokens
+from .json_parser import extract_json, validate, parse_response, StreamingJSONParser
+from .debate_history import debate_history, DebateHistory
 from .base_agent import BaseAgent
 from .bull_agent import bull_agent, BullAgent
 from .bear_agent import bear_agent, BearAgent
 from .risk_manager import risk_manager, RiskManager
-from .debate_engine import debate_engine, DebateEngine
+from .committee_agent import committee_agent, CommitteeAgent
+from .debate_engine import debate_engine, DebateEngine, SymbolState, DEBATE_MODES
+from .debate_scheduler import debate_scheduler, DebateScheduler
 
 __all__ = [
+    "bedrock_transport", "BedrockTransport", "LLMTimeoutError",
+    "response_cache", "ResponseCache",
+    "ConversationContext", "estimate_tokens",
+    "extract_json", "validate", "parse_response", "StreamingJSONParser",
+    "debate_history", "DebateHistory",
     "BaseAgent",
     "bull_agent", "BullAgent",
     "bear_agent", "BearAgent",
     "risk_manager", "RiskManager",
-    "debate_engine", "DebateEngine"
+    "committee_agent", "CommitteeAgent",
+    "debate_engine", "DebateEngine", "SymbolState", "DEBATE_MODES",
+    "debate_scheduler", "DebateScheduler"
 ]
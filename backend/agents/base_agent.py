@@ -2,14 +2,19 @@
 Base agent class for all AI agents
 Uses AWS Bedrock for LLM inference
 """
-import json
-import re
-import boto3
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Optional, Callable, Awaitable
 from datetime import datetime
 from config.settings import settings
 from data.data_models import MarketData, DebateMessage
+from agents.llm_transport import bedrock_transport, LLMTimeoutError
+from agents.response_cache import response_cache
+from agents.context_manager import ConversationContext, estimate_tokens
+from agents.json_parser import extract_json, validate
+
+
+# Receives each streamed text delta of an LLM response
+TokenCallback = Optional[Callable[[str], Awaitable[None]]]
 
 
 class BaseAgent(ABC):
@@ -18,16 +23,36 @@ class BaseAgent(ABC):
     def __init__(self, name: str, emoji: str, prompt_file: str):
         self.name = name
         self.emoji = emoji
-        self.bedrock_client = boto3.client(
-            'bedrock-runtime',
-            region_name=settings.aws_region,
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key
-        )
+        self.transport = bedrock_transport  # Shared, non-blocking Bedrock access
+        self.cache = response_cache  # Shared, keyed by quantized market state
         self.model_id = settings.bedrock_model_id
         self.system_prompt = self._load_prompt(prompt_file)
-        self.message_history = []
+        # Token-budgeted prior turns, one history per symbol (debates run concurrently across symbols)
+        self.context = ConversationContext(extract_json=self._extract_json)  # Calls without a symbol
+        self.contexts: Dict[str, ConversationContext] = {}
         
+        # Prompt size per call (estimated; input_tokens as reported by Bedrock when available)
+        self.llm_calls = 0
+        self.last_prompt_tokens = 0
+        self.total_prompt_tokens = 0
+        self.reported_input_tokens = 0
+        self.llm_outcomes = {}  # Hedging / fallback outcomes for this agent (see invoke_hedged)
+        self.parse_errors = 0  # Responses with missing/invalid schema fields
+        
+    @property
+    def message_history(self) -> list:
+        """Prior turns as sent to the model (calls without a symbol)"""
+        return self.context.messages()
+    
+    def context_for(self, symbol: Optional[str]) -> ConversationContext:
+        """Conversation history for one symbol, created on first use"""
+        if not symbol:
+            return self.context
+        context = self.contexts.get(symbol)
+        if context is None:
+            context = self.contexts[symbol] = ConversationContext(extract_json=self._extract_json)
+        return context
+    
     def _load_prompt(self, filename: str) -> str:
         """Load system prompt from file"""
         try:
@@ -37,30 +62,26 @@ class BaseAgent(ABC):
             return f"You are the {self.name} agent."
     
     def _extract_json(self, text: str) -> Optional[dict]:
-        """Extract JSON from LLM response"""
-        # Try to find JSON block
-        json_match = re.search(r'```json\s*(.*?)\s*```', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                pass
-        
-        # Try to parse entire response as JSON
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
-            pass
-        
-        # Try to find any JSON-like structure
-        json_match = re.search(r'\{[^{}]*\}', text, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
-        
-        return None
+        """Extract JSON from LLM response (first balanced object, fenced or bare)"""
+        return extract_json(text)
+    
+    def _validate(self, data: Optional[dict], schema: str) -> Optional[dict]:
+        """Check parsed output against a role schema (None if unusable)"""
+        cleaned, errors = validate(data, schema)
+        if errors:
+            self.parse_errors += 1
+            print(f"[{self.name}] Response schema issues ({schema}): {'; '.join(errors)}")
+        return cleaned
+    
+    def _parse(self, text: str, schema: str) -> Optional[dict]:
+        """Extract JSON from LLM response and validate it against a role schema"""
+        return self._validate(extract_json(text), schema)
+    
+    def _cache_key(self, market_data: MarketData, signals: list, *context) -> Optional[str]:
+        """Response cache key for this agent and market state (None when caching is off)"""
+        if not settings.llm_cache_enabled:
+            return None
+        return self.cache.fingerprint(self.name, market_data, signals, *context)
     
     def _format_market_context(self, market_data: MarketData) -> str:
         """Format market data for LLM context"""
@@ -94,62 +115,100 @@ ORDER BOOK DEPTH:
             lines.append(f"- {signal.name}: {signal.value:.2f} ({signal.signal.value}) - {signal.description}")
         return "\n".join(lines)
     
-    async def _call_llm(self, user_message: str) -> str:
-        """Make LLM API call via AWS Bedrock"""
+    async def _call_llm(
+        self,
+        user_message: str,
+        timeout: Optional[float] = None,
+        on_token: TokenCallback = None,
+        cache_key: Optional[str] = None,
+        context: Optional[ConversationContext] = None
+    ) -> str:
+        """
+        Make LLM API call via AWS Bedrock (off the event loop, with a deadline).
+        With on_token (and LLM streaming enabled) the response is streamed and
+        each text delta is passed to on_token as it arrives.
+        With cache_key, a recent response for the same market state is reused.
+        context: the history to send and extend (see context_for); defaults to self.context
+        """
+        context = context or self.context
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"[{self.name}] Cache hit - reusing response")
+                stats = self.transport.get_stats()
+                self.cache.record_saving(stats["avg_latency_ms"] / 1000)
+                return cached
         
         try:
-            # Build messages array
+            # Build messages array (compact prior turns within the token budget)
             messages = [
-                *self.message_history,
+                *context.messages(),
                 {"role": "user", "content": user_message}
             ]
+            prompt_tokens = (
+                estimate_tokens(self.system_prompt) + context.tokens + estimate_tokens(user_message)
+            )
+            self.llm_calls += 1
+            self.last_prompt_tokens = prompt_tokens
+            self.total_prompt_tokens += prompt_tokens
             
             # Prepare the request body for Claude
-            body = json.dumps({
+            body = {
                 "anthropic_version": "bedrock-2023-05-31",
                 "max_tokens": 1000,
                 "system": self.system_prompt,
                 "messages": messages,
                 "temperature": 0.7
-            })
+            }
             
-            print(f"[{self.name}] Calling Bedrock model: {self.model_id}")
+            print(f"[{self.name}] Calling Bedrock model: {self.model_id} (~{prompt_tokens} prompt tokens)")
             
             # Invoke Bedrock
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=body,
-                contentType="application/json",
-                accept="application/json"
-            )
-            
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            assistant_message = response_body['content'][0]['text']
+            if on_token is not None and settings.llm_streaming:
+                assistant_message = await self.transport.invoke_stream(
+                    self.model_id, body, on_token, timeout
+                )
+            elif self.transport.fallback_models:
+                response_body, model = await self.transport.invoke_hedged(
+                    self.model_id, body, timeout, stats=self.llm_outcomes
+                )
+                if model != self.model_id:
+                    print(f"[{self.name}] Answered by fallback model: {model}")
+                assistant_message = response_body['content'][0]['text']
+                self.reported_input_tokens += response_body.get('usage', {}).get('input_tokens', 0)
+            else:
+                response_body = await self.transport.invoke(self.model_id, body, timeout)
+                assistant_message = response_body['content'][0]['text']
+                self.reported_input_tokens += response_body.get('usage', {}).get('input_tokens', 0)
             
-            # Add to history for context
-            self.message_history.append({"role": "user", "content": user_message})
-            self.message_history.append({"role": "assistant", "content": assistant_message})
+            # Add to history for context (compacted, trimmed to the budget)
+            context.add_exchange(user_message, assistant_message)
             
-            # Keep history manageable
-            if len(self.message_history) > 10:
-                self.message_history = self.message_history[-10:]
+            if cache_key is not None:
+                self.cache.put(cache_key, assistant_message)
             
             return assistant_message
             
+        except LLMTimeoutError as e:
+            print(f"[{self.name}] Bedrock timeout: {e}")
+            raise
         except Exception as e:
             error_msg = str(e)
+            # botocore ClientErrors carry the error code; fall back to the message text
+            # (other errors may have no response, or one that is not a dict)
+            response = getattr(e, "response", None)
+            error_code = (response.get("Error", {}).get("Code") if isinstance(response, dict) else None) or error_msg
             print(f"[{self.name}] Bedrock API Error: {error_msg}")
             
             # Check for common issues
-            if "AccessDeniedException" in error_msg:
+            if "AccessDeniedException" in error_code:
                 raise Exception(
                     f"AWS Bedrock Access Denied. You need to request access to {self.model_id} "
                     f"in the AWS Console: https://console.aws.amazon.com/bedrock/home?region={settings.aws_region}#/modelaccess"
                 )
-            elif "ValidationException" in error_msg:
+            elif "ValidationException" in error_code:
                 raise Exception(f"Invalid model ID or request format: {error_msg}")
-            elif "ResourceNotFoundException" in error_msg:
+            elif "ResourceNotFoundException" in error_code:
                 raise Exception(
                     f"Model {self.model_id} not found. Check if it's available in region {settings.aws_region}"
                 )
@@ -167,15 +226,37 @@ ORDER BOOK DEPTH:
         )
     
     @abstractmethod
-    async def analyze(self, market_data: MarketData, signals: list) -> dict:
-        """Analyze market data and return opinion"""
+    async def analyze(self, market_data: MarketData, signals: list, on_token: TokenCallback = None) -> dict:
+        """Analyze market data and return opinion (on_token receives streamed text)"""
         pass
     
     @abstractmethod
-    async def respond_to(self, message: DebateMessage, market_data: MarketData) -> dict:
-        """Respond to another agent's message"""
+    async def respond_to(self, message: DebateMessage, market_data: MarketData, on_token: TokenCallback = None) -> dict:
+        """Respond to another agent's message (on_token receives streamed text)"""
         pass
     
     def clear_history(self):
-        """Clear conversation history"""
-        self.message_history = []
+        """Clear conversation history (all symbols)"""
+        self.context.clear()
+        for context in self.contexts.values():
+            context.clear()
+    
+    def get_llm_stats(self) -> dict:
+        """History size (summed over symbols), prompt tokens per call and hedging outcomes"""
+        contexts = [self.context, *self.contexts.values()]
+        return {
+            "turns": sum(len(c.turns) for c in contexts),
+            "history_tokens": sum(c.tokens for c in contexts),
+            "budget_tokens": self.context.budget_tokens,
+            "evicted_exchanges": sum(c.evicted for c in contexts),
+            "symbols": list(self.contexts),
+            "calls": self.llm_calls,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "avg_prompt_tokens": round(self.total_prompt_tokens / self.llm_calls) if self.llm_calls else 0,
+            "reported_input_tokens": self.reported_input_tokens,
+            "parse_errors": self.parse_errors,
+            "outcomes": {
+                key: round(value, 2) if isinstance(value, float) else value
+                for key, value in self.llm_outcomes.items()
+            }
+        }
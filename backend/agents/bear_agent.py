@@ -1,7 +1,7 @@
 """
 Bear Agent - Risk-focused skeptic and short opportunity finder
 """
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, TokenCallback
 from data.data_models import MarketData, DebateMessage
 
 
@@ -18,7 +18,7 @@ class BearAgent(BaseAgent):
             prompt_file="bear_prompt.txt"
         )
     
-    async def analyze(self, market_data: MarketData, signals: list) -> dict:
+    async def analyze(self, market_data: MarketData, signals: list, on_token: TokenCallback = None) -> dict:
         """
         Analyze market for risks or short opportunities
         Used when Bear initiates (no Bull proposal to respond to)
@@ -41,8 +41,11 @@ Look for:
 Provide your analysis with confidence level.
 """
         
-        response = await self._call_llm(prompt)
-        result = self._extract_json(response)
+        cache_key = self._cache_key(market_data, signals, "analyze")
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._parse(response, "bear_analysis")
         
         if result is None:
             result = {
@@ -57,7 +60,7 @@ Provide your analysis with confidence level.
         
         return result
     
-    async def respond_to(self, message: DebateMessage, market_data: MarketData) -> dict:
+    async def respond_to(self, message: DebateMessage, market_data: MarketData, on_token: TokenCallback = None) -> dict:
         """
         Respond to Bull's proposal with challenge, agreement, or counter-proposal
         """
@@ -80,8 +83,12 @@ Respond with CHALLENGE, AGREE, or COUNTER_PROPOSE as appropriate.
 Be specific about your concerns or support.
 """
         
-        response = await self._call_llm(prompt)
-        result = self._extract_json(response)
+        # Same market and same proposal text (e.g. a cached Bull answer) -> same rebuttal
+        cache_key = self._cache_key(market_data, [], "respond_to", message.message, message.confidence)
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._parse(response, "bear_response")
         
         if result is None:
             result = {
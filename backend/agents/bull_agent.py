@@ -2,7 +2,7 @@
 Bull Agent - Momentum-focused long opportunity finder
 """
 from typing import Optional
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, TokenCallback
 from data.data_models import MarketData, DebateMessage, TradeAction
 
 
@@ -19,7 +19,7 @@ class BullAgent(BaseAgent):
             prompt_file="bull_prompt.txt"
         )
     
-    async def analyze(self, market_data: MarketData, signals: list) -> dict:
+    async def analyze(self, market_data: MarketData, signals: list, on_token: TokenCallback = None) -> dict:
         """
         Analyze market for long opportunities
         Returns proposal or hold decision
@@ -39,8 +39,11 @@ If conditions aren't right, indicate you're holding and explain why.
 Respond with the appropriate JSON format as specified in your instructions.
 """
         
-        response = await self._call_llm(prompt)
-        result = self._extract_json(response)
+        cache_key = self._cache_key(market_data, signals, "analyze")
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._parse(response, "bull_proposal")
         
         if result is None:
             result = {
@@ -56,7 +59,7 @@ Respond with the appropriate JSON format as specified in your instructions.
         
         return result
     
-    async def respond_to(self, message: DebateMessage, market_data: MarketData) -> dict:
+    async def respond_to(self, message: DebateMessage, market_data: MarketData, on_token: TokenCallback = None) -> dict:
         """
         Respond to Bear's challenge or Risk Manager's questions
         """
@@ -73,7 +76,7 @@ Respond to their points. If they challenged your proposal:
 Keep your response focused and professional.
 """
         
-        response = await self._call_llm(prompt)
+        response = await self._call_llm(prompt, on_token=on_token, context=self.context_for(market_data.symbol))
         result = self._extract_json(response) or {"reasoning": response}
         
         result["raw_message"] = response
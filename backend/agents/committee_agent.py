@@ -0,0 +1,78 @@
+"""
+Committee Agent - Bull, Bear and Risk Manager outputs from a single LLM call
+"""
+from agents.base_agent import BaseAgent, TokenCallback
+from data.data_models import MarketData, DebateMessage
+
+
+class CommitteeAgent(BaseAgent):
+    """
+    Plays the whole committee in one model invocation (committee debate mode).
+    Returns {"bull": ..., "bear": ..., "risk": ...} in the same shapes the
+    individual agents produce, so their format_* methods can render it.
+    """
+    
+    def __init__(self):
+        super().__init__(
+            name="Committee",
+            emoji="🏛️",
+            prompt_file="committee_prompt.txt"
+        )
+    
+    async def deliberate(
+        self,
+        market_data: MarketData,
+        signals: list,
+        current_exposure_pct: float = 0,
+        on_token: TokenCallback = None
+    ) -> dict:
+        """One structured prompt → all three role outputs"""
+        market_context = self._format_market_context(market_data)
+        signals_context = self._format_signals(signals)
+        
+        prompt = f"""
+{market_context}
+
+{signals_context}
+
+PORTFOLIO STATUS:
+Current Exposure: {current_exposure_pct:.1f}%
+
+Run the full committee debate on a LONG trade for {market_data.symbol}:
+the Bull proposes (or holds), the Bear responds, the Risk Manager rules.
+Respond with the single JSON document specified in your instructions.
+"""
+        
+        cache_key = self._cache_key(market_data, signals, "deliberate", round(current_exposure_pct))
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._extract_json(response) or {}
+        
+        bull = self._validate(result.get("bull"), "bull_proposal")
+        if bull is None:
+            # Unparseable committee output - treat as no trade
+            bull = {"action": "HOLD", "confidence": 0.5, "reasoning": response}
+        bear = self._validate(result.get("bear"), "bear_response") or {
+            "action": "CHALLENGE", "confidence": 0.5, "reasoning": "No Bear output"
+        }
+        risk = self._validate(result.get("risk"), "risk_decision") or {
+            "decision": "REJECT", "reasoning": "No Risk Manager ruling"
+        }
+        
+        for role, agent, emoji in ((bull, "Bull", "🐂"), (bear, "Bear", "🐻"), (risk, "Risk Manager", "⚖️")):
+            role["agent"] = agent
+            role["emoji"] = emoji
+        
+        return {"bull": bull, "bear": bear, "risk": risk, "raw_message": response}
+    
+    async def analyze(self, market_data: MarketData, signals: list, on_token: TokenCallback = None) -> dict:
+        return await self.deliberate(market_data, signals, on_token=on_token)
+    
+    async def respond_to(self, message: DebateMessage, market_data: MarketData, on_token: TokenCallback = None) -> dict:
+        """Not used - the committee produces every response itself"""
+        return await self.deliberate(market_data, [], on_token=on_token)
+
+
+# Singleton instance
+committee_agent = CommitteeAgent()
@@ -0,0 +1,115 @@
+"""
+Token-budgeted conversation context for agents
+Prior turns are kept as compact structured outcomes (market dumps stripped,
+replies reduced to their decision fields) and the oldest are evicted once the
+history exceeds the agent's token budget.
+"""
+import json
+import re
+from datetime import datetime
+from typing import Callable, List, Optional
+from config.settings import settings
+
+
+# Market dump sections produced by BaseAgent._format_market_context / _format_signals
+MARKET_SECTIONS = ("CURRENT MARKET DATA", "ORDER BOOK DEPTH", "TECHNICAL SIGNALS")
+
+# Reply fields worth remembering from a previous debate turn
+OUTCOME_FIELDS = (
+    "action", "decision", "stance", "confidence", "suggested_leverage", "final_leverage",
+    "final_size_pct", "stop_loss_pct", "take_profit_pct", "safe_to_trade"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English/JSON)"""
+    return (len(text) + 3) // 4
+
+
+class ConversationContext:
+    """
+    An agent's prior turns, bounded by a token budget.
+    Each exchange is stored compacted:
+    - user turn: cycle time, symbol and price, plus the first line of the request
+    - assistant turn: the reply's JSON decision fields and a short reasoning
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int = settings.llm_context_budget_tokens,
+        extract_json: Optional[Callable[[str], Optional[dict]]] = None
+    ):
+        self.budget_tokens = budget_tokens
+        self.extract_json = extract_json or (lambda text: None)
+        self.turns: List[dict] = []  # {"role", "content", "tokens"}
+        self.evicted = 0
+
+    def compact_prompt(self, text: str) -> str:
+        """Drop the market dump, keeping the snapshot it described in one line"""
+        symbol = re.search(r"CURRENT MARKET DATA for (\S+?):", text)
+        price = re.search(r"Current Price: (\$[\d,.]+)", text)
+        snapshot = " @ ".join(m.group(1) for m in (symbol, price) if m)
+
+        request = ""
+        in_market_section = False
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(MARKET_SECTIONS):
+                in_market_section = True
+                continue
+            if in_market_section and line.startswith("- "):
+                continue
+            in_market_section = False
+            request = line
+            break
+
+        stamp = datetime.now().strftime("%H:%M:%S")
+        header = f"[Earlier cycle {stamp}{' - ' + snapshot if snapshot else ''}]"
+        return f"{header} {request[:160]}".strip()
+
+    def compact_reply(self, text: str) -> str:
+        """Keep the decision fields (and a short reasoning) of a JSON reply"""
+        data = self.extract_json(text)
+        if not data:
+            return text[:300]
+        outcome = {key: data[key] for key in OUTCOME_FIELDS if key in data}
+        reasoning = str(data.get("reasoning", ""))
+        if reasoning:
+            outcome["reasoning"] = reasoning[:200]
+        return json.dumps(outcome)
+
+    def add_exchange(self, user_message: str, assistant_message: str):
+        """Remember one completed call, then trim to the budget"""
+        for role, content in (
+            ("user", self.compact_prompt(user_message)),
+            ("assistant", self.compact_reply(assistant_message))
+        ):
+            self.turns.append({"role": role, "content": content, "tokens": estimate_tokens(content)})
+        self._trim()
+
+    def _trim(self):
+        """Evict the oldest user/assistant pairs until within budget"""
+        while self.turns and self.tokens > self.budget_tokens:
+            del self.turns[:2]
+            self.evicted += 1
+
+    @property
+    def tokens(self) -> int:
+        return sum(turn["tokens"] for turn in self.turns)
+
+    def messages(self) -> List[dict]:
+        """History in Bedrock messages format (alternating, starting with user)"""
+        return [{"role": turn["role"], "content": turn["content"]} for turn in self.turns]
+
+    def clear(self):
+        self.turns = []
+
+    def get_stats(self) -> dict:
+        return {
+            "turns": len(self.turns),
+            "history_tokens": self.tokens,
+            "budget_tokens": self.budget_tokens,
+            "evicted_exchanges": self.evicted
+        }
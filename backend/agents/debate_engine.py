@@ -2,128 +2,502 @@
 Debate Engine - Orchestrates multi-agent debate workflow
 """
 import asyncio
-from typing import List, Optional, Callable
+import time
+import uuid
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 from data.data_models import MarketData, DebateMessage, TradeDecision
 from data.market_data import market_data_service
 from signals.indicators import indicator_analyzer
+from signals.setup_gate import setup_gate
 from agents.bull_agent import bull_agent
 from agents.bear_agent import bear_agent
 from agents.risk_manager import risk_manager
+from agents.committee_agent import committee_agent
+from agents.context_manager import OUTCOME_FIELDS
+from agents.json_parser import StreamingJSONParser
+from agents.debate_history import debate_history, DebateHistory
+from events.event_bus import event_bus, Subscription, DEBATE_MESSAGE, DEBATE_PARTIAL, DEBATE_DECISION, COALESCE
 from config.settings import settings
 
 
+class SymbolState:
+    """Per-symbol debate bookkeeping: exposure, last decision and throughput"""
+    
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.exposure_pct = 0.0
+        self.priority = 0.0
+        self.last_decision: Optional[str] = None
+        self.last_run: Optional[datetime] = None
+        self.present_at = 0.0  # Earliest time this symbol's next message may be shown
+        self.started_at = time.monotonic()
+        self.cycles = 0
+        self.trades = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+    
+    def record(self, seconds: float, decision: Optional[TradeDecision]):
+        self.cycles += 1
+        self.total_seconds += seconds
+        self.last_run = datetime.now()
+        if decision and decision.approved:
+            self.trades += 1
+            self.last_decision = f"{decision.action.value} {decision.leverage}x"
+        else:
+            self.last_decision = "NO_TRADE"
+    
+    def to_dict(self) -> dict:
+        hours = max((time.monotonic() - self.started_at) / 3600, 1e-9)
+        return {
+            "cycles": self.cycles,
+            "trades": self.trades,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_cycle_ms": round(self.total_seconds / self.cycles * 1000, 1) if self.cycles else 0,
+            "cycles_per_hour": round(self.cycles / hours, 1),
+            "priority": round(self.priority, 2),
+            "exposure_pct": round(self.exposure_pct, 2),
+            "last_decision": self.last_decision,
+            "last_run": self.last_run.isoformat() if self.last_run else None
+        }
+
+
+# sequential: three LLM calls in turn; parallel: three concurrent calls + rule-based
+# reconciliation; committee: one LLM call producing all three roles
+DEBATE_MODES = ("sequential", "parallel", "committee")
+
+
 class DebateEngine:
     """
     Orchestrates the debate between Bull, Bear, and Risk Manager agents.
     Manages the workflow: Proposal → Rebuttal → Resolution
+    (or, in parallel mode, concurrent analyses → Reconciliation)
     """
     
     def __init__(self):
         self.bull = bull_agent
         self.bear = bear_agent
         self.risk = risk_manager
-        self.debate_history: List[DebateMessage] = []
+        self.committee = committee_agent
+        self.debate_mode = settings.debate_mode  # Per session (see /api/start)
+        self.history: DebateHistory = debate_history  # Bounded ring + on-disk log
         self.trade_count = 0
-        self.message_callbacks: List[Callable] = []
+        self.bus = event_bus  # Messages, partial frames and decisions are published here
         self.is_running = False
         self.current_exposure_pct = 0.0
+        self.symbols: Dict[str, SymbolState] = {}
+        self._present_tasks = set()
+        self.timing = {
+            mode: {"cycles": 0, "total_seconds": 0.0, "saved_seconds": 0.0}
+            for mode in DEBATE_MODES
+        }
+    
+    def add_message_callback(self, callback: Callable, **options) -> Subscription:
+        """
+        Subscribe a callback to final debate messages. It runs in its own
+        event bus worker, so a slow callback never delays the debate
+        (options: maxsize, policy - see EventBus.subscribe).
+        """
+        return self.bus.subscribe(
+            getattr(callback, "__name__", "debate_messages"),
+            lambda event: callback(event.payload),
+            topics=(DEBATE_MESSAGE,),
+            **options
+        )
     
-    def add_message_callback(self, callback: Callable):
-        """Add callback to be called when new debate message is generated"""
-        self.message_callbacks.append(callback)
+    def add_partial_callback(self, callback: Callable, **options) -> Subscription:
+        """
+        Subscribe a callback to streamed partial messages (dict frames, not stored in history).
+        Frames carry the text so far, so by default a backlog coalesces to the latest frame per message.
+        """
+        options.setdefault("policy", COALESCE)
+        return self.bus.subscribe(
+            getattr(callback, "__name__", "debate_partials"),
+            lambda event: callback(event.payload),
+            topics=(DEBATE_PARTIAL,),
+            **options
+        )
     
-    async def _broadcast_message(self, message: DebateMessage):
-        """Broadcast message to all registered callbacks"""
-        self.debate_history.append(message)
-        for callback in self.message_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(message)
-                else:
-                    callback(message)
-            except Exception as e:
-                print(f"Error in message callback: {e}")
+    def symbol_state(self, symbol: str) -> SymbolState:
+        """Per-symbol state, created on first use"""
+        state = self.symbols.get(symbol)
+        if state is None:
+            state = self.symbols[symbol] = SymbolState(symbol)
+        return state
+    
+    def _token_stream(
+        self,
+        agent: str,
+        emoji: str,
+        symbol: str = None,
+        on_field: Optional[Callable[[str, object], None]] = None,
+        message_id: Optional[str] = None
+    ) -> Tuple[str, Optional[Callable]]:
+        """
+        A message_id for the agent's upcoming message plus an on_token callback
+        that pushes the text so far as throttled partial frames.
+        The reply's JSON is parsed incrementally: decision fields (action,
+        confidence, ...) ride along in the frames as soon as they are complete,
+        and on_field is called with each top-level field as it completes.
+        The final DebateMessage reuses the message_id so clients can replace the partial
+        (pass message_id to restart an earlier partial from scratch).
+        """
+        message_id = message_id or uuid.uuid4().hex
+        listening = self.bus.has_subscribers(DEBATE_PARTIAL)
+        if not listening and on_field is None:
+            return message_id, None  # Nobody listening - skip streaming
+        
+        interval = settings.llm_stream_frame_interval_ms / 1000
+        parser = StreamingJSONParser()
+        last_sent = 0.0
+        
+        async def on_token(delta: str):
+            nonlocal last_sent
+            known = len(parser.fields)
+            fields = parser.feed(delta)
+            new_field = len(fields) > known
+            if new_field and on_field is not None:
+                for key in list(fields)[known:]:
+                    on_field(key, fields[key])
+            if not listening:
+                return
+            now = time.monotonic()
+            if now - last_sent < interval and not new_field:
+                return
+            last_sent = now
+            outcome = {key: fields[key] for key in OUTCOME_FIELDS if key in fields}
+            self.bus.publish(DEBATE_PARTIAL, {
+                "message_id": message_id,
+                "agent": agent,
+                "emoji": emoji,
+                "symbol": symbol,
+                "message": parser.buffer,
+                "confidence": outcome.get("confidence"),
+                "fields": outcome
+            }, key=message_id)
+        
+        return message_id, on_token
+    
+    def _publish_message(self, message: DebateMessage):
+        """Record a message and publish it to subscribers (never waits for them)"""
+        self.history.append(message)
+        self.bus.publish(DEBATE_MESSAGE, message, key=message.message_id)
+    
+    async def _present(self, message: DebateMessage):
+        """
+        Broadcast a message, keeping at least debate_pacing_seconds between
+        consecutive messages of the same symbol for a natural feel in the UI.
+        Pacing is presentation only: a message that is due later is handed to
+        a background task and the debate carries on. Symbols debated
+        concurrently are paced independently.
+        """
+        state = self.symbol_state(message.symbol or settings.default_symbol)
+        now = time.monotonic()
+        delay = max(state.present_at - now, 0.0)
+        state.present_at = max(state.present_at, now) + settings.debate_pacing_seconds
+        if delay == 0 and not self._present_tasks:
+            self._publish_message(message)
+            return
+        
+        async def present_later():
+            await asyncio.sleep(delay)
+            self._publish_message(message)
+        
+        task = asyncio.create_task(present_later())
+        self._present_tasks.add(task)
+        task.add_done_callback(self._present_tasks.discard)
+    
+    def _record_cycle(self, mode: str, seconds: float, saved: float = 0.0):
+        timing = self.timing[mode]
+        timing["cycles"] += 1
+        timing["total_seconds"] += seconds
+        timing["saved_seconds"] += saved
+    
+    @staticmethod
+    async def _timed(coro) -> Tuple[dict, float]:
+        """Await an agent call and return (result, seconds)"""
+        start = time.monotonic()
+        result = await coro
+        return result, time.monotonic() - start
+    
+    async def prepare(self, symbol: str) -> Tuple[MarketData, list]:
+        """Fetch market data and compute technical signals for a debate"""
+        market_data = await market_data_service.get_market_data(symbol)
+        
+        # Calculate technical signals from the columnar candles
+        # (live feeds update running state; mock candles are regenerated each call)
+        if settings.streaming_indicators and not market_data_service.is_mock:
+            signals = indicator_analyzer.analyze_incremental(
+                symbol, "5m", market_data.candle_frame
+            )
+        else:
+            signals = indicator_analyzer.analyze(market_data.candle_frame)
+        return market_data, signals
     
-    async def run_debate_cycle(self, symbol: str = None) -> Optional[TradeDecision]:
+    async def run_debate_cycle(
+        self,
+        symbol: str = None,
+        market_data: Optional[MarketData] = None,
+        signals: Optional[list] = None
+    ) -> Optional[TradeDecision]:
         """
-        Run a complete debate cycle:
-        1. Bull analyzes and may propose
-        2. Bear responds to Bull
-        3. Risk Manager makes final decision
-        4. Return trade decision (or None if no trade)
+        Run a complete debate cycle (self.debate_mode):
+        - sequential: Bull proposes → Bear responds → Risk Manager arbitrates
+        - parallel: Bull, Bear and a Risk pre-assessment run concurrently,
+          then the Risk Manager reconciles them without another LLM call
+        - committee: one LLM call plays all three roles
+        market_data/signals may be passed in when already fetched (see prepare()).
+        Returns the trade decision (or None if no trade)
         """
         symbol = symbol or settings.default_symbol
+        state = self.symbol_state(symbol)
+        start = time.monotonic()
+        decision = None
         
         try:
-            # Fetch market data
-            market_data = await market_data_service.get_market_data(symbol)
+            if market_data is None:
+                market_data, signals = await self.prepare(symbol)
             
-            # Calculate technical signals
-            signals = indicator_analyzer.analyze(market_data.candles)
+            # Rule-based pre-filter: no setup -> HOLD without calling the LLM
+            if setup_gate.enabled:
+                parallel = self.debate_mode == "parallel"
+                gate = setup_gate.check(
+                    market_data,
+                    signals,
+                    llm_calls=3 if parallel else 1,  # At least Bull's call (all three in parallel mode)
+                    llm_seconds=self.bull.transport.get_stats()["avg_latency_ms"] / 1000
+                )
+                if not gate["passed"]:
+                    reasons = ", ".join(gate["reasons"]) or "no signals aligned"
+                    message = self.bull.create_message(
+                        self.bull.format_proposal_message({
+                            "action": "HOLD",
+                            "reasoning": (
+                                f"No setup (score {gate['score']}/10, need {setup_gate.min_score}): "
+                                f"{reasons}. Debate skipped."
+                            )
+                        }),
+                        confidence=0.5
+                    )
+                    message.symbol = symbol
+                    message.decision = "HOLD"
+                    await self._present(message)
+                    return None
             
-            # === PHASE 1: Bull Analysis ===
-            bull_analysis = await self.bull.analyze(market_data, signals)
-            bull_message = DebateMessage(
+            if self.debate_mode == "parallel":
+                decision = await self._run_parallel(symbol, market_data, signals)
+            elif self.debate_mode == "committee":
+                decision = await self._run_committee(symbol, market_data, signals)
+            else:
+                decision = await self._run_sequential(symbol, market_data, signals)
+            return decision
+            
+        except Exception as e:
+            state.errors += 1
+            error_message = DebateMessage(
+                agent="System",
+                emoji="⚠️",
+                message=f"Debate error: {str(e)}",
+                timestamp=datetime.now(),
+                symbol=symbol
+            )
+            self._publish_message(error_message)
+            return None
+        finally:
+            state.record(time.monotonic() - start, decision)
+    
+    async def _run_sequential(self, symbol: str, market_data: MarketData, signals: list) -> Optional[TradeDecision]:
+        """Proposal → Rebuttal → Resolution, one LLM call after another"""
+        start = time.monotonic()
+        
+        # === PHASE 1: Bull Analysis ===
+        message_id, on_token = self._token_stream("Bull", "🐂", symbol)
+        bull_analysis = await self.bull.analyze(market_data, signals, on_token=on_token)
+        bull_message = DebateMessage(
+            agent="Bull",
+            emoji="🐂",
+            message=self.bull.format_proposal_message(bull_analysis),
+            confidence=bull_analysis.get("confidence"),
+            decision=bull_analysis.get("action"),
+            timestamp=datetime.now(),
+            message_id=message_id,
+            symbol=symbol
+        )
+        await self._present(bull_message)
+        
+        # If Bull is just holding, no debate needed
+        if bull_analysis.get("action") == "HOLD":
+            self._record_cycle("sequential", time.monotonic() - start)
+            return None
+        
+        # === PHASE 2: Bear Response ===
+        message_id, on_token = self._token_stream("Bear", "🐻", symbol)
+        bear_analysis = await self.bear.respond_to(bull_message, market_data, on_token=on_token)
+        bear_message = DebateMessage(
+            agent="Bear",
+            emoji="🐻",
+            message=self.bear.format_response_message(bear_analysis),
+            confidence=bear_analysis.get("confidence"),
+            decision=bear_analysis.get("action"),
+            timestamp=datetime.now(),
+            message_id=message_id,
+            symbol=symbol
+        )
+        await self._present(bear_message)
+        
+        # === PHASE 3: Risk Manager Arbitration ===
+        message_id, on_token = self._token_stream("Risk Manager", "⚖️", symbol)
+        decision = await self.risk.arbitrate(
+            bull_analysis,
+            bear_analysis,
+            market_data,
+            self.current_exposure_pct,
+            on_token=on_token
+        )
+        self._record_cycle("sequential", time.monotonic() - start)
+        return await self._resolve(decision, symbol, message_id)
+    
+    async def _run_parallel(self, symbol: str, market_data: MarketData, signals: list) -> Optional[TradeDecision]:
+        """
+        Bull proposal, Bear's independent critique and the Risk pre-assessment
+        run concurrently; Risk then reconciles them with its hard rules.
+        Saved time = sum of the three call durations (the sequential cost) - wall time.
+        """
+        start = time.monotonic()
+        speculative: List[asyncio.Task] = []
+        dropped = False
+        
+        def on_bull_field(key: str, value):
+            # Bull's action streams in before its reasoning - drop the speculative calls early
+            nonlocal dropped
+            if key == "action" and str(value).upper() == "HOLD":
+                dropped = True
+                for task in speculative:
+                    task.cancel()
+        
+        def launch_speculative(message_id: Optional[str] = None) -> str:
+            """Start Bear's critique and the Risk pre-assessment; returns Bear's message_id"""
+            message_id, bear_token = self._token_stream("Bear", "🐻", symbol, message_id=message_id)
+            speculative[:] = [
+                asyncio.create_task(self._timed(self.bear.analyze(market_data, signals, on_token=bear_token))),
+                asyncio.create_task(self._timed(self.risk.analyze(market_data, signals)))
+            ]
+            return message_id
+        
+        bull_id, bull_token = self._token_stream("Bull", "🐂", symbol, on_field=on_bull_field)
+        bull_task = asyncio.create_task(self._timed(self.bull.analyze(market_data, signals, on_token=bull_token)))
+        bear_id = launch_speculative()
+        
+        try:
+            bull_analysis, bull_seconds = await bull_task
+            await self._present(DebateMessage(
                 agent="Bull",
                 emoji="🐂",
                 message=self.bull.format_proposal_message(bull_analysis),
                 confidence=bull_analysis.get("confidence"),
-                timestamp=datetime.now()
-            )
-            await self._broadcast_message(bull_message)
+                decision=bull_analysis.get("action"),
+                timestamp=datetime.now(),
+                message_id=bull_id,
+                symbol=symbol
+            ))
             
-            # If Bull is just holding, no debate needed
+            # Bull is holding - drop the speculative calls (or they already were, mid-stream)
             if bull_analysis.get("action") == "HOLD":
+                self._record_cycle("parallel", time.monotonic() - start)
                 return None
+            if dropped:
+                # The streamed action read HOLD but the parsed reply is a proposal: run them after all
+                launch_speculative(bear_id)
             
-            # === PHASE 2: Bear Response ===
-            await asyncio.sleep(0.5)  # Brief pause for realistic feel
-            
-            bear_analysis = await self.bear.respond_to(bull_message, market_data)
-            bear_message = DebateMessage(
-                agent="Bear",
-                emoji="🐻",
-                message=self.bear.format_response_message(bear_analysis),
-                confidence=bear_analysis.get("confidence"),
-                timestamp=datetime.now()
-            )
-            await self._broadcast_message(bear_message)
-            
-            # === PHASE 3: Risk Manager Arbitration ===
-            await asyncio.sleep(0.5)
-            
-            decision = await self.risk.arbitrate(
-                bull_analysis,
-                bear_analysis,
-                market_data,
-                self.current_exposure_pct
-            )
-            risk_message = DebateMessage(
-                agent="Risk Manager",
-                emoji="⚖️",
-                message=self.risk.format_decision_message(decision),
-                confidence=None,
-                timestamp=datetime.now()
-            )
-            await self._broadcast_message(risk_message)
-            
-            # Convert to TradeDecision if approved
-            if decision.get("decision") in ["APPROVE", "MODIFY"]:
-                self.trade_count += 1
-                return self.risk.to_trade_decision(decision, symbol)
-            
-            return None
-            
-        except Exception as e:
-            error_message = DebateMessage(
-                agent="System",
-                emoji="⚠️",
-                message=f"Debate error: {str(e)}",
-                timestamp=datetime.now()
-            )
-            await self._broadcast_message(error_message)
+            (bear_analysis, bear_seconds), (assessment, risk_seconds) = await asyncio.gather(*speculative)
+        finally:
+            for task in (bull_task, *speculative):
+                task.cancel()
+        
+        await self._present(DebateMessage(
+            agent="Bear",
+            emoji="🐻",
+            message=self.bear.format_response_message(bear_analysis),
+            confidence=bear_analysis.get("confidence"),
+            decision=bear_analysis.get("action"),
+            timestamp=datetime.now(),
+            message_id=bear_id,
+            symbol=symbol
+        ))
+        
+        # === Reconciliation (rules only, no LLM round-trip) ===
+        decision = self.risk.reconcile(bull_analysis, bear_analysis, assessment, self.current_exposure_pct)
+        elapsed = time.monotonic() - start
+        self._record_cycle("parallel", elapsed, bull_seconds + bear_seconds + risk_seconds - elapsed)
+        return await self._resolve(decision, symbol, uuid.uuid4().hex)
+    
+    async def _run_committee(self, symbol: str, market_data: MarketData, signals: list) -> Optional[TradeDecision]:
+        """
+        One LLM call returns the Bull, Bear and Risk outputs; they are rendered
+        by each agent's formatter and the Risk Manager's hard limits still apply
+        """
+        start = time.monotonic()
+        result = await self.committee.deliberate(market_data, signals, self.current_exposure_pct)
+        bull_analysis, bear_analysis = result["bull"], result["bear"]
+        
+        await self._present(DebateMessage(
+            agent="Bull",
+            emoji="🐂",
+            message=self.bull.format_proposal_message(bull_analysis),
+            confidence=bull_analysis.get("confidence"),
+            decision=bull_analysis.get("action"),
+            timestamp=datetime.now(),
+            message_id=uuid.uuid4().hex,
+            symbol=symbol
+        ))
+        if bull_analysis.get("action") == "HOLD":
+            self._record_cycle("committee", time.monotonic() - start)
             return None
+        
+        await self._present(DebateMessage(
+            agent="Bear",
+            emoji="🐻",
+            message=self.bear.format_response_message(bear_analysis),
+            confidence=bear_analysis.get("confidence"),
+            decision=bear_analysis.get("action"),
+            timestamp=datetime.now(),
+            message_id=uuid.uuid4().hex,
+            symbol=symbol
+        ))
+        
+        decision = self.risk.finalize(result["risk"], bull_analysis)
+        self._record_cycle("committee", time.monotonic() - start)
+        return await self._resolve(decision, symbol, uuid.uuid4().hex)
+    
+    async def _resolve(self, decision: dict, symbol: str, message_id: str) -> Optional[TradeDecision]:
+        """Present the Risk Manager's decision and convert it to a TradeDecision if approved"""
+        await self._present(DebateMessage(
+            agent="Risk Manager",
+            emoji="⚖️",
+            message=self.risk.format_decision_message(decision),
+            confidence=None,
+            decision=decision.get("decision"),
+            timestamp=datetime.now(),
+            message_id=message_id,
+            symbol=symbol
+        ))
+        
+        self.bus.publish(DEBATE_DECISION, {
+            "symbol": symbol,
+            "decision": decision.get("decision"),
+            "final_leverage": decision.get("final_leverage"),
+            "final_size_pct": decision.get("final_size_pct"),
+            "reasoning": decision.get("reasoning", ""),
+            "timestamp": datetime.now().isoformat()
+        }, key=symbol)
+        
+        if decision.get("decision") in ["APPROVE", "MODIFY"]:
+            self.trade_count += 1
+            return self.risk.to_trade_decision(decision, symbol)
+        
+        return None
     
     async def run_continuous(
         self, 
@@ -157,24 +531,44 @@ class DebateEngine:
         self.is_running = False
     
     def get_debate_history(self, limit: int = 50) -> List[DebateMessage]:
-        """Get recent debate messages"""
-        return self.debate_history[-limit:]
+        """Get recent debate messages (from the in-memory ring)"""
+        return self.history.recent(limit)
     
     def get_stats(self) -> dict:
         """Get debate statistics"""
         return {
-            "total_debates": len([m for m in self.debate_history if m.agent == "Risk Manager"]),
+            "total_debates": self.history.session_by_agent["Risk Manager"],  # This session, as total_trades
             "total_trades": self.trade_count,
-            "messages_count": len(self.debate_history),
-            "is_running": self.is_running
+            "messages_count": self.history.total,
+            "is_running": self.is_running,
+            "debate_mode": self.debate_mode,
+            "cycle_latency": {
+                mode: {
+                    "cycles": t["cycles"],
+                    "avg_ms": round(t["total_seconds"] / t["cycles"] * 1000, 1) if t["cycles"] else 0,
+                    "avg_saved_ms": round(t["saved_seconds"] / t["cycles"] * 1000, 1) if t["cycles"] else 0
+                }
+                for mode, t in self.timing.items()
+            },
+            "symbols": {symbol: state.to_dict() for symbol, state in self.symbols.items()},
+            "llm": self.bull.transport.get_stats(),
+            "llm_cache": self.bull.cache.get_stats(),
+            "agents": {
+                agent.name: agent.get_llm_stats()
+                for agent in (self.bull, self.bear, self.risk, self.committee)
+            },
+            "setup_gate": setup_gate.get_stats(),
+            "history": self.history.get_stats(),
+            "events": self.bus.get_stats()
         }
     
     def clear_history(self):
         """Clear debate history"""
-        self.debate_history = []
+        self.history.clear()
         self.bull.clear_history()
         self.bear.clear_history()
         self.risk.clear_history()
+        self.committee.clear_history()
 
 
 # Singleton instance
@@ -0,0 +1,234 @@
+"""
+Debate history store
+Recent messages live in a fixed-size ring; every message is also appended to
+a SQLite log (WAL mode) indexed by time, symbol, agent and decision, so memory
+stays flat however long the engine runs and older debates remain queryable.
+"""
+import sqlite3
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
+from data.data_models import DebateMessage
+from config.settings import settings
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    symbol TEXT,
+    agent TEXT NOT NULL,
+    decision TEXT,
+    confidence REAL,
+    emoji TEXT,
+    message_id TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_ts ON messages (ts);
+CREATE INDEX IF NOT EXISTS idx_messages_symbol ON messages (symbol, id);
+CREATE INDEX IF NOT EXISTS idx_messages_agent ON messages (agent, id);
+CREATE INDEX IF NOT EXISTS idx_messages_decision ON messages (decision, id);
+"""
+
+INSERT_COLUMNS = "ts, symbol, agent, decision, confidence, emoji, message_id, message"
+COLUMNS = f"id, {INSERT_COLUMNS}"
+
+
+def local_time(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive local datetime (timezone-aware values are converted, naive ones kept)"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+class DebateHistory:
+    """
+    Bounded in-memory ring + append-only on-disk log.
+    - append(): O(1) ring push, one indexed INSERT, counter updates
+    - recent(): newest messages straight from the ring
+    - query(): cursor-paginated, filtered reads from the log (newest first)
+    - counts: incremental per agent / decision / symbol, seeded from the log
+      when it is opened, so stats never rescan history
+    - session_by_agent: the same per-agent counts for this process only
+      (matches other in-memory stats such as the engine's trade count)
+    The log is opened at startup (open()) or on first use, never on import.
+    """
+
+    def __init__(
+        self,
+        ring_size: int = settings.debate_history_ring_size,
+        db_path: str = settings.debate_history_path
+    ):
+        self.ring: Deque[Tuple[int, DebateMessage]] = deque(maxlen=ring_size)  # (id, message)
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._next_id = 1  # Row ids when there is no log
+
+        self.total = 0
+        self.by_agent: Counter = Counter()
+        self.by_decision: Counter = Counter()
+        self.by_symbol: Counter = Counter()
+        self.session_by_agent: Counter = Counter()
+
+    def open(self):
+        """Open the message log and seed the counters and ring from it (once)"""
+        if self._opened:
+            return
+        self._opened = True
+        if not self.db_path:
+            return
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")  # Durable enough in WAL mode, no fsync per insert
+        self._db.executescript(SCHEMA)
+        self._load_counts()
+
+    @property
+    def db(self) -> Optional[sqlite3.Connection]:
+        """Message log (opened on first use; None when no path is configured)"""
+        self.open()
+        return self._db
+
+    def _load_counts(self):
+        """Seed the counters and ring from an existing log"""
+        for column, counter in (("agent", self.by_agent), ("decision", self.by_decision), ("symbol", self.by_symbol)):
+            for key, count in self.db.execute(
+                f"SELECT {column}, COUNT(*) FROM messages WHERE {column} IS NOT NULL GROUP BY {column}"
+            ):
+                counter[key] = count
+        self.total = sum(self.by_agent.values())
+        rows = self.db.execute(
+            f"SELECT {COLUMNS} FROM messages ORDER BY id DESC LIMIT ?", (self.ring.maxlen,)
+        ).fetchall()
+        self.ring.extend(self._from_row(row) for row in reversed(rows))
+
+    # ==================== Write ====================
+
+    def append(self, message: DebateMessage) -> int:
+        """Record a message; returns its id (the pagination cursor unit)"""
+        if self.db is not None:
+            cursor = self.db.execute(
+                f"INSERT INTO messages ({INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    message.timestamp.timestamp(), message.symbol, message.agent, message.decision,
+                    message.confidence, message.emoji, message.message_id, message.message
+                )
+            )
+            self.db.commit()
+            row_id = cursor.lastrowid
+        else:
+            row_id = self._next_id
+        self._next_id = row_id + 1
+
+        self.ring.append((row_id, message))
+        self.total += 1
+        self.by_agent[message.agent] += 1
+        self.session_by_agent[message.agent] += 1
+        if message.decision:
+            self.by_decision[message.decision] += 1
+        if message.symbol:
+            self.by_symbol[message.symbol] += 1
+        return row_id
+
+    def clear(self):
+        """Drop all history, in memory and on disk"""
+        self.ring.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM messages")
+            self.db.commit()
+        self.total = 0
+        self.by_agent.clear()
+        self.by_decision.clear()
+        self.by_symbol.clear()
+        self.session_by_agent.clear()
+
+    # ==================== Read ====================
+
+    def recent(self, limit: int = 50) -> List[DebateMessage]:
+        """Newest messages from memory, oldest first"""
+        self.open()
+        if limit <= 0:
+            return []
+        return [message for _, message in list(self.ring)[-limit:]]
+
+    def query(
+        self,
+        limit: int = 50,
+        before: Optional[int] = None,
+        symbol: Optional[str] = None,
+        agent: Optional[str] = None,
+        decision: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Tuple[List[Tuple[int, DebateMessage]], Optional[int]]:
+        """
+        One page of (id, message), newest first, plus the cursor for the next
+        (older) page - pass it back as `before`; None when there is no more.
+        Served from the ring when there is no log.
+        Naive datetimes are local time (as message timestamps); aware ones are converted.
+        """
+        filters = {"symbol": symbol, "agent": agent, "decision": decision}
+        since, until = local_time(since), local_time(until)
+        if self.db is None:
+            rows = [
+                (row_id, m) for row_id, m in reversed(self.ring)
+                if (before is None or row_id < before)
+                and all(value is None or getattr(m, key) == value for key, value in filters.items())
+                and (since is None or local_time(m.timestamp) >= since)
+                and (until is None or local_time(m.timestamp) < until)
+            ]
+            page = rows[:limit]
+            return page, page[-1][0] if len(rows) > limit else None
+
+        clauses, params = [], []
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        for key, value in filters.items():
+            if value is not None:
+                clauses.append(f"{key} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since.timestamp())
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until.timestamp())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.execute(
+            f"SELECT {COLUMNS} FROM messages {where} ORDER BY id DESC LIMIT ?", (*params, limit + 1)
+        ).fetchall()
+        page = [self._from_row(row) for row in rows[:limit]]
+        return page, page[-1][0] if len(rows) > limit else None
+
+    @staticmethod
+    def _from_row(row: tuple) -> Tuple[int, DebateMessage]:
+        row_id, ts, symbol, agent, decision, confidence, emoji, message_id, message = row
+        return row_id, DebateMessage(
+            agent=agent,
+            emoji=emoji or "",
+            message=message,
+            confidence=confidence,
+            timestamp=datetime.fromtimestamp(ts),
+            message_id=message_id,
+            symbol=symbol,
+            decision=decision
+        )
+
+    def get_stats(self) -> dict:
+        self.open()
+        return {
+            "messages": self.total,
+            "in_memory": len(self.ring),
+            "ring_size": self.ring.maxlen,
+            "persistent": self.db is not None,
+            "by_agent": dict(self.by_agent),
+            "by_decision": dict(self.by_decision),
+            "by_symbol": dict(self.by_symbol),
+            "session_by_agent": dict(self.session_by_agent)
+        }
+
+
+# Singleton instance
+debate_history = DebateHistory()
@@ -0,0 +1,156 @@
+"""
+Debate Scheduler - Runs debate cycles across several symbols
+Bounded concurrency, priority by setup strength/volatility and a per-cycle deadline
+"""
+import asyncio
+import time
+from typing import List, Optional, Tuple
+from data.data_models import MarketData
+from agents.debate_engine import debate_engine, DebateEngine
+from execution.order_manager import order_manager
+from signals.setup_gate import setup_gate
+from config.settings import settings
+
+
+class DebateScheduler:
+    """
+    Each round:
+    1. Fetch market data + signals for every symbol concurrently
+    2. Rank symbols by setup score plus volatility (ATR %)
+    3. Debate them in that order, at most max_concurrency at a time,
+       each cycle cancelled after deadline_seconds
+    Per-symbol state and throughput live on the engine (DebateEngine.symbols).
+    """
+
+    # Prepared market data older than this is refetched by the engine
+    STALE_AFTER_SECONDS = 5.0
+
+    def __init__(
+        self,
+        engine: DebateEngine = debate_engine,
+        max_concurrency: int = settings.debate_max_concurrency,
+        deadline_seconds: float = settings.debate_cycle_deadline_seconds
+    ):
+        self.engine = engine
+        self.max_concurrency = max_concurrency
+        self.deadline_seconds = deadline_seconds
+        self.symbols: List[str] = []
+        self.rounds = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _prepare(self, symbol: str) -> Tuple[str, Optional[MarketData], list, float]:
+        """(symbol, market_data, signals, priority); failed fetches rank last"""
+        try:
+            market_data, signals = await self.engine.prepare(symbol)
+        except Exception as e:
+            print(f"⚠️ [{symbol}] Market data unavailable: {e}")
+            return symbol, None, [], float("-inf")
+
+        volatility = next((s.value for s in signals if s.name == "Volatility"), 0.0)
+        priority = setup_gate.score(market_data, signals)["score"] + volatility
+        return symbol, market_data, signals, priority
+
+    async def rank(self, symbols: List[str]) -> List[Tuple[str, Optional[MarketData], list, float]]:
+        """Prepare all symbols concurrently, highest priority first"""
+        prepared = await asyncio.gather(*(self._prepare(symbol) for symbol in symbols))
+        for symbol, _, _, priority in prepared:
+            self.engine.symbol_state(symbol).priority = priority
+        return sorted(prepared, key=lambda p: p[3], reverse=True)
+
+    async def _debate(
+        self,
+        semaphore: asyncio.Semaphore,
+        symbol: str,
+        market_data: Optional[MarketData],
+        signals: list,
+        prepared_at: float
+    ):
+        async with semaphore:
+            if time.monotonic() - prepared_at > self.STALE_AFTER_SECONDS:
+                market_data, signals = None, None  # Waited too long for a slot
+            try:
+                decision = await asyncio.wait_for(
+                    self.engine.run_debate_cycle(symbol, market_data, signals),
+                    self.deadline_seconds
+                )
+            except asyncio.TimeoutError:
+                state = self.engine.symbol_state(symbol)
+                state.timeouts += 1
+                state.last_decision = "TIMEOUT"
+                print(f"⏱️ [{symbol}] Debate exceeded {self.deadline_seconds:g}s deadline - cancelled")
+                return
+
+            if decision and decision.approved:
+                # Here you would execute the trade
+                print(f"Trade #{self.engine.trade_count} [{symbol}]: {decision}")
+
+    def _update_exposure(self):
+        """Portfolio exposure for the Risk Manager, plus each symbol's share"""
+        self.engine.current_exposure_pct = order_manager.get_total_exposure()
+        balance = order_manager.account_balance
+        for symbol in self.symbols:
+            notional = sum(
+                p.size * p.current_price * p.leverage
+                for p in order_manager.get_positions() if p.symbol == symbol
+            )
+            self.engine.symbol_state(symbol).exposure_pct = notional / balance * 100 if balance > 0 else 0
+
+    async def run_round(self):
+        """One pass over all symbols"""
+        self._update_exposure()
+        ranked = await self.rank(self.symbols)
+        prepared_at = time.monotonic()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Semaphore waiters are served FIFO, so tasks start in priority order
+        await asyncio.gather(*(
+            self._debate(semaphore, symbol, market_data, signals, prepared_at)
+            for symbol, market_data, signals, _ in ranked
+        ))
+        self.rounds += 1
+
+    async def run(self, symbols: List[str], interval_seconds: int = None):
+        """Run rounds until the engine is stopped"""
+        self.symbols = list(symbols)
+        interval = interval_seconds or settings.debate_interval_seconds
+        self.engine.is_running = True
+        print(f"🗓️ Debate scheduler: {', '.join(self.symbols)} (max {self.max_concurrency} concurrent)")
+
+        while self.engine.is_running:
+            try:
+                await self.run_round()
+                await asyncio.sleep(interval)
+            except Exception as e:
+                print(f"Error in debate round: {e}")
+                await asyncio.sleep(5)  # Brief pause on error
+
+    def start(self, symbols: List[str], interval_seconds: int = None) -> asyncio.Task:
+        """Start the scheduler in the background (replacing a loop that is still winding down)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self.engine.is_running = True  # Claim the session before the task first runs
+        self._task = asyncio.create_task(self.run(symbols, interval_seconds))
+        return self._task
+
+    async def stop(self):
+        """Stop the session and wait for the scheduler loop (and its debates) to exit"""
+        self.engine.stop()
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> dict:
+        return {
+            "symbols": self.symbols,
+            "rounds": self.rounds,
+            "max_concurrency": self.max_concurrency,
+            "deadline_seconds": self.deadline_seconds
+        }
+
+
+# Singleton instance
+debate_scheduler = DebateScheduler()
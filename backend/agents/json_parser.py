@@ -0,0 +1,279 @@
+"""
+Structured output parsing for agent responses
+- extract_json: single pass, brace-balanced (nested objects, braces inside strings)
+- validate: per-role schemas that coerce and check the fields the engine relies on
+- StreamingJSONParser: incremental parsing of a token stream, so top-level
+  fields such as "action" are known before generation completes
+"""
+import json
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Characters that change scanner state; everything else is skipped in bulk
+_SPECIAL = re.compile(r'[{}\[\]":,\\]')
+
+
+def extract_json(text: str) -> Optional[dict]:
+    """
+    First JSON object in text (inside a ```json fence or bare), or None.
+    Scans once, tracking depth and string/escape state; if a balanced span is
+    not valid JSON (e.g. braces in prose), scanning resumes after its start.
+    """
+    start = text.find("{")
+    while start != -1:
+        depth = 0
+        in_string = False
+        escaped = False
+        for match in _SPECIAL.finditer(text, start):
+            char = match.group()
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                continue
+            if char == "\\":
+                continue
+            if char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    try:
+                        result = json.loads(text[start:match.end()])
+                        if isinstance(result, dict):
+                            return result
+                    except json.JSONDecodeError:
+                        pass
+                    break
+        else:
+            return None  # Unbalanced to the end of the text
+        start = text.find("{", start + 1)
+    return None
+
+
+# ==================== Schemas ====================
+
+# field -> (type, required, allowed enum values or None for any);
+# "number" accepts numeric strings, "int" also rounds (leverage is whole), "confidence" is 0-1
+SCHEMAS: Dict[str, Dict[str, Tuple[str, bool, Optional[tuple]]]] = {
+    "bull_proposal": {
+        "action": ("enum", True, ("PROPOSE_LONG", "HOLD")),
+        "confidence": ("confidence", False, None),
+        "reasoning": ("str", False, None),
+        "suggested_leverage": ("int", False, None),
+        "stop_loss_pct": ("number", False, None),
+        "take_profit_pct": ("number", False, None),
+        "key_signals": ("list", False, None),
+    },
+    "bear_response": {
+        "action": ("enum", True, ("CHALLENGE", "AGREE", "COUNTER_PROPOSE")),
+        "confidence": ("confidence", False, None),
+        "reasoning": ("str", False, None),
+        "key_concerns": ("list", False, None),
+        "risk_factors": ("list", False, None),
+        "suggested_modifications": ("dict", False, None),
+        "proposal": ("dict", False, None),
+    },
+    "bear_analysis": {
+        "action": ("enum", False, None),  # Free-form stance (e.g. NEUTRAL, SHORT)
+        "confidence": ("confidence", False, None),
+        "reasoning": ("str", False, None),
+        "key_concerns": ("list", False, None),
+        "proposal": ("dict", False, None),
+    },
+    "risk_decision": {
+        "decision": ("enum", True, ("APPROVE", "REJECT", "MODIFY")),
+        "reasoning": ("str", False, None),
+        "original_leverage": ("int", False, None),
+        "final_leverage": ("int", False, None),
+        "original_size_pct": ("number", False, None),
+        "final_size_pct": ("number", False, None),
+        "final_stop_loss_pct": ("number", False, None),
+        "final_take_profit_pct": ("number", False, None),
+    },
+    "risk_assessment": {
+        "safe_to_trade": ("bool", False, None),
+        "volatility": ("str", False, None),
+        "max_leverage": ("int", False, None),
+        "max_size_pct": ("number", False, None),
+        "reasoning": ("str", False, None),
+    },
+}
+
+
+def _coerce(kind: str, value: Any, allowed: Optional[tuple]) -> Tuple[bool, Any]:
+    """(ok, coerced value) for one field"""
+    if kind == "enum":
+        value = str(value).strip().upper().replace(" ", "_")
+        return allowed is None or value in allowed, value
+    if kind in ("number", "int", "confidence"):
+        if isinstance(value, bool):
+            return False, value
+        text = str(value).strip()
+        try:
+            number = float(text.rstrip("%x"))
+        except ValueError:
+            return False, value
+        if not math.isfinite(number):
+            return False, value
+        if kind == "int":
+            return True, int(round(number))  # "10x" / 10.0 -> 10
+        if kind == "confidence":
+            if text.endswith("%") or (1 < number <= 100 and number.is_integer()):
+                number /= 100  # "75" / "75%" -> 0.75
+            return True, min(max(number, 0.0), 1.0)  # e.g. 1.5 -> 1.0
+        return True, number
+    if kind == "bool":
+        if isinstance(value, str):
+            return value.lower() in ("true", "false"), value.lower() == "true"
+        return isinstance(value, bool), value
+    if kind == "str":
+        return True, str(value)
+    if kind == "list":
+        return isinstance(value, list), value
+    if kind == "dict":
+        return isinstance(value, dict), value
+    return True, value
+
+
+def validate(data: Optional[dict], schema: str) -> Tuple[Optional[dict], List[str]]:
+    """
+    Check a parsed response against a role schema.
+    Known fields are coerced (numeric strings, enum case, percent confidences);
+    invalid optional fields are dropped; unknown fields pass through.
+    Returns (cleaned dict or None if a required field is missing/invalid, errors).
+    """
+    if not isinstance(data, dict):
+        return None, ["no JSON object"]
+    cleaned = dict(data)
+    errors = []
+    rejected = False
+    for field, (kind, required, allowed) in SCHEMAS[schema].items():
+        if data.get(field) is None:
+            cleaned.pop(field, None)
+            if required:
+                errors.append(f"missing {field}")
+                rejected = True
+            continue
+        ok, value = _coerce(kind, data[field], allowed)
+        if ok:
+            cleaned[field] = value
+        else:
+            errors.append(f"invalid {field}: {data[field]!r}")
+            cleaned.pop(field, None)
+            rejected = rejected or required
+    return (None if rejected else cleaned), errors
+
+
+def parse_response(text: str, schema: str) -> Tuple[Optional[dict], List[str]]:
+    """extract_json + validate"""
+    return validate(extract_json(text), schema)
+
+
+# ==================== Streaming ====================
+
+class StreamingJSONParser:
+    """
+    Feed LLM text deltas; top-level fields of the first JSON object become
+    available in `fields` as soon as each value is complete (on_field is called
+    for each), and `result` holds the whole object once it closes.
+    As in extract_json, a balanced span that is not valid JSON is abandoned
+    and scanning resumes at the next brace.
+    """
+
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        self.on_field = on_field
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.result: Optional[dict] = None
+        self.complete = False
+        self._start = -1  # Index of the candidate object's opening brace
+        self._reset(0)
+
+    def _reset(self, start: int):
+        """Begin scanning for an object at or after start"""
+        self._start = self.buffer.find("{", start)
+        self._pos = self._start
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start = -1
+        self._key: Optional[str] = None
+        self._value_start = -1
+
+    def feed(self, delta: str) -> Dict[str, Any]:
+        """Consume a text delta; returns the fields known so far"""
+        self.buffer += delta
+        if self._start == -1 and not self.complete:
+            self._reset(len(self.buffer) - len(delta))
+        while self._start != -1 and not self.complete:
+            if not self._scan():
+                break
+        return self.fields
+
+    def _scan(self) -> bool:
+        """
+        Advance over the buffer; True when the candidate closed without being
+        valid JSON (e.g. braces in prose) and scanning restarted at the next brace
+        """
+        for match in _SPECIAL.finditer(self.buffer, self._pos):
+            index, char = match.start(), match.group()
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start != -1:
+                        self._key = json.loads(self.buffer[self._key_start:index + 1])
+                        self._key_start = -1
+                continue
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start == -1:
+                    self._key_start = index  # A key (values start after ':')
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(index)
+                    try:
+                        result = json.loads(self.buffer[self._start:index + 1])
+                    except json.JSONDecodeError:
+                        result = None
+                    if isinstance(result, dict):
+                        self.result = result
+                        self.complete = True
+                        return False
+                    self.fields = {}
+                    self._reset(self._start + 1)
+                    return True
+            elif self._depth == 1:
+                if char == ":":
+                    self._value_start = index + 1
+                elif char == ",":
+                    self._finish_value(index)
+        self._pos = len(self.buffer)
+        return False
+
+    def _finish_value(self, end: int):
+        if self._key is not None and self._value_start != -1:
+            try:
+                value = json.loads(self.buffer[self._value_start:end])
+            except json.JSONDecodeError:
+                value = None
+            if value is not None:
+                self.fields[self._key] = value
+                if self.on_field:
+                    self.on_field(self._key, value)
+        self._key = None
+        self._value_start = -1
@@ -0,0 +1,396 @@
+"""
+Async transport for AWS Bedrock
+Runs the blocking boto3 client off the event loop with a global concurrency
+limit, per-call deadlines and cancellation; supports response streaming and
+hedged requests across a fallback model chain
+"""
+import asyncio
+import json
+import threading
+import time
+import boto3
+from botocore.config import Config
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Callable, Awaitable, Tuple
+from config.settings import settings
+
+
+class LLMTimeoutError(Exception):
+    """An LLM call did not finish before its deadline"""
+    pass
+
+
+class BedrockTransport:
+    """
+    Shared Bedrock transport for all agents.
+    - Calls run on a bounded thread pool, so the event loop never blocks
+    - A global semaphore caps in-flight calls (queueing counts toward the deadline)
+    - Each call has a deadline; on timeout or task cancellation the caller is
+      released immediately and a not-yet-started call is dropped from the pool;
+      a call already running keeps its slot until its worker thread finishes
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.llm_max_concurrency,
+        max_workers: int = settings.llm_executor_workers,
+        timeout: float = settings.llm_timeout_seconds
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bedrock")
+        self._client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Stats
+        self.in_flight = 0
+        self.calls = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.streamed_calls = 0
+        self.total_first_token = 0.0
+        self.latencies: Dict[str, Deque[float]] = {}  # Recent successful call latencies per model
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.tail_saved = 0.0
+
+    @property
+    def client(self):
+        """boto3 bedrock-runtime client (thread-safe, created on first use)"""
+        if self._client is None:
+            self._client = boto3.client(
+                'bedrock-runtime',
+                region_name=settings.aws_region,
+                aws_access_key_id=settings.aws_access_key_id,
+                aws_secret_access_key=settings.aws_secret_access_key,
+                config=Config(
+                    connect_timeout=5,
+                    # A worker thread never outlives the deadline by much
+                    read_timeout=self.timeout + 5,
+                    max_pool_connections=self.executor._max_workers
+                )
+            )
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _invoke_sync(self, model_id: str, body: str) -> dict:
+        response = self.client.invoke_model(
+            modelId=model_id,
+            body=body,
+            contentType="application/json",
+            accept="application/json"
+        )
+        return json.loads(response['body'].read())
+
+    def _stream_sync(self, model_id: str, body: str, push: Callable[[str], None], stop: threading.Event):
+        """Read a response stream on a worker thread, pushing text deltas to the loop"""
+        response = self.client.invoke_model_with_response_stream(
+            modelId=model_id,
+            body=body,
+            contentType="application/json",
+            accept="application/json"
+        )
+        stream = response['body']
+        try:
+            for event in stream:
+                if stop.is_set():
+                    break
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                data = json.loads(chunk['bytes'])
+                if data.get('type') == 'content_block_delta':
+                    text = data.get('delta', {}).get('text')
+                    if text:
+                        push(text)
+        finally:
+            close = getattr(stream, 'close', None)
+            if close:
+                close()
+
+    async def _acquire(self, timeout: float):
+        """Wait for a global slot (counts toward the caller's deadline)"""
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeoutError(f"No LLM slot free within {timeout:g}s")
+        self.in_flight += 1
+
+    def _release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, fn: Callable, *args) -> asyncio.Future:
+        """
+        Run fn on the pool for a caller holding a slot. The slot is released when
+        the worker thread finishes (or the call is dropped before it starts), not
+        when the caller gives up: a timed-out boto3 call keeps running until
+        botocore's read timeout, and must keep counting toward the limit.
+        """
+        def on_done(_):
+            try:
+                loop.call_soon_threadsafe(self._release)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        try:
+            work = self.executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        work.add_done_callback(on_done)
+        return asyncio.wrap_future(work, loop=loop)
+
+    async def invoke(self, model_id: str, request: dict, timeout: Optional[float] = None) -> dict:
+        """Invoke a model without blocking the loop; returns the parsed response body"""
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        body = json.dumps(request)
+        start = time.monotonic()
+
+        await self._acquire(timeout)
+        future = self._submit(asyncio.get_running_loop(), self._invoke_sync, model_id, body)
+        try:
+            result = await asyncio.wait_for(future, max(deadline - time.monotonic(), 0.001))
+            self.calls += 1
+            self.total_latency += time.monotonic() - start
+            self._record_latency(model_id, time.monotonic() - start)
+            return result
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeoutError(f"LLM call exceeded {timeout:g}s deadline")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def invoke_stream(
+        self,
+        model_id: str,
+        request: dict,
+        on_text: Callable[[str], Awaitable[None]],
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Streaming invoke: awaits on_text(delta) for each text delta as it
+        arrives and returns the full text. Same slot/deadline/cancel rules as invoke().
+        """
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        body = json.dumps(request)
+        start = time.monotonic()
+
+        await self._acquire(timeout)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        push = lambda text: loop.call_soon_threadsafe(queue.put_nowait, text)
+        future = self._submit(loop, self._stream_sync, model_id, body, push, stop)
+        # Runs on the loop after every queued delta, so None marks the end of the stream
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+
+        parts = []
+        try:
+            while True:
+                text = await asyncio.wait_for(queue.get(), max(deadline - time.monotonic(), 0.001))
+                if text is None:
+                    break
+                if not parts:
+                    self.total_first_token += time.monotonic() - start
+                parts.append(text)
+                await on_text(text)
+            future.result()  # Re-raise errors from the worker thread
+            self.calls += 1
+            self.streamed_calls += 1
+            self.total_latency += time.monotonic() - start
+            return "".join(parts)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeoutError(f"LLM stream exceeded {timeout:g}s deadline")
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            stop.set()  # Worker stops reading at the next event; its slot is freed once it does
+
+    # ==================== Hedging ====================
+    
+    @property
+    def fallback_models(self) -> List[str]:
+        return [m.strip() for m in settings.llm_fallback_models.split(",") if m.strip()]
+    
+    def _record_latency(self, model_id: str, seconds: float):
+        self.latencies.setdefault(model_id, deque(maxlen=200)).append(seconds)
+    
+    def hedge_delay(self, model_id: str) -> float:
+        """
+        How long to wait for model_id before hedging: the configured percentile
+        of its recent latencies, or the initial delay until enough samples exist
+        """
+        samples = self.latencies.get(model_id)
+        if not samples or len(samples) < settings.llm_hedge_min_samples:
+            return settings.llm_hedge_initial_delay_seconds
+        ordered = sorted(samples)
+        index = min(int(len(ordered) * settings.llm_hedge_percentile / 100), len(ordered) - 1)
+        return ordered[index]
+    
+    async def invoke_hedged(
+        self,
+        model_id: str,
+        request: dict,
+        timeout: Optional[float] = None,
+        stats: Optional[dict] = None
+    ) -> Tuple[dict, str]:
+        """
+        invoke() with a fallback chain (model_id, then settings.llm_fallback_models):
+        - if the current model has not answered within hedge_delay(), the next
+          model is started too and whichever succeeds first wins
+        - if a model fails, the next one is started immediately
+        All models share one deadline. Fallbacks must accept the same request
+        format (Anthropic messages). Returns (response body, model that answered).
+        
+        stats (optional, e.g. per agent) gets outcome counts and, once a slower
+        losing primary finishes, the tail latency the hedge saved.
+        """
+        timeout = timeout or self.timeout
+        deadline = time.monotonic() + timeout
+        body = json.dumps(request)
+        chain = [model_id] + [m for m in self.fallback_models if m != model_id]
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        settled = {}  # Winner and its elapsed time, read by late finishers
+        pending: Dict[asyncio.Future, Tuple[str, str]] = {}  # future -> (model, why it was started)
+        last_error: Optional[BaseException] = None
+        
+        def count(outcome: str, amount: float = 1):
+            if stats is not None:
+                stats[outcome] = stats.get(outcome, 0) + amount
+        
+        def notify(callback, *args):
+            # Worker thread -> event loop (which may be gone by the time a loser finishes)
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                pass
+        
+        def on_done(model: str, launched: float, future):
+            # Runs when the worker thread finishes, even after the caller moved on:
+            # the slot is held for as long as Bedrock is actually working
+            self._release()
+            if future.cancelled() or future.exception() is not None:
+                return
+            latency = time.monotonic() - launched
+            self._record_latency(model, latency)
+            if settled and settled["model"] != model and model == model_id:
+                saved = max(launched + latency - (start + settled["elapsed"]), 0.0)
+                self.tail_saved += saved
+                count("tail_saved_seconds", saved)
+        
+        async def launch(model: str, reason: str):
+            await self._acquire(max(deadline - time.monotonic(), 0.001))
+            launched = time.monotonic()
+            try:
+                work = self.executor.submit(self._invoke_sync, model, body)
+            except Exception:
+                self._release()  # No worker will ever run on_done for this slot
+                raise
+            work.add_done_callback(lambda f: notify(on_done, model, launched, f))
+            pending[asyncio.wrap_future(work)] = (model, reason)
+        
+        try:
+            await launch(chain[0], "primary")
+            next_index = 1
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    count("timeouts")
+                    raise LLMTimeoutError(f"LLM call exceeded {timeout:g}s deadline")
+                
+                can_hedge = next_index < len(chain)
+                wait = min(self.hedge_delay(chain[next_index - 1]), remaining) if can_hedge else remaining
+                done, _ = await asyncio.wait(pending.keys(), timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                
+                for future in done:
+                    model, reason = pending.pop(future)
+                    if future.exception() is not None:
+                        last_error = future.exception()
+                        self.errors += 1
+                        count("errors")
+                        continue
+                    elapsed = time.monotonic() - start
+                    settled.update(model=model, elapsed=elapsed)
+                    self.calls += 1
+                    self.total_latency += elapsed
+                    if reason == "primary":
+                        count("primary" if next_index == 1 else "primary_after_hedge")
+                    elif reason == "hedge":
+                        self.hedge_wins += 1
+                        count("hedge_won")
+                    else:
+                        count("fallback")
+                    return future.result(), model
+                
+                if pending and (done or not can_hedge):
+                    continue  # Another model is still working on it
+                if not can_hedge:
+                    raise last_error
+                # Too slow -> hedge; failed with nothing left in flight -> fall back
+                reason = "hedge" if pending else "fallback"
+                if reason == "hedge":
+                    self.hedges += 1
+                    count("hedges")
+                else:
+                    self.fallbacks += 1
+                await launch(chain[next_index], reason)
+                next_index += 1
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            for future in pending:
+                future.cancel()  # Drops calls that have not started; running ones finish on their own
+    
+    def get_stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "avg_latency_ms": round(self.total_latency / self.calls * 1000, 1) if self.calls else 0,
+            "streamed_calls": self.streamed_calls,
+            "avg_first_token_ms": (
+                round(self.total_first_token / self.streamed_calls * 1000, 1) if self.streamed_calls else 0
+            ),
+            "fallback_models": self.fallback_models,
+            "hedge_delay_ms": {model: round(self.hedge_delay(model) * 1000) for model in self.latencies},
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "tail_saved_seconds": round(self.tail_saved, 2)
+        }
+
+    def shutdown(self):
+        """Stop accepting work; queued calls are dropped"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Singleton instance
+bedrock_transport = BedrockTransport()
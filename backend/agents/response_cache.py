@@ -0,0 +1,152 @@
+"""
+LLM response cache keyed by quantized market state
+When the market has barely moved between debate cycles, agents reuse a recent
+model response instead of paying for another multi-second Bedrock call.
+"""
+import hashlib
+import math
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from data.data_models import MarketData
+from config.settings import settings
+
+
+class ResponseCache:
+    """
+    In-memory LRU of raw LLM responses with a TTL, plus an optional SQLite
+    tier on disk that survives restarts. Keys are fingerprints of the
+    quantized market context (see fingerprint()).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.llm_cache_max_entries,
+        ttl_seconds: float = settings.llm_cache_ttl_seconds,
+        disk_path: str = settings.llm_cache_disk_path
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (created, response)
+        self._db: Optional[sqlite3.Connection] = None
+
+        # Stats
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.saved_seconds = 0.0
+
+    # ==================== Fingerprint ====================
+
+    @staticmethod
+    def fingerprint(role: str, market_data: MarketData, signals: list, *context) -> str:
+        """
+        Hash of the quantized market state an agent is reasoning about:
+        - price bucket (log scale, settings.llm_cache_price_bucket_bps wide)
+        - per-signal strength and classification (numbers stripped from the description)
+        - spread bucket (0.01%) and funding bucket (1 bp)
+        - agent role, plus any caller context (e.g. the proposal being answered)
+        """
+        price = market_data.ticker.last_price
+        step = math.log1p(settings.llm_cache_price_bucket_bps / 10_000)
+        price_bucket = int(math.log(price) / step) if price > 0 else 0
+        signal_vector = tuple(
+            (s.name, s.signal.value, re.sub(r"[-+]?\d[\d.,]*", "", s.description))
+            for s in signals
+        )
+        spread_bucket = round(market_data.orderbook.spread_pct, 2)
+        funding_bucket = round((market_data.funding_rate or 0.0) * 10_000)
+
+        key = repr((role, market_data.symbol, price_bucket, signal_vector, spread_bucket, funding_bucket, context))
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    # ==================== Lookup ====================
+
+    @property
+    def db(self) -> Optional[sqlite3.Connection]:
+        """Disk tier (created on first use; None when no path is configured)"""
+        if self._db is None and self.disk_path:
+            self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL, response TEXT)"
+            )
+        return self._db
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None (counts a miss)"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            created, response = entry
+            if now - created <= self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._entries[key]
+            self.expired += 1
+
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT created, response FROM responses WHERE key = ? AND created >= ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row:
+                self._store(key, row[0], row[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return row[1]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, response: str):
+        """Store a fresh response"""
+        created = time.time()
+        self._store(key, created, response)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, created, response) VALUES (?, ?, ?)",
+                (key, created, response)
+            )
+            self.db.execute("DELETE FROM responses WHERE created < ?", (created - self.ttl_seconds,))
+            self.db.commit()
+
+    def record_saving(self, seconds: float):
+        """Model time a hit avoided (callers use the average call latency)"""
+        self.saved_seconds += seconds
+
+    def _store(self, key: str, created: float, response: str):
+        self._entries[key] = (created, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": settings.llm_cache_enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+            "saved_seconds": round(self.saved_seconds, 1)
+        }
+
+
+# Singleton instance
+response_cache = ResponseCache()
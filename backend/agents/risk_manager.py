@@ -1,7 +1,7 @@
 """
 Risk Manager Agent - Final authority with veto power
 """
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, TokenCallback
 from data.data_models import MarketData, DebateMessage, TradeDecision, TradeAction
 from signals.risk_metrics import risk_metrics
 from config.settings import settings
@@ -21,7 +21,7 @@ class RiskManager(BaseAgent):
         )
         self.violations = {"Bull": 0, "Bear": 0}
     
-    async def analyze(self, market_data: MarketData, signals: list) -> dict:
+    async def analyze(self, market_data: MarketData, signals: list, on_token: TokenCallback = None) -> dict:
         """
         Analyze current portfolio risk state
         Used for general risk assessment, not trade decisions
@@ -38,10 +38,23 @@ Consider:
 - Whether it's safe to trade at all right now
 
 This is a general assessment, not a trade decision.
+Respond with JSON:
+```json
+{{
+  "safe_to_trade": true,
+  "volatility": "LOW | MEDIUM | HIGH",
+  "max_leverage": 20,
+  "max_size_pct": 10.0,
+  "reasoning": "One or two sentences"
+}}
+```
 """
         
-        response = await self._call_llm(prompt)
-        result = self._extract_json(response) or {"assessment": response}
+        cache_key = self._cache_key(market_data, signals, "analyze")
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._parse(response, "risk_assessment") or {"assessment": response}
         
         result["raw_message"] = response
         result["agent"] = self.name
@@ -49,16 +62,17 @@ This is a general assessment, not a trade decision.
         
         return result
     
-    async def respond_to(self, message: DebateMessage, market_data: MarketData) -> dict:
+    async def respond_to(self, message: DebateMessage, market_data: MarketData, on_token: TokenCallback = None) -> dict:
         """Not typically used - Risk Manager arbitrates, doesn't respond"""
-        return await self.analyze(market_data, [])
+        return await self.analyze(market_data, [], on_token=on_token)
     
     async def arbitrate(
         self,
         bull_analysis: dict,
         bear_analysis: dict,
         market_data: MarketData,
-        current_exposure_pct: float = 0
+        current_exposure_pct: float = 0,
+        on_token: TokenCallback = None
     ) -> dict:
         """
         Make final decision on a proposed trade
@@ -104,8 +118,15 @@ Remember your hard rules and decision framework.
 If Bull has violations, be stern in your response.
 """
         
-        response = await self._call_llm(prompt)
-        result = self._extract_json(response)
+        cache_key = self._cache_key(
+            market_data, [], "arbitrate",
+            bull_analysis.get("raw_message"), bear_analysis.get("raw_message"),
+            round(current_exposure_pct), tuple(self.violations.values())
+        )
+        response = await self._call_llm(
+            prompt, on_token=on_token, cache_key=cache_key, context=self.context_for(market_data.symbol)
+        )
+        result = self._parse(response, "risk_decision")
         
         if result is None:
             # Default to reject if can't parse
@@ -115,6 +136,16 @@ If Bull has violations, be stern in your response.
             }
         
         # Enforce hard limits regardless of LLM output
+        self.enforce_limits(result, bull_analysis, leverage_adjusted)
+        
+        result["raw_message"] = response
+        result["agent"] = self.name
+        result["emoji"] = self.emoji
+        
+        return result
+    
+    def enforce_limits(self, result: dict, bull_analysis: dict, leverage_adjusted: float) -> dict:
+        """Apply the hard rules to an APPROVE/MODIFY decision (in place)"""
         if result.get("decision") in ["APPROVE", "MODIFY"]:
             final_leverage = min(
                 result.get("final_leverage", leverage_adjusted),
@@ -137,12 +168,103 @@ If Bull has violations, be stern in your response.
             )
             result["final_size_pct"] = final_size
         
-        result["raw_message"] = response
-        result["agent"] = self.name
-        result["emoji"] = self.emoji
-        
         return result
     
+    def finalize(self, decision: dict, bull_analysis: dict) -> dict:
+        """
+        Hard rules for a decision made elsewhere (committee mode):
+        leverage validation, violation tracking and enforce_limits()
+        """
+        proposed_leverage = bull_analysis.get("suggested_leverage", 5)
+        leverage_adjusted, leverage_warning = risk_metrics.validate_leverage(proposed_leverage)
+        if proposed_leverage > settings.max_leverage:
+            self.violations["Bull"] += 1
+        
+        decision.setdefault("decision", "REJECT")
+        if leverage_warning:
+            decision["reasoning"] = f"{decision.get('reasoning', '')} {leverage_warning}".strip()
+        self.enforce_limits(decision, bull_analysis, leverage_adjusted)
+        decision["agent"] = self.name
+        decision["emoji"] = self.emoji
+        return decision
+    
+    def reconcile(
+        self,
+        bull_analysis: dict,
+        bear_analysis: dict,
+        assessment: dict,
+        current_exposure_pct: float = 0
+    ) -> dict:
+        """
+        Final decision without an LLM call (parallel debate mode).
+        Applies the decision framework from the risk prompt to Bull's proposal,
+        Bear's independent critique and this agent's pre-assessment.
+        """
+        proposed_leverage = bull_analysis.get("suggested_leverage", 5)
+        leverage_adjusted, leverage_warning = risk_metrics.validate_leverage(proposed_leverage)
+        if proposed_leverage > settings.max_leverage:
+            self.violations["Bull"] += 1
+        
+        bull_confidence = bull_analysis.get("confidence", 0.5)
+        bear_action = bear_analysis.get("action", "NEUTRAL")
+        bear_confidence = bear_analysis.get("confidence", 0.5)
+        # An independent critique has no AGREE - anything that is not a challenge counts as agreement
+        bear_objects = bear_action in ["CHALLENGE", "COUNTER_PROPOSE", "SHORT"]
+        
+        notes = []
+        if assessment.get("safe_to_trade") is False:
+            decision = {"decision": "REJECT"}
+            notes.append(f"Pre-assessment: not safe to trade. {assessment.get('reasoning', '')}".strip())
+        elif bull_confidence < 0.5:
+            decision = {"decision": "REJECT"}
+            notes.append(f"Bull conviction too low ({bull_confidence*100:.0f}%).")
+        elif current_exposure_pct >= 100:
+            decision = {"decision": "REJECT"}
+            notes.append(f"Exposure already at {current_exposure_pct:.0f}%.")
+        else:
+            if bear_objects and bear_confidence > 0.75:
+                leverage, size = 5, 5.0
+                notes.append(f"Bear objects strongly ({bear_confidence*100:.0f}%) - reducing risk.")
+            elif bull_confidence >= 0.75 and not bear_objects:
+                leverage, size = 20, 10.0
+            elif bull_confidence >= 0.65 and not bear_objects:
+                leverage, size = 15, 10.0
+            elif bull_confidence >= 0.6:
+                leverage, size = 10, 8.0
+            else:
+                leverage, size = 5, 5.0
+            
+            # Pre-assessment caps (volatility, market structure)
+            if assessment.get("max_leverage"):
+                leverage = min(leverage, assessment["max_leverage"])
+            if assessment.get("max_size_pct"):
+                size = min(size, assessment["max_size_pct"])
+            leverage = min(leverage, leverage_adjusted)
+            
+            modified = leverage < proposed_leverage
+            decision = {
+                "decision": "MODIFY" if modified else "APPROVE",
+                "original_leverage": proposed_leverage,
+                "final_leverage": leverage,
+                "final_size_pct": size,
+                "final_stop_loss_pct": bull_analysis.get("stop_loss_pct"),
+                "final_take_profit_pct": bull_analysis.get("take_profit_pct")
+            }
+            notes.append(
+                f"Bull {bull_confidence*100:.0f}% vs Bear {bear_action} {bear_confidence*100:.0f}%."
+            )
+            if assessment.get("reasoning"):
+                notes.append(f"Market risk: {assessment['reasoning']}")
+        
+        if leverage_warning:
+            notes.append(leverage_warning)
+        decision["reasoning"] = " ".join(notes)
+        
+        self.enforce_limits(decision, bull_analysis, leverage_adjusted)
+        decision["agent"] = self.name
+        decision["emoji"] = self.emoji
+        return decision
+    
     def format_decision_message(self, decision: dict) -> str:
         """Format decision into readable message for UI"""
         decision_type = decision.get("decision", "REJECT")
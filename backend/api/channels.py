@@ -0,0 +1,396 @@
+"""
+Push channels for the dashboard WebSocket
+Clients subscribe to candles, ticker, positions, trades and status instead of
+polling REST. Each channel's state is produced once on the server - from bus
+events when the market feed streams, otherwise by one shared refresh loop -
+and pushed to its subscribers only when it changes, as a delta.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+
+from data.data_models import Ticker
+from data.candle_frame import CandleFrame
+from data.market_data import market_data_service
+from data.weex_client import KLINE_INTERVALS
+from agents.debate_engine import debate_engine
+from agents.debate_scheduler import debate_scheduler
+from execution.order_manager import order_manager
+from events.event_bus import event_bus, Event, Subscription, COALESCE, TRADE, MARKET_TICKER, MARKET_CANDLE, DEBATE_DECISION
+from config.settings import settings
+
+
+# ==================== Channels ====================
+
+CANDLES = "candles"      # candles:{symbol}:{interval} - chart bars (interval defaults to 5m)
+TICKER = "ticker"        # ticker:{symbol} - last price and 24h stats
+POSITIONS = "positions"  # Open positions and unrealized P&L
+TRADES = "trades"        # Executed trades (open and close)
+STATUS = "status"        # Engine status and trading stats (as /api/status)
+CHANNELS = (CANDLES, TICKER, POSITIONS, TRADES, STATUS)
+
+DEFAULT_INTERVAL = "5m"
+CHART_LIMIT = 100   # Bars in a candles snapshot (as /api/candles)
+TRADES_LIMIT = 50   # Trades in a trades snapshot (as the dashboard's /api/trades call)
+MAX_CLIENT_CHANNELS = 16  # Each market channel costs an exchange poll when not streaming
+
+
+def parse_channel(name: str) -> Optional[str]:
+    """
+    Canonical channel name (e.g. "candles:cmt_btcusdt" -> "candles:cmt_btcusdt:5m"),
+    None if unknown or not a tradable symbol / supported interval
+    """
+    kind, *args = str(name).split(":")
+    if kind in (POSITIONS, TRADES, STATUS) and not args:
+        return kind
+    if not args or args[0] not in settings.allowed_symbols:
+        return None
+    if kind == TICKER and len(args) == 1:
+        return name
+    if kind == CANDLES and len(args) <= 2:
+        interval = args[1] if len(args) == 2 else DEFAULT_INTERVAL
+        if interval in KLINE_INTERVALS:
+            return f"{CANDLES}:{args[0]}:{interval}"
+    return None
+
+
+def dict_delta(old: dict, new: dict) -> dict:
+    """
+    Keys of `new` that differ from `old`, recursing into nested dicts
+    (lists are compared whole); removed keys map to None
+    """
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = dict_delta(previous, value)
+            if nested:
+                delta[key] = nested
+        elif key not in old or previous != value:
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        delta[key] = None
+    return delta
+
+
+def candle_delta(old: List[dict], new: List[dict]) -> Optional[List[dict]]:
+    """
+    Bars of `new` to push on top of `old`: the new or changed bars from old's
+    last bar onwards. None if earlier history differs (send a snapshot instead).
+    """
+    if not old:
+        return None
+    last_time = old[-1]["time"]
+    known = {bar["time"]: bar for bar in old}
+    changed = []
+    for bar in new:
+        if known.get(bar["time"]) == bar:
+            continue
+        if bar["time"] < last_time:
+            return None  # Back-filled or replaced history: charts can only append
+        changed.append(bar)
+    return changed
+
+
+async def fetch_chart(symbol: str, interval: str = DEFAULT_INTERVAL, limit: int = CHART_LIMIT) -> Tuple[CandleFrame, Optional[Ticker]]:
+    """Candles and ticker for the chart (store first in live mode, market data otherwise)"""
+    # Live mode: read straight from the candle store
+    try:
+        frame = None if market_data_service.is_mock else (
+            await market_data_service.get_candle_frame(symbol, interval, limit)
+        )
+    except Exception as e:
+        print(f"Error reading candle store, falling back: {e}")
+        frame = None
+
+    if frame is not None and len(frame):
+        return frame, await market_data_service.get_ticker(symbol)
+    market_data = await market_data_service.get_market_data(symbol)
+    return market_data.candle_frame.tail(limit), market_data.ticker
+
+
+def ticker_state(ticker: Ticker) -> dict:
+    """Ticker fields pushed to clients (the timestamp alone is not a change)"""
+    return {
+        "symbol": ticker.symbol,
+        "last_price": ticker.last_price,
+        "bid": ticker.bid,
+        "ask": ticker.ask,
+        "change_pct_24h": ticker.change_pct_24h,
+        "high_24h": ticker.high_24h,
+        "low_24h": ticker.low_24h,
+        "volume_24h": ticker.volume_24h
+    }
+
+
+def status_state() -> dict:
+    """System status (the /api/status body, without the WebSocket stats)"""
+    return {
+        "status": "running" if debate_engine.is_running else "stopped",
+        "symbol": settings.default_symbol,
+        "symbols": debate_scheduler.symbols,
+        "demo_mode": order_manager.demo_mode,
+        "debate": debate_engine.get_stats(),
+        "trading": order_manager.get_stats()
+    }
+
+
+async def positions_state() -> dict:
+    """Open positions keyed by symbol, with freshly marked P&L"""
+    await order_manager.update_positions()
+    return {
+        "positions": {p.symbol: jsonable_encoder(p) for p in order_manager.get_positions()},
+        "total_exposure_pct": order_manager.get_total_exposure()
+    }
+
+
+# ==================== Hub ====================
+
+class ChannelHub:
+    """
+    Per-channel subscriber sets and last pushed state.
+    - subscribe(): snapshot from the cached state (loaded once per channel)
+    - bus events (streamed candles/ticker, trades, decisions) update state as they happen
+    - one refresh loop re-reads what has no events (positions, status, and
+      candles/ticker when the market feed is not streaming), once for all clients
+    - a change is pushed as a channel_update delta; an unchanged refresh sends nothing
+    """
+
+    def __init__(self, send: Callable[[Iterable[WebSocket], dict], None]):
+        self.send = send  # (clients, frame): serialize once and queue for each
+        self.subscribers: Dict[str, Set[WebSocket]] = {}
+        self.state: Dict[str, Any] = {}
+        self._refreshed: Dict[str, float] = {}  # Market symbol -> last poll (monotonic)
+        self._events: Optional[Subscription] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None  # Set to refresh before the next poll
+
+        # Stats
+        self.snapshots = 0
+        self.updates = 0
+        self.unchanged = 0
+
+    # ==================== Subscriptions ====================
+
+    async def subscribe(self, websocket: WebSocket, channels: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """
+        Add a client to channels and send each one's snapshot; returns (subscribed, rejected).
+        Unknown channels and any beyond MAX_CLIENT_CHANNELS per client are rejected.
+        """
+        subscribed, rejected = [], []
+        count = sum(1 for clients in self.subscribers.values() if websocket in clients)
+        for name in channels:
+            channel = parse_channel(name)
+            if channel is None:
+                rejected.append(name)
+                continue
+            if websocket in self.subscribers.get(channel, ()):
+                subscribed.append(channel)
+                continue
+            if count >= MAX_CLIENT_CHANNELS:
+                rejected.append(name)
+                continue
+            count += 1
+            subscribed.append(channel)
+            clients = self.subscribers.setdefault(channel, set())
+            clients.add(websocket)
+            self._start()
+            if channel in self.state:
+                self._send_snapshot(channel, [websocket])
+            else:
+                try:
+                    await self._refresh(channel)  # First subscriber: load and snapshot to all
+                except Exception as e:
+                    print(f"Error loading channel {channel}: {e}")
+        return subscribed, rejected
+
+    def unsubscribe(self, websocket: WebSocket, channels: Optional[Iterable[str]] = None) -> List[str]:
+        """Remove a client from channels (all of them by default); returns those it left"""
+        names = self.subscribers.keys() if channels is None else filter(None, map(parse_channel, channels))
+        removed = []
+        for channel in list(names):
+            clients = self.subscribers.get(channel)
+            if clients is None or websocket not in clients:
+                continue
+            clients.discard(websocket)
+            removed.append(channel)
+            if not clients:
+                # Nobody left: forget the state so a later subscriber gets a fresh load
+                del self.subscribers[channel]
+                self.state.pop(channel, None)
+        if not self.subscribers:
+            self._stop()
+        return removed
+
+    # ==================== Sources ====================
+
+    def _start(self):
+        """Listen for state-changing events and run the refresh loop while anyone is subscribed"""
+        if self._events is None or self._events.closed:
+            self._events = event_bus.subscribe(
+                "ws-channels",
+                self._on_event,
+                topics=(MARKET_TICKER, MARKET_CANDLE, TRADE, DEBATE_DECISION),
+                policy=COALESCE  # A backlog of ticks for one symbol collapses to the newest
+            )
+        if self._refresh_task is None or self._refresh_task.done():
+            self._wakeup = asyncio.Event()  # Bound to the running loop
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    def _stop(self):
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        self._refreshed.clear()
+
+    async def _on_event(self, event: Event):
+        if event.topic == MARKET_TICKER:
+            channel = f"{TICKER}:{event.payload.symbol}"
+            if channel in self.subscribers:
+                self._apply(channel, ticker_state(event.payload))
+        elif event.topic == MARKET_CANDLE:
+            bar = event.payload
+            channel = f"{CANDLES}:{bar['symbol']}:{bar['interval']}"
+            if channel in self.subscribers and channel in self.state:
+                record = {
+                    "time": bar["timestamp"] // 1000, "open": bar["open"], "high": bar["high"],
+                    "low": bar["low"], "close": bar["close"], "volume": bar["volume"]
+                }
+                candles = [c for c in self.state[channel]["candles"] if c["time"] != record["time"]]
+                candles.append(record)
+                candles.sort(key=lambda c: c["time"])
+                self._apply_candles(channel, candles[-CHART_LIMIT:])
+        elif event.topic == TRADE:
+            if TRADES in self.state:
+                trade = jsonable_encoder(event.payload)
+                trades = [t for t in self.state[TRADES]["trades"] if t["id"] != trade["id"]]
+                self.state[TRADES] = {"trades": (trades + [trade])[-TRADES_LIMIT:]}
+                self._send_update(TRADES, {"trades": [trade]})
+            self._wake()  # Positions and stats changed
+        elif event.topic == DEBATE_DECISION:
+            self._wake()
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _refresh_loop(self):
+        """Shared poll for state without events; woken early by trades and decisions"""
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    min(settings.ws_channel_poll_seconds, settings.ws_candle_poll_seconds)
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            for channel in (POSITIONS, STATUS):
+                if channel in self.subscribers:
+                    try:
+                        await self._refresh(channel)
+                    except Exception as e:
+                        print(f"Error refreshing channel {channel}: {e}")
+            now = time.monotonic()
+            for symbol in self._market_symbols():
+                if market_data_service.is_stream_ready(symbol):
+                    continue  # Kept current by MARKET_* events
+                if now - self._refreshed.get(symbol, 0) < settings.ws_candle_poll_seconds:
+                    continue
+                try:
+                    await self._refresh_market(symbol)
+                except Exception as e:
+                    print(f"Error refreshing market channels for {symbol}: {e}")
+
+    def _market_symbols(self) -> List[str]:
+        symbols = []
+        for channel in self.subscribers:
+            kind, *args = channel.split(":")
+            if kind in (CANDLES, TICKER) and args[0] not in symbols:
+                symbols.append(args[0])
+        return symbols
+
+    async def _refresh(self, channel: str):
+        """Re-read a channel's state and push whatever changed"""
+        kind, *args = channel.split(":")
+        if kind in (CANDLES, TICKER):
+            await self._refresh_market(args[0], [channel])
+        elif kind == POSITIONS:
+            self._apply(channel, await positions_state())
+        elif kind == STATUS:
+            self._apply(channel, status_state())
+        elif kind == TRADES:
+            trades = order_manager.get_trade_history(TRADES_LIMIT)
+            self.state[channel] = {"trades": jsonable_encoder(trades)}
+            self._send_snapshot(channel)
+
+    async def _refresh_market(self, symbol: str, channels: Optional[List[str]] = None):
+        """
+        One fetch per interval feeds a symbol's candles and ticker channels
+        (all subscribed ones by default)
+        """
+        if channels is None:
+            self._refreshed[symbol] = time.monotonic()
+            channels = [c for c in self.subscribers if c.split(":")[1:2] == [symbol]]
+        intervals = [c.split(":")[2] for c in channels if c.startswith(f"{CANDLES}:")] or [DEFAULT_INTERVAL]
+        ticker = None
+        for interval in intervals:
+            frame, ticker = await fetch_chart(symbol, interval)
+            channel = f"{CANDLES}:{symbol}:{interval}"
+            if channel in channels:
+                self._apply_candles(channel, frame.to_chart_records())
+        channel = f"{TICKER}:{symbol}"
+        if ticker is not None and channel in channels:
+            self._apply(channel, ticker_state(ticker))
+
+    # ==================== Push ====================
+
+    def _apply(self, channel: str, state: dict):
+        """Store new state; push the delta, or a snapshot if there was none"""
+        previous = self.state.get(channel)
+        self.state[channel] = state
+        if previous is None:
+            self._send_snapshot(channel)
+            return
+        delta = dict_delta(previous, state)
+        if delta:
+            self._send_update(channel, delta)
+        else:
+            self.unchanged += 1
+
+    def _apply_candles(self, channel: str, candles: List[dict]):
+        """Push only the new/changed trailing bars; resend the series if history changed"""
+        symbol, interval = channel.split(":")[1:]
+        previous = self.state.get(channel)
+        self.state[channel] = {"symbol": symbol, "interval": interval, "candles": candles}
+        bars = candle_delta(previous["candles"], candles) if previous else None
+        if bars is None:
+            self._send_snapshot(channel)
+        elif bars:
+            self._send_update(channel, {"candles": bars})
+        else:
+            self.unchanged += 1
+
+    def _send_snapshot(self, channel: str, clients: Optional[Iterable[WebSocket]] = None):
+        self.snapshots += 1
+        self.send(
+            list(self.subscribers.get(channel, ())) if clients is None else clients,
+            {"type": "channel_snapshot", "channel": channel, "data": self.state[channel]}
+        )
+
+    def _send_update(self, channel: str, delta: dict):
+        self.updates += 1
+        self.send(list(self.subscribers.get(channel, ())), {"type": "channel_update", "channel": channel, "data": delta})
+
+    def get_stats(self) -> dict:
+        return {
+            "subscribers": {channel: len(clients) for channel, clients in self.subscribers.items()},
+            "snapshots": self.snapshots,
+            "updates": self.updates,
+            "unchanged": self.unchanged
+        }
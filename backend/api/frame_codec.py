@@ -0,0 +1,278 @@
+"""
+Compact WebSocket frame encodings
+JSON stays the default. A client can ask for "binary" (a tagged struct format,
+no dependency) or "msgpack" (when the msgpack package is installed). Both
+replace known field names with one-byte ids from a shared dictionary and send
+ISO timestamps as epoch milliseconds; "binary" also packs lists of numeric
+rows (candles, order-book levels) as float64 columns.
+"""
+import json
+import struct
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:  # Optional: "msgpack" is only offered when installed
+    msgpack = None
+
+
+JSON = "json"
+BINARY = "binary"
+MSGPACK = "msgpack"
+CODEC_VERSION = 1
+
+# Field id = index (u8). Append only: ids are part of the wire format.
+FIELDS = (
+    # Frames
+    "type", "channel", "data", "channels", "rejected", "encoding",
+    # Debate messages and partials
+    "agent", "emoji", "message", "confidence", "timestamp", "message_id", "symbol", "decision", "fields",
+    "action", "stance", "suggested_leverage", "final_leverage", "final_size_pct",
+    "stop_loss_pct", "take_profit_pct", "safe_to_trade", "reasoning",
+    # Candles and ticker
+    "interval", "candles", "time", "open", "high", "low", "close", "volume",
+    "last_price", "bid", "ask", "change_pct_24h", "high_24h", "low_24h", "volume_24h",
+    # Order book
+    "bids", "asks", "price", "quantity",
+    # Positions and trades
+    "positions", "total_exposure_pct", "trades", "id", "side", "size", "leverage", "entry_price", "current_price",
+    "unrealized_pnl", "unrealized_pnl_pct", "stop_loss", "take_profit", "opened_at",
+    "pnl", "pnl_pct", "fee", "executed_at", "closed_at",
+    # Status
+    "status", "symbols", "demo_mode", "debate", "trading", "account_balance", "total_trades",
+    "winning_trades", "win_rate", "total_pnl", "open_positions"
+)
+
+# Frequent string values sent as a one-byte id (append only)
+VALUES = (
+    "debate_message", "debate_partial", "status_update", "channel_snapshot", "channel_update",
+    "subscribed", "unsubscribed", "pong", "error",
+    "Bull", "Bear", "Risk Manager", "Committee", "System",
+    "🐂", "🐻", "⚖️", "🏛️", "⚠️",
+    "PROPOSE_LONG", "HOLD", "CHALLENGE", "AGREE", "COUNTER_PROPOSE", "APPROVE", "REJECT", "MODIFY",
+    "buy", "sell", "long", "short", "close", "hold", "running", "stopped", "5m"
+)
+
+# ISO-string fields sent as epoch milliseconds
+TIME_FIELDS = frozenset(("timestamp", "opened_at", "executed_at", "closed_at", "last_run"))
+
+FIELD_IDS = {name: i for i, name in enumerate(FIELDS)}
+VALUE_IDS = {value: i for i, value in enumerate(VALUES)}
+ENCODINGS = (JSON, BINARY, MSGPACK) if msgpack is not None else (JSON, BINARY)
+
+
+def negotiate(requested: str) -> str:
+    """Encoding to use for a client's request (JSON if unknown or unavailable)"""
+    requested = (requested or JSON).lower()
+    if requested not in ENCODINGS:
+        print(f"⚠️ WebSocket encoding '{requested}' not available - using JSON")
+        return JSON
+    return requested
+
+
+def dictionary(encoding: str) -> dict:
+    """Handshake frame (always JSON text) telling the client how to decode what follows"""
+    frame = {"type": "encoding", "encoding": encoding, "version": CODEC_VERSION}
+    if encoding != JSON:
+        frame.update({"fields": list(FIELDS), "values": list(VALUES), "time_fields": sorted(TIME_FIELDS)})
+    return frame
+
+
+def encode(frame: dict, encoding: str = JSON) -> Union[str, bytes]:
+    if encoding == BINARY:
+        return encode_binary(frame)
+    if encoding == MSGPACK:
+        return msgpack.packb(compact(frame), use_bin_type=True)
+    return json.dumps(frame)
+
+
+def epoch_ms(value: Any) -> Any:
+    """ISO string / datetime -> epoch milliseconds (other values unchanged)"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return value
+
+
+def compact(value: Any, key: str = None) -> Any:
+    """Frame with field-id keys and epoch-ms timestamps (the msgpack form)"""
+    if isinstance(value, dict):
+        return {FIELD_IDS.get(k, k): compact(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [compact(v) for v in value]
+    if key in TIME_FIELDS:
+        return epoch_ms(value)
+    return value
+
+
+# ==================== Binary format ====================
+# Little-endian, one tag byte per value:
+#   NULL/FALSE/TRUE     -
+#   INT                 i32
+#   FLOAT / TIME        f64 (TIME = epoch ms)
+#   WORD                u8 index into VALUES
+#   SHORT_STR / STR     u8 / u32 byte length, UTF-8
+#   LIST                u32 count, values
+#   MAP                 u16 count, (key, value) pairs
+#   TABLE               u8 columns, keys, u32 rows, f64 columns (column-major)
+# A key is a u8 index into FIELDS, or 0xFF + u8 length + UTF-8 for other names.
+
+NULL, FALSE, TRUE, INT, FLOAT, TIME, WORD, SHORT_STR, STR, LIST, MAP, TABLE = range(12)
+INLINE_KEY = 0xFF
+
+_U8 = struct.Struct("<B")
+_TAG_U8 = struct.Struct("<BB")
+_TAG_U16 = struct.Struct("<BH")
+_TAG_U32 = struct.Struct("<BI")
+_TAG_I32 = struct.Struct("<Bi")
+_TAG_F64 = struct.Struct("<Bd")
+_U32 = struct.Struct("<I")
+
+
+def encode_binary(frame: dict) -> bytes:
+    out = bytearray()
+    _write(out, frame, None)
+    return bytes(out)
+
+
+def _write_key(out: bytearray, key: str):
+    field_id = FIELD_IDS.get(key)
+    if field_id is not None:
+        out += _U8.pack(field_id)
+    else:
+        raw = str(key).encode()[:255]
+        out += _TAG_U8.pack(INLINE_KEY, len(raw)) + raw
+
+
+def _table_columns(rows: list) -> Tuple[str, ...]:
+    """Column names if rows are >= 2 dicts with the same keys and only numbers, else ()"""
+    if len(rows) < 2 or not isinstance(rows[0], dict):
+        return ()
+    columns = tuple(rows[0])
+    if not columns or len(columns) > 255:
+        return ()
+    for row in rows:
+        if not isinstance(row, dict) or tuple(row) != columns:
+            return ()
+        for v in row.values():
+            if v.__class__ not in (int, float):
+                return ()
+    return columns
+
+
+def _write(out: bytearray, value: Any, key: str):
+    if key in TIME_FIELDS and isinstance(value, (str, datetime)):
+        ms = epoch_ms(value)
+        if ms is not value:
+            out += _TAG_F64.pack(TIME, ms)
+            return
+    if value is None:
+        out.append(NULL)
+    elif value is True:
+        out.append(TRUE)
+    elif value is False:
+        out.append(FALSE)
+    elif isinstance(value, int) and -2**31 <= value < 2**31:
+        out += _TAG_I32.pack(INT, value)
+    elif isinstance(value, (int, float)):
+        out += _TAG_F64.pack(FLOAT, value)
+    elif isinstance(value, str):
+        word = VALUE_IDS.get(value)
+        if word is not None:
+            out += _TAG_U8.pack(WORD, word)
+            return
+        raw = value.encode()
+        if len(raw) < 256:
+            out += _TAG_U8.pack(SHORT_STR, len(raw)) + raw
+        else:
+            out += _TAG_U32.pack(STR, len(raw)) + raw
+    elif isinstance(value, dict):
+        out += _TAG_U16.pack(MAP, len(value))
+        for k, v in value.items():
+            _write_key(out, k)
+            _write(out, v, k)
+    elif isinstance(value, (list, tuple)):
+        columns = _table_columns(value)
+        if columns:
+            out += _TAG_U8.pack(TABLE, len(columns))
+            for column in columns:
+                _write_key(out, column)
+            out += _U32.pack(len(value))
+            for column in columns:
+                out += array("d", [row[column] for row in value]).tobytes()
+            return
+        out += _TAG_U32.pack(LIST, len(value))
+        for v in value:
+            _write(out, v, None)
+    else:
+        _write(out, str(value), key)
+
+
+def decode_binary(data: bytes) -> dict:
+    """Inverse of encode_binary (timestamps come back as epoch ms, tables as row dicts)"""
+    value, _ = _read(memoryview(data), 0)
+    return value
+
+
+def _read_key(data: memoryview, pos: int) -> Tuple[str, int]:
+    field_id = data[pos]
+    if field_id != INLINE_KEY:
+        return FIELDS[field_id], pos + 1
+    length = data[pos + 1]
+    return bytes(data[pos + 2:pos + 2 + length]).decode(), pos + 2 + length
+
+
+def _read(data: memoryview, pos: int) -> Tuple[Any, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == NULL:
+        return None, pos
+    if tag in (TRUE, FALSE):
+        return tag == TRUE, pos
+    if tag == INT:
+        return struct.unpack_from("<i", data, pos)[0], pos + 4
+    if tag == FLOAT:
+        return struct.unpack_from("<d", data, pos)[0], pos + 8
+    if tag == TIME:
+        return int(struct.unpack_from("<d", data, pos)[0]), pos + 8
+    if tag == WORD:
+        return VALUES[data[pos]], pos + 1
+    if tag in (SHORT_STR, STR):
+        if tag == SHORT_STR:
+            length, pos = data[pos], pos + 1
+        else:
+            length, pos = _U32.unpack_from(data, pos)[0], pos + 4
+        return bytes(data[pos:pos + length]).decode(), pos + length
+    if tag == LIST:
+        count, pos = _U32.unpack_from(data, pos)[0], pos + 4
+        items: List[Any] = []
+        for _ in range(count):
+            item, pos = _read(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == MAP:
+        count, pos = struct.unpack_from("<H", data, pos)[0], pos + 2
+        result: Dict[str, Any] = {}
+        for _ in range(count):
+            key, pos = _read_key(data, pos)
+            result[key], pos = _read(data, pos)
+        return result, pos
+    if tag == TABLE:
+        count, pos = data[pos], pos + 1
+        columns = []
+        for _ in range(count):
+            column, pos = _read_key(data, pos)
+            columns.append(column)
+        rows, pos = _U32.unpack_from(data, pos)[0], pos + 4
+        values = []
+        for _ in columns:
+            values.append(array("d", bytes(data[pos:pos + rows * 8])).tolist())
+            pos += rows * 8
+        return [dict(zip(columns, row)) for row in zip(*values)], pos
+    raise ValueError(f"Unknown frame tag {tag} at byte {pos - 1}")
@@ -2,11 +2,15 @@
 FastAPI REST API routes
 """
 from fastapi import APIRouter, HTTPException
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
-from agents.debate_engine import debate_engine
+from agents.debate_engine import debate_engine, DEBATE_MODES
+from agents.debate_scheduler import debate_scheduler
 from execution.order_manager import order_manager
+from api.websocket import connection_manager
+from api.channels import status_state, fetch_chart
 from config.settings import settings
 
 
@@ -16,7 +20,9 @@ router = APIRouter(prefix="/api", tags=["API"])
 # Request/Response Models
 class StartSessionRequest(BaseModel):
     symbol: Optional[str] = None
+    symbols: Optional[List[str]] = None  # Debate several symbols ("all" = every allowed symbol)
     interval_seconds: Optional[int] = None
+    debate_mode: Optional[str] = None  # sequential | parallel | committee (defaults to DEBATE_MODE)
 
 
 class TradeResponse(BaseModel):
@@ -28,16 +34,10 @@ class TradeResponse(BaseModel):
 # Health & Status
 @router.get("/status")
 async def get_status():
-    """Get system status"""
-    debate_stats = debate_engine.get_stats()
-    trading_stats = order_manager.get_stats()
-    
+    """Get system status (also pushed on the WebSocket "status" channel)"""
     return {
-        "status": "running" if debate_engine.is_running else "stopped",
-        "symbol": settings.default_symbol,
-        "demo_mode": order_manager.demo_mode,
-        "debate": debate_stats,
-        "trading": trading_stats
+        **status_state(),
+        "websocket": connection_manager.get_stats()
     }
 
 
@@ -81,31 +81,19 @@ async def get_symbols():
 
 @router.get("/candles")
 async def get_candles(symbol: str = "cmt_btcusdt", interval: str = "5m", limit: int = 100):
-    """Get candlestick data for chart"""
-    from data.market_data import market_data_service
-    
+    """Get candlestick data for chart (updates are pushed on the "candles:{symbol}" channel)"""
     try:
-        market_data = await market_data_service.get_market_data(symbol)
-        candles = market_data.candles[-limit:] if market_data.candles else []
+        frame, ticker = await fetch_chart(symbol, interval, limit)
+        candles = frame.to_chart_records()
         
         return {
             "symbol": symbol,
             "interval": interval,
-            "candles": [
-                {
-                    "time": int(c.timestamp.timestamp()),
-                    "open": c.open,
-                    "high": c.high,
-                    "low": c.low,
-                    "close": c.close,
-                    "volume": c.volume
-                }
-                for c in candles
-            ],
+            "candles": candles,
             "ticker": {
-                "last_price": market_data.ticker.last_price if market_data.ticker else 0,
-                "change_pct_24h": market_data.ticker.change_pct_24h if market_data.ticker else 0
-            } if market_data.ticker else None
+                "last_price": ticker.last_price,
+                "change_pct_24h": ticker.change_pct_24h
+            } if ticker else None
         }
     except Exception as e:
         print(f"Error fetching candles: {e}")
@@ -119,16 +107,28 @@ async def start_trading(request: StartSessionRequest):
     if debate_engine.is_running:
         raise HTTPException(status_code=400, detail="Session already running")
     
-    symbol = request.symbol or settings.default_symbol
+    if request.symbols == ["all"]:
+        symbols = list(settings.allowed_symbols)
+    else:
+        symbols = request.symbols or [request.symbol or settings.default_symbol]
+    unknown = [s for s in symbols if s not in settings.allowed_symbols]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Symbols not allowed: {', '.join(unknown)}")
+    debate_mode = request.debate_mode or settings.debate_mode
+    if debate_mode not in DEBATE_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown debate mode: {debate_mode}")
     interval = request.interval_seconds or settings.debate_interval_seconds
     
-    # Start continuous debate in background
-    import asyncio
-    asyncio.create_task(debate_engine.run_continuous(symbol, interval))
+    debate_engine.debate_mode = debate_mode
+    
+    # Start the multi-symbol debate scheduler in background
+    debate_scheduler.start(symbols, interval)
     
     return {
         "success": True,
-        "message": f"Trading session started for {symbol}",
+        "message": f"Trading session started for {', '.join(symbols)}",
+        "symbols": symbols,
+        "debate_mode": debate_mode,
         "interval_seconds": interval
     }
 
@@ -139,7 +139,7 @@ async def stop_trading():
     if not debate_engine.is_running:
         raise HTTPException(status_code=400, detail="No session running")
     
-    debate_engine.stop()
+    await debate_scheduler.stop()
     
     return {
         "success": True,
@@ -161,21 +161,41 @@ async def trigger_single_debate(symbol: Optional[str] = None):
 
 # Debate History
 @router.get("/debate/history")
-async def get_debate_history(limit: int = 50):
-    """Get recent debate messages"""
-    messages = debate_engine.get_debate_history(limit)
+async def get_debate_history(
+    limit: int = 50,
+    cursor: Optional[int] = None,
+    symbol: Optional[str] = None,
+    agent: Optional[str] = None,
+    decision: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+):
+    """
+    Debate messages, newest first, filtered by symbol / agent / decision / time.
+    Pass next_cursor back as cursor for the next (older) page.
+    """
+    limit = max(1, min(limit, 500))
+    page, next_cursor = debate_engine.history.query(
+        limit, before=cursor, symbol=symbol, agent=agent,
+        decision=decision.upper() if decision else None, since=since, until=until
+    )
     return {
         "messages": [
             {
+                "id": row_id,
                 "agent": m.agent,
                 "emoji": m.emoji,
                 "message": m.message,
                 "confidence": m.confidence,
+                "decision": m.decision,
+                "symbol": m.symbol,
+                "message_id": m.message_id,
                 "timestamp": m.timestamp.isoformat()
             }
-            for m in messages
+            for row_id, m in page
         ],
-        "total": len(messages)
+        "total": len(page),
+        "next_cursor": next_cursor
     }
 
 
@@ -3,99 +3,242 @@ WebSocket endpoint for real-time debate streaming
 """
 import asyncio
 import json
-from typing import List
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Union
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
 
 from data.data_models import DebateMessage
 from agents.debate_engine import debate_engine
+from events.event_bus import EventBus, Event, Subscription, DISCONNECT
+from api.channels import ChannelHub
+from api import frame_codec
+from config.settings import settings
+
+
+BROADCAST = "broadcast"  # Client fan-out topic (per-client replies are sent directly)
+
+
+class OutgoingFrame:
+    """A frame queued for clients, encoded at most once per wire encoding (on first send)"""
+    
+    __slots__ = ("frame", "encoded")
+    
+    def __init__(self, frame: dict):
+        self.frame = frame
+        self.encoded: Dict[str, Union[str, bytes]] = {}
 
 
 class ConnectionManager:
     """
-    Manages WebSocket connections for real-time debate streaming
+    Manages WebSocket connections for real-time debate streaming.
+    Each broadcast is serialized once per wire encoding in use (JSON, or a
+    compact format from api.frame_codec negotiated with ?encoding=); every
+    client has a bounded send queue drained by its own writer task (a
+    Subscription on the manager's fan-out bus), so a stalled socket only backs
+    up its own queue. A client whose queue overflows, or whose send stalls
+    past ws_send_timeout_seconds, is evicted.
+    Market and portfolio channels (see api.channels) are multicast to their subscribers only.
     """
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.bus = EventBus()  # Client fan-out: payloads are OutgoingFrames (or pre-encoded text)
+        self.clients: Dict[WebSocket, Subscription] = {}
+        self.encodings: Dict[WebSocket, str] = {}
+        self._sending: Dict[WebSocket, float] = {}  # Send start time of each in-flight write
+        self._watchdog_task: Optional[asyncio.Task] = None
+        self._next_client = 0
+        self.channels = ChannelHub(self.multicast)
+        
+        # Stats
+        self.broadcasts = 0
+        self.evicted = 0
+        self.serialize_seconds = 0.0
+        self.bytes_sent: Counter = Counter()  # Per encoding
+    
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
     
-    async def connect(self, websocket: WebSocket):
-        """Accept and track new connection"""
+    async def connect(self, websocket: WebSocket, encoding: Optional[str] = None):
+        """Accept and track new connection (encoding: json | binary | msgpack, as negotiated)"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self._next_client += 1
+        wire_encoding = frame_codec.negotiate(encoding)
+        self.encodings[websocket] = wire_encoding
+        
+        async def write(event: Event):
+            data = self._encode(event.payload, wire_encoding)
+            self._sending[websocket] = time.monotonic()  # Watched for stalls by _watchdog
+            try:
+                if isinstance(data, bytes):
+                    await websocket.send_bytes(data)
+                else:
+                    await websocket.send_text(data)
+                self.bytes_sent[wire_encoding] += len(data)
+            except Exception:
+                self.disconnect(websocket)  # Socket already gone
+            finally:
+                self._sending.pop(websocket, None)
+        
+        self.clients[websocket] = self.bus.subscribe(
+            f"client-{self._next_client}",
+            write,
+            topics=(BROADCAST,),
+            maxsize=settings.ws_send_queue_size,
+            policy=DISCONNECT,
+            on_close=lambda subscription: self._closed(websocket, subscription)
+        )
+        
+        if self._watchdog_task is None or self._watchdog_task.done():
+            self._watchdog_task = asyncio.create_task(self._watchdog())
+        
+        # A client that asked for an encoding first gets the field/value dictionaries (as JSON text)
+        if encoding is not None:
+            self.bus.send(self.clients[websocket], BROADCAST, json.dumps(frame_codec.dictionary(wire_encoding)))
         
         # Send recent history to new connection
         history = debate_engine.get_debate_history(20)
         for message in history:
-            await self.send_message(websocket, message)
+            self.send_message(websocket, message)
     
     def disconnect(self, websocket: WebSocket):
         """Remove disconnected client"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        subscription = self.clients.pop(websocket, None)
+        self.encodings.pop(websocket, None)
+        self.channels.unsubscribe(websocket)
+        if subscription is not None:
+            subscription.close()
+    
+    async def _watchdog(self):
+        """
+        Evict clients whose in-flight send has stalled past ws_send_timeout_seconds
+        (one periodic scan instead of a timeout wrapper around every send)
+        """
+        while self.clients:
+            timeout = settings.ws_send_timeout_seconds
+            await asyncio.sleep(timeout / 4)
+            now = time.monotonic()
+            for websocket, started in list(self._sending.items()):
+                if now - started > timeout:
+                    print(f"🐢 WebSocket client stalled for {timeout:g}s - evicting")
+                    self._evict(websocket)
     
-    async def send_message(self, websocket: WebSocket, message: DebateMessage):
-        """Send a message to a specific client"""
+    def _evict(self, websocket: WebSocket):
+        """Drop a slow consumer: stop its writer and close the socket"""
+        subscription = self.clients.get(websocket)
+        if subscription is not None:
+            subscription.close()  # -> _closed
+    
+    def _closed(self, websocket: WebSocket, subscription: Subscription):
+        """A client's subscription ended - by disconnect(), a failed send or queue overflow"""
+        if self.clients.get(websocket) is not subscription:
+            return  # Normal disconnect (already removed)
+        del self.clients[websocket]
+        self.encodings.pop(websocket, None)
+        self.channels.unsubscribe(websocket)
+        self.evicted += 1
+        asyncio.create_task(self._close_socket(websocket))
+    
+    @staticmethod
+    async def _close_socket(websocket: WebSocket):
         try:
-            await websocket.send_json({
-                "type": "debate_message",
-                "agent": message.agent,
-                "emoji": message.emoji,
-                "message": message.message,
-                "confidence": message.confidence,
-                "timestamp": message.timestamp.isoformat() if message.timestamp else datetime.now().isoformat()
-            })
-        except Exception as e:
-            print(f"Error sending to websocket: {e}")
-    
-    async def broadcast(self, message: DebateMessage):
+            await asyncio.wait_for(websocket.close(code=1013), 1.0)  # "Try again later"
+        except Exception:
+            pass
+    
+    def _encode(self, payload: Union[OutgoingFrame, str], encoding: str) -> Union[str, bytes]:
+        """A queued frame in the client's encoding, reusing an earlier client's encoding of it"""
+        if isinstance(payload, str):
+            return payload  # Handshake text
+        data = payload.encoded.get(encoding)
+        if data is None:
+            start = time.perf_counter()
+            data = payload.encoded[encoding] = frame_codec.encode(payload.frame, encoding)
+            self.serialize_seconds += time.perf_counter() - start
+        return data
+    
+    @staticmethod
+    def message_frame(message: DebateMessage) -> dict:
+        return {
+            "type": "debate_message",
+            "agent": message.agent,
+            "emoji": message.emoji,
+            "message": message.message,
+            "confidence": message.confidence,
+            "timestamp": message.timestamp.isoformat() if message.timestamp else datetime.now().isoformat(),
+            "message_id": message.message_id,
+            "symbol": message.symbol,
+            "decision": message.decision
+        }
+    
+    def send(self, websocket: WebSocket, frame: dict):
+        """Queue a frame for one client"""
+        subscription = self.clients.get(websocket)
+        if subscription is not None:
+            self.bus.send(subscription, BROADCAST, OutgoingFrame(frame))
+    
+    def send_message(self, websocket: WebSocket, message: DebateMessage):
+        """Queue a debate message for one client"""
+        self.send(websocket, self.message_frame(message))
+    
+    def multicast(self, websockets: Iterable[WebSocket], frame: dict):
+        """Queue one frame for the given clients (e.g. a channel's subscribers)"""
+        outgoing = OutgoingFrame(frame)
+        for websocket in websockets:
+            subscription = self.clients.get(websocket)
+            if subscription is not None:
+                self.bus.send(subscription, BROADCAST, outgoing)
+    
+    def broadcast_frame(self, frame: dict):
+        """Queue for every client (never waits on a socket); encoded once per encoding"""
+        self.broadcasts += 1
+        if self.clients:
+            self.bus.publish(BROADCAST, OutgoingFrame(frame))
+    
+    def broadcast(self, message: DebateMessage):
         """Broadcast message to all connected clients"""
-        disconnected = []
-        
-        for websocket in self.active_connections:
-            try:
-                await self.send_message(websocket, message)
-            except Exception:
-                disconnected.append(websocket)
-        
-        # Clean up disconnected clients
-        for ws in disconnected:
-            self.disconnect(ws)
+        self.broadcast_frame(self.message_frame(message))
     
-    async def broadcast_status(self, status: dict):
+    def broadcast_partial(self, frame: dict):
+        """Broadcast a streamed partial agent message (replaced by the final debate_message)"""
+        self.broadcast_frame({"type": "debate_partial", **frame})
+    
+    def broadcast_status(self, status: dict):
         """Broadcast status update to all clients"""
-        disconnected = []
-        
-        for websocket in self.active_connections:
-            try:
-                await websocket.send_json({
-                    "type": "status_update",
-                    **status
-                })
-            except Exception:
-                disconnected.append(websocket)
-        
-        for ws in disconnected:
-            self.disconnect(ws)
+        self.broadcast_frame({"type": "status_update", **status})
+    
+    def get_stats(self) -> dict:
+        queues = [subscription.depth for subscription in self.clients.values()]
+        return {
+            "clients": len(self.clients),
+            "broadcasts": self.broadcasts,
+            "evicted": self.evicted,
+            "encodings": dict(Counter(self.encodings.values())),
+            "serialize_ms_total": round(self.serialize_seconds * 1000, 1),
+            "bytes_sent": dict(self.bytes_sent),
+            "max_queue_depth": max(queues, default=0),
+            "queued_frames": sum(queues),
+            "channels": self.channels.get_stats()
+        }
 
 
 # Global connection manager
 connection_manager = ConnectionManager()
 
 
-# Register broadcast callback with debate engine
-async def broadcast_callback(message: DebateMessage):
-    """Callback to broadcast debate messages"""
-    await connection_manager.broadcast(message)
-
-debate_engine.add_message_callback(broadcast_callback)
+# Register broadcast callbacks with debate engine
+debate_engine.add_message_callback(connection_manager.broadcast)
+debate_engine.add_partial_callback(connection_manager.broadcast_partial)
 
 
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time debate streaming
     """
-    await connection_manager.connect(websocket)
+    # Optional compact wire format: /ws/debate?encoding=binary (or msgpack)
+    await connection_manager.connect(websocket, websocket.query_params.get("encoding"))
     
     try:
         while True:
@@ -107,7 +250,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 msg_type = message.get("type")
                 
                 if msg_type == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    connection_manager.send(websocket, {"type": "pong"})
                 
                 elif msg_type == "trigger_debate":
                     # Allow client to trigger a debate cycle
@@ -116,14 +259,29 @@ async def websocket_endpoint(websocket: WebSocket):
                         debate_engine.run_debate_cycle(symbol)
                     )
                 
+                elif msg_type == "subscribe":
+                    # Push channels: candles:{symbol}[:{interval}], ticker:{symbol}, positions, trades, status
+                    subscribed, rejected = await connection_manager.channels.subscribe(
+                        websocket, message.get("channels", [])
+                    )
+                    connection_manager.send(websocket, {
+                        "type": "subscribed",
+                        "channels": subscribed,
+                        "rejected": rejected
+                    })
+                
+                elif msg_type == "unsubscribe":
+                    removed = connection_manager.channels.unsubscribe(websocket, message.get("channels", []))
+                    connection_manager.send(websocket, {"type": "unsubscribed", "channels": removed})
+                
                 elif msg_type == "get_history":
                     limit = message.get("limit", 20)
                     history = debate_engine.get_debate_history(limit)
                     for msg in history:
-                        await connection_manager.send_message(websocket, msg)
+                        connection_manager.send_message(websocket, msg)
                 
             except json.JSONDecodeError:
-                await websocket.send_json({
+                connection_manager.send(websocket, {
                     "type": "error",
                     "message": "Invalid JSON"
                 })
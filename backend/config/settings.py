@@ -7,6 +7,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Relative file paths in settings are anchored here, not to the working directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
@@ -16,6 +19,21 @@ class Settings(BaseSettings):
     aws_secret_access_key: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
     aws_region: str = os.getenv("AWS_REGION", "us-east-1")
     bedrock_model_id: str = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # In-flight Bedrock calls across all agents
+    llm_executor_workers: int = int(os.getenv("LLM_EXECUTOR_WORKERS", "8"))
+    llm_timeout_seconds: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))  # Per-call deadline
+    llm_streaming: bool = os.getenv("LLM_STREAMING", "true").lower() == "true"  # Stream tokens to the UI
+    llm_stream_frame_interval_ms: int = int(os.getenv("LLM_STREAM_FRAME_INTERVAL_MS", "50"))  # Partial frame throttle
+    llm_cache_enabled: bool = os.getenv("LLM_CACHE", "true").lower() == "true"  # Reuse responses while the market is unchanged
+    llm_cache_ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "60"))
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+    llm_cache_disk_path: str = os.getenv("LLM_CACHE_DISK_PATH", "")  # SQLite file for a persistent tier ("" = memory only)
+    llm_cache_price_bucket_bps: float = float(os.getenv("LLM_CACHE_PRICE_BUCKET_BPS", "10"))  # Price moves within a bucket reuse responses
+    llm_context_budget_tokens: int = int(os.getenv("LLM_CONTEXT_BUDGET_TOKENS", "600"))  # Prior-turn history per agent
+    llm_fallback_models: str = os.getenv("LLM_FALLBACK_MODELS", "")  # Comma-separated hedge/fallback chain ("" = off)
+    llm_hedge_percentile: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))  # Hedge after this latency percentile
+    llm_hedge_initial_delay_seconds: float = float(os.getenv("LLM_HEDGE_INITIAL_DELAY_SECONDS", "8"))  # Until enough samples
+    llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
     
     # WEEX API
     weex_api_key: str = os.getenv("WEEX_API_KEY", "")
@@ -23,6 +41,25 @@ class Settings(BaseSettings):
     weex_passphrase: str = os.getenv("WEEX_PASSPHRASE", "")
     weex_base_url: str = os.getenv("WEEX_BASE_URL", "https://api-contract.weex.com")
     
+    # WEEX HTTP connection pool (shared keep-alive session)
+    weex_http2: bool = os.getenv("WEEX_HTTP2", "false").lower() == "true"  # Requires 'h2' package
+    weex_pool_max_connections: int = int(os.getenv("WEEX_POOL_MAX_CONNECTIONS", "20"))
+    weex_pool_max_keepalive: int = int(os.getenv("WEEX_POOL_MAX_KEEPALIVE", "10"))
+    weex_pool_keepalive_expiry: float = float(os.getenv("WEEX_POOL_KEEPALIVE_EXPIRY", "30"))
+    weex_market_timeout: float = float(os.getenv("WEEX_MARKET_TIMEOUT", "5"))  # Ticker, candles, depth
+    weex_account_timeout: float = float(os.getenv("WEEX_ACCOUNT_TIMEOUT", "10"))  # Balance, leverage, positions
+    weex_order_timeout: float = float(os.getenv("WEEX_ORDER_TIMEOUT", "15"))  # Place/cancel orders
+    
+    # WEEX WebSocket market data feed
+    weex_ws_url: str = os.getenv("WEEX_WS_URL", "wss://ws-contract.weex.com/ws")
+    market_data_streaming: bool = os.getenv("MARKET_DATA_STREAMING", "false").lower() == "true"
+    market_stream_stale_seconds: float = 10.0  # Fall back to REST if a symbol goes quiet this long
+    market_funding_ttl_seconds: float = float(os.getenv("MARKET_FUNDING_TTL_SECONDS", "60"))  # REST funding refresh (no WS channel)
+    weex_ws_backoff_initial: float = 1.0
+    weex_ws_backoff_max: float = 30.0
+    indicator_backend: str = os.getenv("INDICATOR_BACKEND", "pandas")  # "pandas" or "numpy"
+    streaming_indicators: bool = os.getenv("STREAMING_INDICATORS", "true").lower() == "true"  # O(1) per-bar updates in live mode
+    
     # Trading Parameters - COMPETITION MODE (AGGRESSIVE)
     max_leverage: int = int(os.getenv("MAX_LEVERAGE", "20"))  # Max for competition
     max_position_size_pct: float = float(os.getenv("MAX_POSITION_SIZE_PCT", "25"))  # Very aggressive
@@ -36,6 +73,22 @@ class Settings(BaseSettings):
     # Debate settings - ULTRA AGGRESSIVE for competition
     debate_interval_seconds: int = 15  # Much faster debates = more opportunities
     min_confidence_threshold: float = 0.55  # Lower threshold = many more trades
+    debate_mode: str = os.getenv("DEBATE_MODE", "sequential")  # "sequential", "parallel" or "committee" (one call for all roles)
+    debate_pacing_seconds: float = float(os.getenv("DEBATE_PACING_SECONDS", "0.5"))  # UI gap between messages (presentation only)
+    setup_gate_enabled: bool = os.getenv("SETUP_GATE", "true").lower() == "true"  # Skip the LLM debate when no setup exists
+    setup_gate_min_score: int = int(os.getenv("SETUP_GATE_MIN_SCORE", "3"))  # God Mode points (0-10) needed to debate
+    debate_max_concurrency: int = int(os.getenv("DEBATE_MAX_CONCURRENCY", "3"))  # Symbols debated at once
+    debate_cycle_deadline_seconds: float = float(os.getenv("DEBATE_CYCLE_DEADLINE_SECONDS", "45"))  # Cancel a cycle after this
+    debate_history_ring_size: int = int(os.getenv("DEBATE_HISTORY_RING_SIZE", "500"))  # Recent messages kept in memory
+    debate_history_db_path: str = os.getenv("DEBATE_HISTORY_DB_PATH", "debate_history.db")  # SQLite message log ("" = memory only; relative to backend/)
+
+    # Event bus (per-subscriber queues)
+    event_queue_size: int = int(os.getenv("EVENT_QUEUE_SIZE", "256"))  # Pending events per subscriber
+    event_overflow_policy: str = os.getenv("EVENT_OVERFLOW_POLICY", "drop_oldest")  # drop_oldest | coalesce | disconnect
+    ws_send_queue_size: int = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))  # Frames queued per dashboard before it is evicted
+    ws_send_timeout_seconds: float = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "5"))  # A single send stalled this long evicts the client
+    ws_channel_poll_seconds: float = float(os.getenv("WS_CHANNEL_POLL_SECONDS", "5"))  # Positions/status refresh for channel subscribers
+    ws_candle_poll_seconds: float = float(os.getenv("WS_CANDLE_POLL_SECONDS", "10"))  # Candle/ticker refresh when the market feed is not streaming
     
     # Demo Mode (for safe testing without real trades)
     demo_mode: bool = False  # LIVE MODE for competition
@@ -49,6 +102,12 @@ class Settings(BaseSettings):
     
     class Config:
         env_file = ".env"
+    
+    @property
+    def debate_history_path(self) -> str:
+        """debate_history_db_path anchored to the backend directory ("" stays memory only)"""
+        path = self.debate_history_db_path
+        return os.path.join(BACKEND_DIR, path) if path and not os.path.isabs(path) else path
 
 
 settings = Settings()
@@ -1,9 +1,13 @@
+from .candle_frame import CandleFrame
 from .data_models import (
     Candle, OrderBook, OrderBookLevel, Ticker, MarketData,
     TechnicalSignal, SignalStrength, TradeProposal, TradeAction,
     DebateMessage, TradeDecision, Position, Trade, OrderSide
 )
 from .weex_client import weex_client, WEEXClient
+from .candle_store import CandleStore, CandleRing
+from .orderbook_engine import OrderBookEngine, OrderBookSyncError
+from .market_stream import MarketStream
 from .market_data import market_data_service, MarketDataService
 from .ai_log_uploader import ai_log_uploader, AILogUploader
 
@@ -11,7 +15,8 @@ __all__ = [
     "Candle", "OrderBook", "OrderBookLevel", "Ticker", "MarketData",
     "TechnicalSignal", "SignalStrength", "TradeProposal", "TradeAction",
     "DebateMessage", "TradeDecision", "Position", "Trade", "OrderSide",
-    "weex_client", "WEEXClient",
+    "weex_client", "WEEXClient", "MarketStream",
+    "OrderBookEngine", "OrderBookSyncError", "CandleStore", "CandleRing", "CandleFrame",
     "market_data_service", "MarketDataService",
     "ai_log_uploader", "AILogUploader"
 ]
@@ -0,0 +1,150 @@
+"""
+Columnar (struct-of-arrays) candle representation for the hot path
+"""
+import numpy as np
+from typing import List, Sequence, Union
+from datetime import datetime
+
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+class CandleFrame:
+    """
+    OHLCV candles as NumPy columns: int64 epoch-ms `timestamp` index plus
+    float64 open/high/low/close/volume. Columns may be views (e.g. into a
+    CandleRing); use copy() for a stable snapshot.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray
+    ):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    # ==================== Construction ====================
+
+    @classmethod
+    def empty(cls) -> "CandleFrame":
+        return cls(np.zeros(0, dtype=np.int64), *(np.zeros(0) for _ in range(5)))
+
+    @classmethod
+    def from_klines(cls, rows: Sequence[Sequence]) -> "CandleFrame":
+        """
+        Parse WEEX kline arrays [ts, open, high, low, close, volume] (numbers
+        or numeric strings) straight into columns, sorted by time
+        """
+        if not rows:
+            return cls.empty()
+        try:
+            # Fast path: rectangular rows, parsed by NumPy in one call
+            table = np.array(rows, dtype=np.float64)
+            if table.ndim != 2 or table.shape[1] < 5:
+                raise ValueError("unexpected kline shape")
+        except (ValueError, TypeError):
+            table = cls._parse_rows_slow(rows)
+            if not len(table):
+                return cls.empty()
+
+        volume = table[:, 5] if table.shape[1] > 5 else np.zeros(len(table))
+        frame = cls(
+            table[:, 0].astype(np.int64),
+            np.ascontiguousarray(table[:, 1]),
+            np.ascontiguousarray(table[:, 2]),
+            np.ascontiguousarray(table[:, 3]),
+            np.ascontiguousarray(table[:, 4]),
+            np.ascontiguousarray(volume)
+        )
+        return frame.sorted()
+
+    @staticmethod
+    def _parse_rows_slow(rows: Sequence[Sequence]) -> np.ndarray:
+        """Row-by-row parse that skips malformed klines"""
+        parsed = []
+        for item in rows:
+            try:
+                parsed.append((
+                    float(item[0]), float(item[1]), float(item[2]), float(item[3]),
+                    float(item[4]), float(item[5]) if len(item) > 5 else 0.0
+                ))
+            except (IndexError, ValueError, TypeError) as e:
+                print(f"   Error parsing candle: {item} - {e}")
+        return np.array(parsed, dtype=np.float64).reshape(-1, 6)
+
+    @classmethod
+    def from_candles(cls, candles: List) -> "CandleFrame":
+        """Build from a list of pydantic Candle models"""
+        if not candles:
+            return cls.empty()
+        return cls(
+            np.array([int(c.timestamp.timestamp() * 1000) for c in candles], dtype=np.int64),
+            np.array([c.open for c in candles], dtype=np.float64),
+            np.array([c.high for c in candles], dtype=np.float64),
+            np.array([c.low for c in candles], dtype=np.float64),
+            np.array([c.close for c in candles], dtype=np.float64),
+            np.array([c.volume for c in candles], dtype=np.float64)
+        )
+
+    # ==================== Access ====================
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, key: Union[str, slice]) -> Union[np.ndarray, "CandleFrame"]:
+        """frame["close"] returns a column; frame[-50:] returns a CandleFrame of views"""
+        if isinstance(key, str):
+            if key not in COLUMNS:
+                raise KeyError(key)
+            return getattr(self, key)
+        return CandleFrame(*(getattr(self, name)[key] for name in COLUMNS))
+
+    def tail(self, n: int) -> "CandleFrame":
+        return self[-n:] if n < len(self) else self
+
+    def sorted(self) -> "CandleFrame":
+        """Chronological order (no-op when already sorted)"""
+        if len(self) < 2 or np.all(self.timestamp[1:] >= self.timestamp[:-1]):
+            return self
+        order = np.argsort(self.timestamp, kind="stable")
+        return CandleFrame(*(getattr(self, name)[order] for name in COLUMNS))
+
+    def copy(self) -> "CandleFrame":
+        return CandleFrame(*(getattr(self, name).copy() for name in COLUMNS))
+
+    # ==================== API Boundary ====================
+
+    def to_candles(self) -> List:
+        """Materialize pydantic Candle models (only needed at the API boundary)"""
+        from data.data_models import Candle
+        return [
+            Candle(
+                timestamp=datetime.fromtimestamp(ts / 1000),
+                open=o, high=h, low=l, close=c, volume=v
+            )
+            for ts, o, h, l, c, v in zip(
+                self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+    def to_chart_records(self) -> List[dict]:
+        """Plain dicts for the chart API (time in epoch seconds)"""
+        return [
+            {"time": ts // 1000, "open": o, "high": h, "low": l, "close": c, "volume": v}
+            for ts, o, h, l, c, v in zip(
+                self.timestamp.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist()
+            )
+        ]
@@ -0,0 +1,163 @@
+"""
+Per-(symbol, interval) candle store backed by fixed-capacity NumPy ring buffers
+"""
+import numpy as np
+from typing import Optional, List, Dict, Tuple, Union
+from datetime import datetime
+from data.candle_frame import CandleFrame
+
+INTERVAL_MS = {
+    "1m": 60_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "4h": 14_400_000, "1d": 86_400_000
+}
+
+
+class CandleRing:
+    """
+    Fixed-capacity OHLCV ring buffer.
+    Every bar is written twice (slot and slot + capacity), so the latest
+    `capacity` bars are always one contiguous slice and column reads are
+    zero-copy views in chronological order.
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)  # epoch ms
+        self._values = np.zeros((5, 2 * capacity), dtype=np.float64)  # open, high, low, close, volume
+        self._head = 0  # Slot of the next append
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Epoch-ms open time of the newest bar"""
+        if not self._size:
+            return None
+        return int(self._timestamps[(self._head - 1) % self.capacity])
+
+    def _write(self, slot: int, timestamp: int, ohlcv: Tuple[float, ...]):
+        for index in (slot, slot + self.capacity):
+            self._timestamps[index] = timestamp
+            self._values[:, index] = ohlcv
+
+    def upsert(self, timestamp: int, ohlcv: Tuple[float, ...]) -> str:
+        """
+        Add a bar: same open time as the newest bar updates it in place,
+        a newer one is appended, an older one is ignored.
+        Returns "updated", "appended" or "stale".
+        """
+        last = self.last_timestamp
+        if last is not None and timestamp == last:
+            self._write((self._head - 1) % self.capacity, timestamp, ohlcv)
+            return "updated"
+        if last is not None and timestamp < last:
+            return "stale"
+        self._write(self._head, timestamp, ohlcv)
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return "appended"
+
+    def extend(self, frame: CandleFrame) -> int:
+        """
+        Vectorized upsert of a time-sorted frame: the bar matching the newest
+        stored open time is updated, newer bars are appended, older ones ignored.
+        Returns the number of appended bars.
+        """
+        timestamps = frame.timestamp
+        values = np.vstack([frame.open, frame.high, frame.low, frame.close, frame.volume])
+        start = 0
+
+        last = self.last_timestamp
+        if last is not None:
+            start = int(np.searchsorted(timestamps, last, side="left"))
+            if start < len(timestamps) and timestamps[start] == last:
+                self._write((self._head - 1) % self.capacity, last, tuple(values[:, start]))
+                start += 1
+
+        # Only the newest `capacity` bars can survive
+        start = max(start, len(timestamps) - self.capacity)
+        count = len(timestamps) - start
+        if count <= 0:
+            return 0
+
+        slots = (self._head + np.arange(count)) % self.capacity
+        for offset in (0, self.capacity):
+            self._timestamps[slots + offset] = timestamps[start:]
+            self._values[:, slots + offset] = values[:, start:]
+        self._head = (self._head + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+        return count
+
+    def _window(self, limit: Optional[int]) -> slice:
+        n = self._size if limit is None else max(0, min(limit, self._size))
+        start = (self._head - n) % self.capacity
+        return slice(start, start + n)
+
+    def frame(self, limit: Optional[int] = None) -> CandleFrame:
+        """Read-only, zero-copy CandleFrame of the newest `limit` bars"""
+        window = self._window(limit)
+        columns = [self._timestamps[window]] + [self._values[i, window] for i in range(5)]
+        for view in columns:
+            view.flags.writeable = False
+        return CandleFrame(*columns)
+
+
+class CandleStore:
+    """
+    Holds one CandleRing per (symbol, interval).
+    Callers feed it only the newest bars (REST tail fetches or WebSocket klines).
+    """
+
+    def __init__(self, capacity: int = 500):
+        self.capacity = capacity
+        self._rings: Dict[Tuple[str, str], CandleRing] = {}
+
+    def clear(self):
+        """Drop all stored bars"""
+        self._rings.clear()
+
+    def reset(self, symbol: str, interval: str):
+        """Drop the stored bars of one series"""
+        self._rings.pop((symbol, interval), None)
+
+    def ring(self, symbol: str, interval: str) -> CandleRing:
+        key = (symbol, interval)
+        if key not in self._rings:
+            self._rings[key] = CandleRing(self.capacity)
+        return self._rings[key]
+
+    def has(self, symbol: str, interval: str) -> bool:
+        ring = self._rings.get((symbol, interval))
+        return ring is not None and len(ring) > 0
+
+    def ingest(self, symbol: str, interval: str, candles: Union[CandleFrame, List]) -> int:
+        """
+        Upsert candles (CandleFrame or Candle list); returns the number of new bars.
+        Bars starting after a gap replace the stored series, which must stay contiguous.
+        """
+        if not isinstance(candles, CandleFrame):
+            candles = CandleFrame.from_candles(candles)
+        candles = candles.sorted()
+        if len(candles) and self.has(symbol, interval):
+            last = self.ring(symbol, interval).last_timestamp
+            if int(candles.timestamp[0]) > last + INTERVAL_MS.get(interval, 300_000):
+                self.reset(symbol, interval)
+        return self.ring(symbol, interval).extend(candles)
+
+    def bars_missing(self, symbol: str, interval: str, now: Optional[datetime] = None) -> Optional[int]:
+        """
+        How many bars to request to catch up (newest stored bar included,
+        so its final values are refreshed). None when nothing is stored yet.
+        """
+        ring = self._rings.get((symbol, interval))
+        if ring is None or not len(ring):
+            return None
+        now_ms = int((now or datetime.now()).timestamp() * 1000)
+        interval_ms = INTERVAL_MS.get(interval, 300_000)
+        return max(2, (now_ms - ring.last_timestamp) // interval_ms + 2)
+
+    def frame(self, symbol: str, interval: str, limit: Optional[int] = None) -> CandleFrame:
+        """Zero-copy CandleFrame of the newest `limit` bars"""
+        return self.ring(symbol, interval).frame(limit)
@@ -1,10 +1,11 @@
 """
 Pydantic models for market data
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr, model_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from data.candle_frame import CandleFrame
 
 
 class OrderSide(str, Enum):
@@ -78,13 +79,35 @@ class Ticker(BaseModel):
 
 
 class MarketData(BaseModel):
-    """Aggregated market data for analysis"""
+    """
+    Aggregated market data for analysis
+    Candles are held columnar; `candles` materializes pydantic models on demand
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
     symbol: str
     ticker: Ticker
-    candles: List[Candle]
+    candle_frame: CandleFrame
     orderbook: OrderBook
     funding_rate: Optional[float] = None
     
+    _candles: Optional[List[Candle]] = PrivateAttr(default=None)
+    
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_candle_list(cls, data):
+        """Allow MarketData(candles=[Candle, ...]) as well as candle_frame=..."""
+        if isinstance(data, dict) and "candles" in data and "candle_frame" not in data:
+            data = dict(data)
+            data["candle_frame"] = CandleFrame.from_candles(data.pop("candles"))
+        return data
+    
+    @property
+    def candles(self) -> List[Candle]:
+        if self._candles is None:
+            self._candles = self.candle_frame.to_candles()
+        return self._candles
+    
     @property
     def current_price(self) -> float:
         return self.ticker.last_price
@@ -124,6 +147,9 @@ class DebateMessage(BaseModel):
     message: str
     confidence: Optional[float] = None
     timestamp: datetime = None
+    message_id: Optional[str] = None  # Links streamed partial frames to the final message
+    symbol: Optional[str] = None  # Market being debated (several can run at once)
+    decision: Optional[str] = None  # The agent's action/decision (PROPOSE_LONG, CHALLENGE, APPROVE, ...)
     
     def __init__(self, **data):
         if 'timestamp' not in data or data['timestamp'] is None:
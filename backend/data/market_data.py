@@ -7,6 +7,9 @@ import random
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 from data.weex_client import weex_client
+from data.candle_frame import CandleFrame
+from data.candle_store import CandleStore
+from data.market_stream import MarketStream
 from data.data_models import MarketData, Candle, OrderBook, OrderBookLevel, Ticker
 from config.settings import settings
 
@@ -90,12 +93,14 @@ class MarketDataService:
     """
     
     def __init__(self):
-        self._candle_cache: Dict[str, List[Candle]] = {}
+        self.candle_store = CandleStore()
         self._orderbook_cache: Dict[str, OrderBook] = {}
         self._ticker_cache: Dict[str, Ticker] = {}
         self._funding_cache: Dict[str, float] = {}
         self._last_update: Dict[str, datetime] = {}
         self._cache_ttl = timedelta(seconds=5)
+        self._funding_ttl = timedelta(seconds=settings.market_funding_ttl_seconds)
+        self._stream: Optional[MarketStream] = None  # Set in streaming mode
         # Check if WEEX credentials are properly configured
         self._use_mock = not settings.weex_api_key or settings.weex_api_key == "your_api_key" or len(settings.weex_api_key) < 10
         print(f"📊 MarketDataService initialized - Using {'MOCK' if self._use_mock else 'REAL WEEX'} data")
@@ -103,11 +108,52 @@ class MarketDataService:
             print(f"   WEEX API Key: {settings.weex_api_key[:10]}...")
 
     
-    def _is_cache_valid(self, key: str) -> bool:
+    async def start_streaming(self, symbols: Optional[List[str]] = None, interval: str = "5m"):
+        """
+        Switch to streaming mode: keep state for every symbol from the WebSocket
+        feed and serve get_market_data from memory (REST is only used as fallback)
+        """
+        if self._use_mock or self._stream is not None:
+            return
+        self._stream = MarketStream(
+            symbols or settings.allowed_symbols,
+            candle_store=self.candle_store,
+            interval=interval
+        )
+        await self._stream.start()
+        print(f"📡 Market data streaming enabled for {len(self._stream.symbols)} symbols")
+    
+    async def stop_streaming(self):
+        """Stop the WebSocket feed and return to REST polling"""
+        if self._stream is not None:
+            await self._stream.stop()
+            self._stream = None
+    
+    @property
+    def is_mock(self) -> bool:
+        return self._use_mock
+    
+    @property
+    def is_streaming(self) -> bool:
+        return self._stream is not None
+    
+    def is_stream_ready(self, symbol: str) -> bool:
+        """True when the WebSocket feed is keeping this symbol current"""
+        return self._stream is not None and self._stream.is_ready(symbol)
+    
+    def get_orderbook_engine(self, symbol: str):
+        """Live OrderBookEngine for a symbol in streaming mode (None otherwise)"""
+        return self._stream.get_book(symbol) if self._stream else None
+    
+    def get_stream_stats(self) -> Optional[dict]:
+        """WebSocket feed health, or None when not streaming"""
+        return self._stream.get_stats() if self._stream else None
+    
+    def _is_cache_valid(self, key: str, ttl: Optional[timedelta] = None) -> bool:
         """Check if cached data is still valid"""
         if key not in self._last_update:
             return False
-        return datetime.now() - self._last_update[key] < self._cache_ttl
+        return datetime.now() - self._last_update[key] < (self._cache_ttl if ttl is None else ttl)
     
     async def get_market_data(self, symbol: str) -> MarketData:
         """
@@ -117,11 +163,21 @@ class MarketDataService:
         if self._use_mock:
             return await self._get_mock_market_data(symbol)
         
+        # Streaming mode: served from memory while the feed is healthy; only the
+        # funding rate (no stream channel) is refreshed over REST on its TTL
+        if self._stream is not None and self._stream.is_ready(symbol):
+            try:
+                funding = await self.get_funding_rate(symbol)
+            except Exception as e:
+                print(f"Error refreshing funding rate for {symbol}: {e}")
+                funding = self._funding_cache.get(symbol, 0.0)
+            return self._stream.snapshot(symbol, funding)
+        
         try:
             # Fetch all data concurrently
-            ticker, candles, orderbook, funding = await asyncio.gather(
+            ticker, candle_frame, orderbook, funding = await asyncio.gather(
                 self.get_ticker(symbol),
-                self.get_candles(symbol),
+                self.get_candle_frame(symbol),
                 self.get_orderbook(symbol),
                 self.get_funding_rate(symbol)
             )
@@ -129,7 +185,7 @@ class MarketDataService:
             return MarketData(
                 symbol=symbol,
                 ticker=ticker,
-                candles=candles,
+                candle_frame=candle_frame.copy(),
                 orderbook=orderbook,
                 funding_rate=funding
             )
@@ -170,15 +226,56 @@ class MarketDataService:
         interval: str = "5m", 
         limit: int = 100
     ) -> List[Candle]:
-        """Get candles with caching"""
+        """Get candles as Candle models (API boundary; prefer get_candle_frame)"""
+        frame = await self.get_candle_frame(symbol, interval, limit)
+        return frame.to_candles()
+    
+    async def get_candle_frame(
+        self,
+        symbol: str,
+        interval: str = "5m",
+        limit: int = 100
+    ) -> CandleFrame:
+        """
+        Get a zero-copy CandleFrame from the candle store, fetching only
+        bars newer than what is stored
+        """
+        await self._refresh_candles(symbol, interval, limit)
+        return self.candle_store.frame(symbol, interval, limit)
+    
+    def get_cached_candle_frame(
+        self,
+        symbol: str,
+        interval: str = "5m",
+        limit: int = 100
+    ) -> Optional[CandleFrame]:
+        """CandleFrame of already-stored candles without any fetch (None if not stored)"""
+        if self._use_mock or not self.candle_store.has(symbol, interval):
+            return None
+        return self.candle_store.frame(symbol, interval, limit)
+    
+    async def _refresh_candles(self, symbol: str, interval: str, limit: int):
+        """Top up the candle store with the bars published since the last fetch"""
         cache_key = f"candles_{symbol}_{interval}"
         if self._is_cache_valid(cache_key):
-            return self._candle_cache.get(cache_key, [])
+            return
+        
+        # Streaming mode keeps this interval current from the kline channel
+        if (self._stream is not None and interval == self._stream.interval
+                and self._stream.is_ready(symbol)):
+            return
         
-        candles = await weex_client.get_klines(symbol, interval, limit)
-        self._candle_cache[cache_key] = candles
+        missing = self.candle_store.bars_missing(symbol, interval)
+        if missing is not None and missing > limit:
+            # More bars missing than one fetch covers: start over with a contiguous window
+            self.candle_store.reset(symbol, interval)
+            missing = None
+        stored = len(self.candle_store.ring(symbol, interval))
+        fetch = limit if missing is None or stored < limit else missing
+        
+        frame = await weex_client.get_klines_frame(symbol, interval, fetch)
+        self.candle_store.ingest(symbol, interval, frame)
         self._last_update[cache_key] = datetime.now()
-        return candles
     
     async def get_orderbook(self, symbol: str, depth: int = 20) -> OrderBook:
         """Get orderbook with caching"""
@@ -192,9 +289,9 @@ class MarketDataService:
         return orderbook
     
     async def get_funding_rate(self, symbol: str) -> float:
-        """Get funding rate with caching"""
+        """Get funding rate with caching (slow-moving: cached for the funding TTL)"""
         cache_key = f"funding_{symbol}"
-        if self._is_cache_valid(cache_key):
+        if self._is_cache_valid(cache_key, self._funding_ttl):
             return self._funding_cache.get(symbol, 0)
         
         funding = await weex_client.get_funding_rate(symbol)
@@ -211,7 +308,7 @@ class MarketDataService:
                 del self._last_update[key]
         else:
             # Clear all
-            self._candle_cache.clear()
+            self.candle_store.clear()
             self._orderbook_cache.clear()
             self._ticker_cache.clear()
             self._funding_cache.clear()
@@ -0,0 +1,229 @@
+"""
+Live market data feed built on the WEEX WebSocket
+Keeps ticker, order book and candles in memory so reads need no network calls
+"""
+import asyncio
+from typing import Optional, List, Dict
+from datetime import datetime, timedelta
+from data.weex_client import weex_client, WEEXClient, parse_ticker
+from data.candle_frame import CandleFrame
+from data.data_models import MarketData, OrderBook, Ticker
+from data.orderbook_engine import OrderBookEngine, OrderBookSyncError
+from data.candle_store import CandleStore, INTERVAL_MS
+from events.event_bus import event_bus, MARKET_TICKER, MARKET_CANDLE
+from config.settings import settings
+
+
+def ticker_channel(symbol: str) -> str:
+    return f"ticker.{symbol}"
+
+
+def depth_channel(symbol: str) -> str:
+    return f"depth.{symbol}"
+
+
+def kline_channel(symbol: str, interval: str) -> str:
+    return f"kline.{interval}.{symbol}"
+
+
+class MarketStream:
+    """
+    Maintains per-symbol market state from ticker, depth and kline channels.
+    Sequence gaps (or a reconnect) trigger a REST resync of the affected symbol.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        candle_store: CandleStore,
+        interval: str = "5m",
+        candle_limit: int = 100,
+        depth: int = 20,
+        client: WEEXClient = weex_client
+    ):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.candle_limit = candle_limit
+        self.depth = depth
+        self.client = client
+        self.candle_store = candle_store
+
+        self.tickers: Dict[str, Ticker] = {}
+        self.books: Dict[str, OrderBookEngine] = {s: OrderBookEngine(s) for s in self.symbols}
+        self._last_message: Dict[str, datetime] = {}
+        self._resyncing: Dict[str, asyncio.Task] = {}
+
+        self.stale_after = timedelta(seconds=settings.market_stream_stale_seconds)
+        self.messages_received = 0
+        self.gaps_detected = 0
+        self.resyncs = 0
+
+    async def start(self):
+        """Subscribe to all channels, connect and load initial REST snapshots"""
+        self.client.on_websocket_connect(self._on_connect)
+        for symbol in self.symbols:
+            await self.client.subscribe(ticker_channel(symbol), self._on_ticker)
+            await self.client.subscribe(depth_channel(symbol), self._on_depth)
+            await self.client.subscribe(kline_channel(symbol, self.interval), self._on_kline)
+        await self.client.connect_websocket()
+
+    async def stop(self):
+        """Stop the feed and any resyncs in flight"""
+        for task in self._resyncing.values():
+            task.cancel()
+        self._resyncing.clear()
+        await self.client.close_websocket()
+
+    async def _on_connect(self):
+        """Anything may have been missed while disconnected - resync all symbols"""
+        for symbol in self.symbols:
+            self._schedule_resync(symbol)
+
+    # ==================== State Access ====================
+
+    def is_ready(self, symbol: str) -> bool:
+        """True when the symbol has complete, recently updated state (order book checksum-verified)"""
+        if symbol in self._resyncing:
+            return False
+        if symbol not in self.tickers or not self.candle_store.has(symbol, self.interval):
+            return False
+        book = self.books.get(symbol)
+        if book is None or not book.synced or not book.verified or book.is_empty():
+            return False
+        last = self._last_message.get(symbol)
+        return last is not None and datetime.now() - last < self.stale_after
+
+    def get_book(self, symbol: str) -> Optional[OrderBookEngine]:
+        """Live order book engine for a symbol (for depth queries without copies)"""
+        return self.books.get(symbol)
+
+    def get_orderbook(self, symbol: str) -> OrderBook:
+        """Build an OrderBook snapshot from the local book"""
+        return self.books[symbol].to_orderbook(self.depth)
+
+    def snapshot(self, symbol: str, funding_rate: float = 0.0) -> MarketData:
+        """Current MarketData for a symbol, served entirely from memory"""
+        return MarketData(
+            symbol=symbol,
+            ticker=self.tickers[symbol],
+            candle_frame=self.candle_store.frame(symbol, self.interval, self.candle_limit).copy(),
+            orderbook=self.get_orderbook(symbol),
+            funding_rate=funding_rate
+        )
+
+    # ==================== Channel Handlers ====================
+
+    @staticmethod
+    def _symbol_of(message: dict) -> str:
+        return message.get("channel", "").rsplit(".", 1)[-1]
+
+    def _touch(self, symbol: str):
+        self.messages_received += 1
+        self._last_message[symbol] = datetime.now()
+
+    async def _on_ticker(self, message: dict):
+        symbol = self._symbol_of(message)
+        self.tickers[symbol] = parse_ticker(symbol, message.get("data", {}))
+        self._touch(symbol)
+        event_bus.publish(MARKET_TICKER, self.tickers[symbol], key=symbol)
+
+    async def _on_depth(self, message: dict):
+        symbol = self._symbol_of(message)
+        book = self.books.get(symbol)
+        if book is None:
+            return
+        data = message.get("data", {})
+
+        try:
+            if message.get("action") == "snapshot":
+                book.apply_snapshot(
+                    data.get("bids", []), data.get("asks", []),
+                    seq=message.get("seq"), checksum=message.get("checksum")
+                )
+            elif book.synced:
+                book.apply_delta(
+                    data.get("bids", []), data.get("asks", []),
+                    seq=message.get("seq"), prev_seq=message.get("prevSeq"),
+                    checksum=message.get("checksum")
+                )
+            else:
+                return  # Waiting for a snapshot/resync
+        except OrderBookSyncError as e:
+            self.gaps_detected += 1
+            print(f"⚠️ Depth out of sync: {e}")
+            self._schedule_resync(symbol)
+            return
+        self._touch(symbol)
+
+    async def _on_kline(self, message: dict):
+        symbol = self._symbol_of(message)
+        ring = self.candle_store.ring(symbol, self.interval)
+        interval_ms = INTERVAL_MS.get(self.interval, 300_000)
+
+        frame = CandleFrame.from_klines(message.get("data", []))
+        for i in range(len(frame)):
+            timestamp = int(frame.timestamp[i])
+            last = ring.last_timestamp
+            if last is not None and timestamp - last > interval_ms:
+                self.gaps_detected += 1
+                print(f"⚠️ Kline gap on {symbol}: {(timestamp - last) / 1000:.0f}s between bars")
+                self._schedule_resync(symbol)
+                return
+            # Same open time updates the in-progress bar in place
+            ring.upsert(timestamp, (
+                frame.open[i], frame.high[i], frame.low[i], frame.close[i], frame.volume[i]
+            ))
+        self._touch(symbol)
+        if len(frame):
+            i = len(frame) - 1
+            event_bus.publish(MARKET_CANDLE, {
+                "symbol": symbol,
+                "interval": self.interval,
+                "timestamp": int(frame.timestamp[i]),
+                "open": float(frame.open[i]),
+                "high": float(frame.high[i]),
+                "low": float(frame.low[i]),
+                "close": float(frame.close[i]),
+                "volume": float(frame.volume[i])
+            }, key=f"{symbol}/{self.interval}")
+
+    # ==================== REST Resync ====================
+
+    def _schedule_resync(self, symbol: str):
+        """Start a REST resync for a symbol unless one is already running"""
+        if symbol in self._resyncing:
+            return
+        self._resyncing[symbol] = asyncio.create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str):
+        """Replace a symbol's state with fresh REST snapshots"""
+        try:
+            ticker, candles, (bids, asks) = await asyncio.gather(
+                self.client.get_ticker(symbol),
+                self.client.get_klines_frame(symbol, self.interval, self.candle_limit),
+                # At least the checksum depth, or the REST book could never match the stream
+                self.client.get_orderbook_levels(symbol, max(self.depth, OrderBookEngine.CHECKSUM_LEVELS))
+            )
+            self.tickers[symbol] = ticker
+            self.candle_store.ingest(symbol, self.interval, candles)
+            # Raw strings keep checksums comparable; with no sequence number the book
+            # is unverified (and not ready) until a delta's checksum matches or a WS snapshot
+            self.books[symbol].apply_snapshot(bids, asks, verified=False)
+            self._touch(symbol)
+            self.resyncs += 1
+        except Exception as e:
+            print(f"Error resyncing {symbol}: {e}")
+        finally:
+            self._resyncing.pop(symbol, None)
+
+    def get_stats(self) -> dict:
+        """Feed health counters"""
+        return {
+            "symbols": len(self.symbols),
+            "ready": sum(1 for s in self.symbols if self.is_ready(s)),
+            "messages_received": self.messages_received,
+            "gaps_detected": self.gaps_detected,
+            "resyncs": self.resyncs,
+            "unverified_books": sum(1 for book in self.books.values() if book.synced and not book.verified),
+            "reconnects": self.client.ws_reconnects
+        }
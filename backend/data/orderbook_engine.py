@@ -0,0 +1,273 @@
+"""
+Incremental local order book maintained from WebSocket depth deltas
+"""
+import zlib
+from bisect import bisect_left, insort
+from typing import Optional, List, Dict, Tuple, Sequence
+from datetime import datetime
+from data.data_models import OrderBook, OrderBookLevel
+
+
+class OrderBookSyncError(Exception):
+    """Raised when a delta cannot be applied and the book must be resynced"""
+
+
+class _BookSide:
+    """
+    One side of the book as a sorted array of price keys, best price last.
+    Bids use the price as key, asks use -price, so the best level is always
+    keys[-1] (O(1)) and the top-k is the last k keys reversed (O(k)).
+    """
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self.keys: List[float] = []
+        self.quantities: Dict[float, float] = {}
+        self.raw: Dict[float, Tuple[str, str]] = {}  # Original strings, for checksums
+
+    def _key(self, price: float) -> float:
+        return price if self.is_bid else -price
+
+    def _price(self, key: float) -> float:
+        return key if self.is_bid else -key
+
+    def clear(self):
+        self.keys.clear()
+        self.quantities.clear()
+        self.raw.clear()
+
+    def set(self, price, quantity):
+        """Insert, update or (quantity == 0) remove a level"""
+        p, q = float(price), float(quantity)
+        key = self._key(p)
+        if q == 0:
+            if key in self.quantities:
+                del self.quantities[key]
+                self.raw.pop(key, None)
+                index = bisect_left(self.keys, key)
+                del self.keys[index]
+            return
+        if key not in self.quantities:
+            insort(self.keys, key)
+        self.quantities[key] = q
+        self.raw[key] = (str(price), str(quantity))
+
+    def best(self) -> Optional[Tuple[float, float]]:
+        if not self.keys:
+            return None
+        key = self.keys[-1]
+        return self._price(key), self.quantities[key]
+
+    def top(self, k: int) -> List[Tuple[float, float]]:
+        return [
+            (self._price(key), self.quantities[key])
+            for key in reversed(self.keys[-k:] if k > 0 else [])
+        ]
+
+    def depth_to(self, price: float) -> float:
+        """Cumulative quantity at prices equal to or better than `price`"""
+        index = bisect_left(self.keys, self._key(price))
+        return sum(self.quantities[key] for key in self.keys[index:])
+
+    def volume(self, k: int) -> float:
+        return sum(self.quantities[key] for key in self.keys[-k:]) if k > 0 else 0.0
+
+    def raw_top(self, k: int) -> List[Tuple[str, str]]:
+        return [self.raw[key] for key in reversed(self.keys[-k:] if k > 0 else [])]
+
+
+class OrderBookEngine:
+    """
+    Local order book for one symbol.
+    Applies snapshots and sequence-checked deltas; any gap or checksum
+    mismatch marks the book unsynced until a new snapshot is loaded.
+    A REST snapshot is unverified (no sequence number, taken at a different
+    moment than the delta stream): the first delta anchors the sequence and
+    up to MAX_UNVERIFIED_MISMATCHES checksum mismatches are tolerated until
+    one matches or a WebSocket snapshot arrives; then the book is unsynced.
+    """
+
+    CHECKSUM_LEVELS = 25
+    MAX_UNVERIFIED_MISMATCHES = 5
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _BookSide(is_bid=True)
+        self.asks = _BookSide(is_bid=False)
+        self.seq: Optional[int] = None
+        self.synced = False
+        self.verified = False  # Anchored to the stream (WS snapshot or a matching checksum)
+        self.unverified_mismatches = 0
+        self.updated_at: Optional[datetime] = None
+        self.deltas_applied = 0
+        self.sync_errors = 0
+
+    # ==================== Updates ====================
+
+    def apply_snapshot(
+        self,
+        bids: Sequence[Sequence],
+        asks: Sequence[Sequence],
+        seq: Optional[int] = None,
+        checksum: Optional[int] = None,
+        verified: bool = True
+    ):
+        """
+        Replace the whole book with a snapshot of [price, quantity] levels
+        (keep the exchange's price/quantity strings: checksums hash them as sent)
+        """
+        self.bids.clear()
+        self.asks.clear()
+        for price, quantity in bids:
+            self.bids.set(price, quantity)
+        for price, quantity in asks:
+            self.asks.set(price, quantity)
+        self.seq = seq
+        self.synced = True
+        self.verified = verified
+        self.unverified_mismatches = 0
+        self.updated_at = datetime.now()
+        if checksum is not None:
+            self._verify_checksum(checksum)
+
+    def load_orderbook(self, orderbook: OrderBook):
+        """
+        Replace the book from a REST OrderBook snapshot (unverified; prefer the
+        raw levels from WEEXClient.get_orderbook_levels so checksums can match)
+        """
+        self.apply_snapshot(
+            [(b.price, b.quantity) for b in orderbook.bids],
+            [(a.price, a.quantity) for a in orderbook.asks],
+            verified=False
+        )
+
+    def apply_delta(
+        self,
+        bids: Sequence[Sequence],
+        asks: Sequence[Sequence],
+        seq: Optional[int] = None,
+        prev_seq: Optional[int] = None,
+        checksum: Optional[int] = None
+    ):
+        """
+        Apply changed levels (quantity 0 removes a level).
+        Raises OrderBookSyncError on a sequence gap or checksum mismatch.
+        """
+        if not self.synced:
+            raise OrderBookSyncError(f"{self.symbol}: book not synced")
+
+        if seq is not None and self.seq is not None:
+            expected = self.seq if prev_seq is not None else self.seq + 1
+            received = prev_seq if prev_seq is not None else seq
+            if received != expected:
+                self._desync()
+                raise OrderBookSyncError(
+                    f"{self.symbol}: sequence gap (expected {expected}, got {received})"
+                )
+
+        for price, quantity in bids:
+            self.bids.set(price, quantity)
+        for price, quantity in asks:
+            self.asks.set(price, quantity)
+
+        if seq is not None:
+            self.seq = seq
+        self.updated_at = datetime.now()
+        self.deltas_applied += 1
+
+        if checksum is not None:
+            if self.verified:
+                self._verify_checksum(checksum)
+            elif self.compute_checksum() == checksum:
+                self.verified = True  # REST-loaded book now matches the stream
+            else:
+                self.unverified_mismatches += 1
+                if self.unverified_mismatches >= self.MAX_UNVERIFIED_MISMATCHES:
+                    self._desync()
+                    raise OrderBookSyncError(
+                        f"{self.symbol}: checksum still mismatched after {self.unverified_mismatches} deltas"
+                    )
+
+    def _desync(self):
+        self.synced = False
+        self.sync_errors += 1
+
+    def compute_checksum(self, levels: int = CHECKSUM_LEVELS) -> int:
+        """
+        Signed CRC32 over interleaved top levels "bid:qty:ask:qty:...",
+        using the price/quantity strings as received from the exchange
+        """
+        bids = self.bids.raw_top(levels)
+        asks = self.asks.raw_top(levels)
+        parts = []
+        for i in range(max(len(bids), len(asks))):
+            if i < len(bids):
+                parts.extend(bids[i])
+            if i < len(asks):
+                parts.extend(asks[i])
+        crc = zlib.crc32(":".join(parts).encode())
+        return crc - (1 << 32) if crc >= (1 << 31) else crc
+
+    def _verify_checksum(self, checksum: int):
+        if self.compute_checksum() != checksum:
+            self._desync()
+            raise OrderBookSyncError(f"{self.symbol}: checksum mismatch")
+
+    # ==================== Queries ====================
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        return self.asks.best()
+
+    def top_bids(self, k: int) -> List[Tuple[float, float]]:
+        return self.bids.top(k)
+
+    def top_asks(self, k: int) -> List[Tuple[float, float]]:
+        return self.asks.top(k)
+
+    def depth_at(self, price: float, side: str) -> float:
+        """Cumulative quantity from the best level down to `price` on "bid"/"ask" side"""
+        return (self.bids if side == "bid" else self.asks).depth_to(price)
+
+    @property
+    def mid(self) -> float:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid and ask:
+            return (bid[0] + ask[0]) / 2
+        return 0.0
+
+    @property
+    def spread(self) -> float:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid and ask:
+            return ask[0] - bid[0]
+        return 0.0
+
+    @property
+    def spread_pct(self) -> float:
+        mid = self.mid
+        return (self.spread / mid) * 100 if mid else 0.0
+
+    def imbalance(self, levels: int = 20) -> float:
+        """
+        Order Book Imbalance over the top levels
+        Range: -1.0 (sell pressure) to 1.0 (buy pressure)
+        """
+        bid_vol = self.bids.volume(levels)
+        ask_vol = self.asks.volume(levels)
+        total = bid_vol + ask_vol
+        return (bid_vol - ask_vol) / total if total else 0.0
+
+    def is_empty(self) -> bool:
+        return not self.bids.keys or not self.asks.keys
+
+    def to_orderbook(self, depth: int = 20) -> OrderBook:
+        """Produce a pydantic OrderBook snapshot of the top levels"""
+        return OrderBook(
+            symbol=self.symbol,
+            timestamp=self.updated_at or datetime.now(),
+            bids=[OrderBookLevel(price=p, quantity=q) for p, q in self.bids.top(depth)],
+            asks=[OrderBookLevel(price=p, quantity=q) for p, q in self.asks.top(depth)]
+        )
@@ -8,7 +8,8 @@ import base64
 import time
 import json
 import asyncio
-from typing import Optional, Callable, Dict, List, Any
+import random
+from typing import Optional, Callable, Dict, List, Any, Tuple
 from datetime import datetime
 import httpx
 import websockets
@@ -16,6 +17,7 @@ from config.settings import settings
 from data.data_models import (
     Candle, OrderBook, OrderBookLevel, Ticker, OrderSide
 )
+from data.candle_frame import CandleFrame
 
 
 # Allowed trading pairs in the competition
@@ -24,6 +26,40 @@ ALLOWED_SYMBOLS = [
     "cmt_xrpusdt", "cmt_adausdt", "cmt_bnbusdt", "cmt_ltcusdt"
 ]
 
+# Supported kline intervals -> WEEX granularity
+KLINE_INTERVALS = {
+    "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
+    "1h": "1H", "4h": "4H", "1d": "1D"
+}
+
+
+def parse_ticker(symbol: str, data: dict) -> Ticker:
+    """Build a Ticker from a WEEX ticker payload (REST or WebSocket)"""
+    return Ticker(
+        symbol=symbol,
+        last_price=float(data.get("last", data.get("lastPr", 0))),
+        bid=float(data.get("best_bid", data.get("bidPr", 0))),
+        ask=float(data.get("best_ask", data.get("askPr", 0))),
+        volume_24h=float(data.get("volume_24h", data.get("baseVolume", 0))),
+        change_24h=0,
+        change_pct_24h=float(data.get("priceChangePercent", data.get("change24h", 0))),
+        high_24h=float(data.get("high_24h", data.get("high24h", 0))),
+        low_24h=float(data.get("low_24h", data.get("low24h", 0))),
+        timestamp=datetime.now()
+    )
+
+
+def parse_candle(item: list) -> Candle:
+    """Build a Candle from a WEEX kline array [ts, open, high, low, close, volume]"""
+    return Candle(
+        timestamp=datetime.fromtimestamp(int(item[0]) / 1000),
+        open=float(item[1]),
+        high=float(item[2]),
+        low=float(item[3]),
+        close=float(item[4]),
+        volume=float(item[5]) if len(item) > 5 else 0
+    )
+
 
 class WEEXClient:
     """
@@ -36,16 +72,69 @@ class WEEXClient:
         self.api_key = settings.weex_api_key
         self.secret_key = settings.weex_api_secret
         self.passphrase = settings.weex_passphrase
-        self.base_url = "https://api-contract.weex.com"
-        self.ws_url = "wss://ws-contract.weex.com/ws"
+        self.base_url = settings.weex_base_url
+        self.ws_url = settings.weex_ws_url
+        self._http: Optional[httpx.AsyncClient] = None
         self._ws_connection = None
+        self._ws_task: Optional[asyncio.Task] = None
+        self._ws_running = False
         self._ws_callbacks: Dict[str, List[Callable]] = {}
+        self._ws_connect_callbacks: List[Callable] = []
+        self.ws_reconnects = 0
         # Headers to bypass Cloudflare protection
         self._default_headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "application/json",
             "Accept-Language": "en-US,en;q=0.9",
         }
+        # Per-endpoint-group timeouts (seconds)
+        self._timeouts = {
+            "market": settings.weex_market_timeout,
+            "account": settings.weex_account_timeout,
+            "order": settings.weex_order_timeout,
+        }
+    
+    # ==================== HTTP Session ====================
+    
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """Create the long-lived, connection-pooled HTTP client"""
+        http2 = settings.weex_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("⚠️ WEEX_HTTP2 enabled but 'h2' is not installed - falling back to HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self._default_headers,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.weex_pool_max_connections,
+                max_keepalive_connections=settings.weex_pool_max_keepalive,
+                keepalive_expiry=settings.weex_pool_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self._timeouts["market"])
+        )
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared HTTP client (created lazily if start() was not called)"""
+        if self._http is None or self._http.is_closed:
+            self._http = self._build_http_client()
+        return self._http
+    
+    async def start(self):
+        """Open the pooled HTTP session (called on app startup)"""
+        _ = self.http
+        print(f"🔌 WEEX HTTP pool ready: {self.base_url}")
+    
+    async def close_http(self):
+        """Close the pooled HTTP session and drop its connections"""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
     
     def _generate_signature_get(
         self, 
@@ -113,36 +202,25 @@ class WEEXClient:
     async def get_ticker(self, symbol: str = "cmt_btcusdt") -> Ticker:
         """Get current ticker for a symbol"""
         try:
-            async with httpx.AsyncClient(timeout=10.0, headers=self._default_headers) as client:
-                response = await client.get(
-                    f"{self.base_url}/capi/v2/market/ticker",
-                    params={"symbol": symbol}
-                )
-                print(f"📈 WEEX Ticker Response Status: {response.status_code}")
-                
-                if response.status_code != 200:
-                    print(f"   Error: {response.text[:200]}")
-                    raise Exception(f"API error: {response.status_code}")
-                
-                data = response.json()
-                print(f"   Ticker data keys: {list(data.keys()) if isinstance(data, dict) else 'list'}")
-                
-                # Handle different response structures
-                if isinstance(data, dict) and "data" in data:
-                    data = data["data"]
-                
-                return Ticker(
-                    symbol=symbol,
-                    last_price=float(data.get("last", data.get("lastPr", 0))),
-                    bid=float(data.get("best_bid", data.get("bidPr", 0))),
-                    ask=float(data.get("best_ask", data.get("askPr", 0))),
-                    volume_24h=float(data.get("volume_24h", data.get("baseVolume", 0))),
-                    change_24h=0,
-                    change_pct_24h=float(data.get("priceChangePercent", data.get("change24h", 0))),
-                    high_24h=float(data.get("high_24h", data.get("high24h", 0))),
-                    low_24h=float(data.get("low_24h", data.get("low24h", 0))),
-                    timestamp=datetime.now()
-                )
+            response = await self.http.get(
+                "/capi/v2/market/ticker",
+                params={"symbol": symbol},
+                timeout=self._timeouts["market"]
+            )
+            print(f"📈 WEEX Ticker Response Status: {response.status_code}")
+            
+            if response.status_code != 200:
+                print(f"   Error: {response.text[:200]}")
+                raise Exception(f"API error: {response.status_code}")
+            
+            data = response.json()
+            print(f"   Ticker data keys: {list(data.keys()) if isinstance(data, dict) else 'list'}")
+            
+            # Handle different response structures
+            if isinstance(data, dict) and "data" in data:
+                data = data["data"]
+            
+            return parse_ticker(symbol, data)
         except Exception as e:
             print(f"❌ Error fetching ticker: {e}")
             raise
@@ -153,103 +231,98 @@ class WEEXClient:
         interval: str = "5m", 
         limit: int = 100
     ) -> List[Candle]:
-        """Get historical candlestick data"""
+        """Get historical candlestick data as Candle models"""
+        frame = await self.get_klines_frame(symbol, interval, limit)
+        return frame.to_candles()
+    
+    async def get_klines_frame(
+        self,
+        symbol: str = "cmt_btcusdt",
+        interval: str = "5m",
+        limit: int = 100
+    ) -> CandleFrame:
+        """Get historical candlestick data parsed straight into columns"""
         # Map interval to WEEX format
-        interval_map = {
-            "1m": "1m", "5m": "5m", "15m": "15m", "30m": "30m",
-            "1h": "1H", "4h": "4H", "1d": "1D"
-        }
-        weex_interval = interval_map.get(interval, "5m")
+        weex_interval = KLINE_INTERVALS.get(interval, "5m")
         
         try:
-            async with httpx.AsyncClient(timeout=10.0, headers=self._default_headers) as client:
-                url = f"{self.base_url}/capi/v2/market/candles"
-                params = {
-                    "symbol": symbol,
-                    "granularity": weex_interval,
-                    "limit": limit
-                }
-                print(f"📊 WEEX Klines Request: {url} with params {params}")
-                
-                response = await client.get(url, params=params)
-                print(f"   Response Status: {response.status_code}")
-                
-                if response.status_code != 200:
-                    print(f"   Error: {response.text[:200]}")
-                    raise Exception(f"API error: {response.status_code}")
-                
-                raw_data = response.text
-                print(f"   Raw response (first 200 chars): {raw_data[:200]}")
-                
-                data = response.json()
-                
-                # Handle different response structures
-                candle_list = []
-                if isinstance(data, list):
-                    candle_list = data
-                elif isinstance(data, dict):
-                    candle_list = data.get("data", [])
-                    if not candle_list:
-                        print(f"   Response structure: {list(data.keys())}")
-                
-                print(f"   Found {len(candle_list)} candles")
-                
-                candles = []
-                for item in candle_list:
-                    try:
-                        candles.append(Candle(
-                            timestamp=datetime.fromtimestamp(int(item[0]) / 1000),
-                            open=float(item[1]),
-                            high=float(item[2]),
-                            low=float(item[3]),
-                            close=float(item[4]),
-                            volume=float(item[5]) if len(item) > 5 else 0
-                        ))
-                    except (IndexError, ValueError) as e:
-                        print(f"   Error parsing candle: {item} - {e}")
-                        continue
-                
-                return candles
+            url = "/capi/v2/market/candles"
+            params = {
+                "symbol": symbol,
+                "granularity": weex_interval,
+                "limit": limit
+            }
+            print(f"📊 WEEX Klines Request: {url} with params {params}")
+            
+            response = await self.http.get(url, params=params, timeout=self._timeouts["market"])
+            print(f"   Response Status: {response.status_code}")
+            
+            if response.status_code != 200:
+                print(f"   Error: {response.text[:200]}")
+                raise Exception(f"API error: {response.status_code}")
+            
+            raw_data = response.text
+            print(f"   Raw response (first 200 chars): {raw_data[:200]}")
+            
+            data = response.json()
+            
+            # Handle different response structures
+            candle_list = []
+            if isinstance(data, list):
+                candle_list = data
+            elif isinstance(data, dict):
+                candle_list = data.get("data", [])
+                if not candle_list:
+                    print(f"   Response structure: {list(data.keys())}")
+            
+            print(f"   Found {len(candle_list)} candles")
+            
+            return CandleFrame.from_klines(candle_list)
         except Exception as e:
             print(f"❌ Error fetching klines: {e}")
             raise
     
+    async def get_orderbook_levels(self, symbol: str = "cmt_btcusdt", depth: int = 20) -> Tuple[list, list]:
+        """Raw order book levels ([price, quantity] exactly as sent, for checksums)"""
+        response = await self.http.get(
+            "/capi/v2/market/depth",
+            params={"symbol": symbol, "limit": depth},
+            timeout=self._timeouts["market"]
+        )
+        data = response.json()
+        return data.get("bids", []), data.get("asks", [])
+    
     async def get_orderbook(self, symbol: str = "cmt_btcusdt", depth: int = 20) -> OrderBook:
         """Get order book snapshot"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/capi/v2/market/depth",
-                params={"symbol": symbol, "limit": depth}
-            )
-            data = response.json()
-            
-            bids = [
-                OrderBookLevel(price=float(b[0]), quantity=float(b[1]))
-                for b in data.get("bids", [])
-            ]
-            asks = [
-                OrderBookLevel(price=float(a[0]), quantity=float(a[1]))
-                for a in data.get("asks", [])
-            ]
-            
-            return OrderBook(
-                symbol=symbol,
-                timestamp=datetime.now(),
-                bids=bids,
-                asks=asks
-            )
+        raw_bids, raw_asks = await self.get_orderbook_levels(symbol, depth)
+        
+        bids = [
+            OrderBookLevel(price=float(b[0]), quantity=float(b[1]))
+            for b in raw_bids
+        ]
+        asks = [
+            OrderBookLevel(price=float(a[0]), quantity=float(a[1]))
+            for a in raw_asks
+        ]
+        
+        return OrderBook(
+            symbol=symbol,
+            timestamp=datetime.now(),
+            bids=bids,
+            asks=asks
+        )
     
     async def get_contract_info(self, symbol: str = "cmt_btcusdt") -> dict:
         """Get contract specifications (precision, limits, etc.)"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/capi/v2/market/contracts",
-                params={"symbol": symbol}
-            )
-            data = response.json()
-            if isinstance(data, list) and len(data) > 0:
-                return data[0]
-            return data
+        response = await self.http.get(
+            "/capi/v2/market/contracts",
+            params={"symbol": symbol},
+            timeout=self._timeouts["market"]
+        )
+        data = response.json()
+        if isinstance(data, list) and len(data) > 0:
+            return data[0]
+        return data
     
     async def get_funding_rate(self, symbol: str = "cmt_btcusdt") -> float:
         """Get current funding rate for perpetual contracts"""
@@ -266,12 +339,12 @@ class WEEXClient:
         query_string = ""
         headers = self._get_headers("GET", request_path, query_string)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}{request_path}",
-                headers=headers
-            )
-            return response.json()
+        response = await self.http.get(
+            request_path,
+            headers=headers,
+            timeout=self._timeouts["account"]
+        )
+        return response.json()
     
     async def set_leverage(
         self, 
@@ -293,13 +366,13 @@ class WEEXClient:
         body_str = json.dumps(body)
         headers = self._get_headers("POST", request_path, "", body_str)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{request_path}",
-                headers=headers,
-                content=body_str
-            )
-            return response.json()
+        response = await self.http.post(
+            request_path,
+            headers=headers,
+            content=body_str,
+            timeout=self._timeouts["account"]
+        )
+        return response.json()
     
     async def place_order(
         self,
@@ -358,13 +431,13 @@ class WEEXClient:
         body_str = json.dumps(body)
         headers = self._get_headers("POST", request_path, "", body_str)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{request_path}",
-                headers=headers,
-                content=body_str
-            )
-            return response.json()
+        response = await self.http.post(
+            request_path,
+            headers=headers,
+            content=body_str,
+            timeout=self._timeouts["order"]
+        )
+        return response.json()
     
     async def cancel_order(self, symbol: str, order_id: str) -> dict:
         """Cancel an existing order"""
@@ -373,13 +446,13 @@ class WEEXClient:
         body_str = json.dumps(body)
         headers = self._get_headers("POST", request_path, "", body_str)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{request_path}",
-                headers=headers,
-                content=body_str
-            )
-            return response.json()
+        response = await self.http.post(
+            request_path,
+            headers=headers,
+            content=body_str,
+            timeout=self._timeouts["order"]
+        )
+        return response.json()
     
     async def get_open_orders(self, symbol: Optional[str] = None) -> List[dict]:
         """Get open orders"""
@@ -387,13 +460,13 @@ class WEEXClient:
         query_string = f"?symbol={symbol}" if symbol else ""
         headers = self._get_headers("GET", request_path, query_string)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}{request_path}{query_string}",
-                headers=headers
-            )
-            data = response.json()
-            return data.get("list", []) if isinstance(data, dict) else data
+        response = await self.http.get(
+            f"{request_path}{query_string}",
+            headers=headers,
+            timeout=self._timeouts["order"]
+        )
+        data = response.json()
+        return data.get("list", []) if isinstance(data, dict) else data
     
     async def get_positions(self, symbol: Optional[str] = None) -> List[dict]:
         """Get open positions"""
@@ -401,13 +474,13 @@ class WEEXClient:
         query_string = f"?symbol={symbol}" if symbol else ""
         headers = self._get_headers("GET", request_path, query_string)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}{request_path}{query_string}",
-                headers=headers
-            )
-            data = response.json()
-            return data.get("list", []) if isinstance(data, dict) else data
+        response = await self.http.get(
+            f"{request_path}{query_string}",
+            headers=headers,
+            timeout=self._timeouts["account"]
+        )
+        data = response.json()
+        return data.get("list", []) if isinstance(data, dict) else data
     
     async def get_trade_history(
         self, 
@@ -422,13 +495,13 @@ class WEEXClient:
         
         headers = self._get_headers("GET", request_path, query_string)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}{request_path}{query_string}",
-                headers=headers
-            )
-            data = response.json()
-            return data.get("list", []) if isinstance(data, dict) else data
+        response = await self.http.get(
+            f"{request_path}{query_string}",
+            headers=headers,
+            timeout=self._timeouts["order"]
+        )
+        data = response.json()
+        return data.get("list", []) if isinstance(data, dict) else data
     
     async def close_position(
         self,
@@ -456,35 +529,88 @@ class WEEXClient:
         body_str = json.dumps(body)
         headers = self._get_headers("POST", request_path, "", body_str)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}{request_path}",
-                headers=headers,
-                content=body_str
-            )
-            return response.json()
+        response = await self.http.post(
+            request_path,
+            headers=headers,
+            content=body_str,
+            timeout=self._timeouts["order"]
+        )
+        return response.json()
     
     # ==================== WebSocket Methods ====================
     
     async def connect_websocket(self):
-        """Establish WebSocket connection"""
-        self._ws_connection = await websockets.connect(self.ws_url)
-        asyncio.create_task(self._ws_listener())
+        """Start the WebSocket connection loop (reconnects automatically)"""
+        if self._ws_task and not self._ws_task.done():
+            return
+        self._ws_running = True
+        self._ws_task = asyncio.create_task(self._ws_run())
+    
+    async def _ws_run(self):
+        """Keep the WebSocket connected, resubscribing after every reconnect"""
+        backoff = settings.weex_ws_backoff_initial
+        
+        while self._ws_running:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20) as ws:
+                    self._ws_connection = ws
+                    backoff = settings.weex_ws_backoff_initial
+                    print(f"🔌 WebSocket connected: {self.ws_url}")
+                    
+                    # Resubscribe everything registered so far
+                    if self._ws_callbacks:
+                        await ws.send(json.dumps({
+                            "op": "subscribe",
+                            "args": list(self._ws_callbacks.keys())
+                        }))
+                    
+                    for callback in self._ws_connect_callbacks:
+                        try:
+                            await callback()
+                        except Exception as e:
+                            print(f"Error in WebSocket connect callback: {e}")
+                    
+                    await self._ws_listener()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"WebSocket error: {e}")
+            finally:
+                self._ws_connection = None
+            
+            if not self._ws_running:
+                break
+            
+            # Exponential backoff with jitter
+            self.ws_reconnects += 1
+            delay = backoff * random.uniform(0.5, 1.0)
+            print(f"🔄 WebSocket reconnecting in {delay:.1f}s (attempt {self.ws_reconnects})")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, settings.weex_ws_backoff_max)
     
     async def _ws_listener(self):
         """Listen for WebSocket messages"""
         try:
             async for message in self._ws_connection:
-                data = json.loads(message)
-                channel = data.get("channel", "")
+                try:
+                    data = json.loads(message)
+                except json.JSONDecodeError:
+                    continue
+                channel = data.get("channel", "") if isinstance(data, dict) else ""
                 
                 # Dispatch to registered callbacks
-                if channel in self._ws_callbacks:
-                    for callback in self._ws_callbacks[channel]:
+                for callback in self._ws_callbacks.get(channel, []):
+                    try:
                         await callback(data)
+                    except Exception as e:
+                        print(f"Error in WebSocket callback for {channel}: {e}")
         except websockets.exceptions.ConnectionClosed:
             print("WebSocket connection closed")
     
+    def on_websocket_connect(self, callback: Callable):
+        """Register a coroutine to run after every (re)connect, e.g. to resync state"""
+        self._ws_connect_callbacks.append(callback)
+    
     async def subscribe(self, channel: str, callback: Callable):
         """Subscribe to a WebSocket channel"""
         if channel not in self._ws_callbacks:
@@ -497,10 +623,23 @@ class WEEXClient:
                 "args": [channel]
             }))
     
-    async def close(self):
-        """Close WebSocket connection"""
+    async def close_websocket(self):
+        """Stop the WebSocket loop and close the connection"""
+        self._ws_running = False
         if self._ws_connection:
             await self._ws_connection.close()
+        if self._ws_task:
+            self._ws_task.cancel()
+            try:
+                await self._ws_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._ws_task = None
+    
+    async def close(self):
+        """Close WebSocket connection and the pooled HTTP session"""
+        await self.close_websocket()
+        await self.close_http()
 
 
 # Create singleton instance
@@ -0,0 +1,22 @@
+from .event_bus import (
+    event_bus,
+    EventBus,
+    Event,
+    Subscription,
+    DEBATE_MESSAGE,
+    DEBATE_PARTIAL,
+    DEBATE_DECISION,
+    TRADE,
+    MARKET_TICKER,
+    MARKET_CANDLE,
+    DROP_OLDEST,
+    COALESCE,
+    DISCONNECT,
+    OVERFLOW_POLICIES
+)
+
+__all__ = [
+    "event_bus", "EventBus", "Event", "Subscription",
+    "DEBATE_MESSAGE", "DEBATE_PARTIAL", "DEBATE_DECISION", "TRADE", "MARKET_TICKER", "MARKET_CANDLE",
+    "DROP_OLDEST", "COALESCE", "DISCONNECT", "OVERFLOW_POLICIES"
+]
@@ -0,0 +1,269 @@
+"""
+In-process pub/sub event bus
+Publishers (debate engine, order manager, market stream) hand events to the bus
+without waiting; each subscriber drains its own bounded queue in a worker
+task, so a slow WebSocket client or logging sink only ever delays itself.
+"""
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Union
+from config.settings import settings
+
+
+# ==================== Topics ====================
+
+DEBATE_MESSAGE = "debate.message"    # DebateMessage (final agent message)
+DEBATE_PARTIAL = "debate.partial"    # dict frame of a message still being generated (key: message_id)
+DEBATE_DECISION = "debate.decision"  # dict: Risk Manager ruling for a symbol
+TRADE = "trade"                      # Trade (opened or closed)
+MARKET_TICKER = "market.ticker"      # Ticker (key: symbol)
+MARKET_CANDLE = "market.candle"      # dict: latest bar of a symbol (key: symbol/interval)
+
+# Overflow policies when a subscriber's queue is full
+DROP_OLDEST = "drop_oldest"  # Discard the oldest queued event
+COALESCE = "coalesce"        # Keep only the newest event per key; drop the oldest if still full
+DISCONNECT = "disconnect"    # Close the subscription (e.g. evict a stalled client)
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+Handler = Callable[["Event"], Union[None, Awaitable[None]]]
+
+
+class Event:
+    """One published event; `key` identifies what it updates (for coalescing)"""
+
+    __slots__ = ("seq", "topic", "payload", "key", "published_at")
+
+    def __init__(self, seq: int, topic: str, payload: Any, key: Optional[str] = None):
+        self.seq = seq
+        self.topic = topic
+        self.payload = payload
+        self.key = key
+        self.published_at = time.monotonic()
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue and the worker task that drains it.
+    Events are delivered in order, one at a time; sync and async handlers both work.
+    """
+
+    LATENCY_SAMPLES = 1000
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        topics: Optional[Iterable[str]] = None,
+        maxsize: int = settings.event_queue_size,
+        policy: str = settings.event_overflow_policy,
+        on_close: Optional[Callable[["Subscription"], Any]] = None
+    ):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'. Use one of: {', '.join(OVERFLOW_POLICIES)}")
+        self.name = name
+        self.handler = handler
+        self.topics = tuple(topics) if topics else None  # None = every topic
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.on_close = on_close
+        self.closed = False
+
+        self._queue: "OrderedDict[Any, Event]" = OrderedDict()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._busy = False  # A handler call is in progress
+
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latencies_ms: deque = deque(maxlen=self.LATENCY_SAMPLES)  # Publish -> handled
+
+    def matches(self, topic: str) -> bool:
+        return self.topics is None or any(topic == t or topic.startswith(t + ".") for t in self.topics)
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def offer(self, event: Event):
+        """Queue an event without blocking, applying the overflow policy"""
+        if self.closed:
+            return
+        if self.policy == COALESCE and event.key is not None:
+            slot = (event.topic, event.key)
+            if slot in self._queue:
+                self._queue[slot] = event  # Newer state replaces the pending one in place
+                self.coalesced += 1
+                return
+        else:
+            slot = event.seq
+
+        if len(self._queue) >= self.maxsize:
+            if self.policy == DISCONNECT:
+                print(f"🔌 Subscriber '{self.name}' fell {self.maxsize} events behind - disconnecting")
+                self.close()
+                return
+            self._queue.popitem(last=False)
+            self.dropped += 1
+
+        self._queue[slot] = event
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._ensure_worker()
+        self._wakeup.set()
+
+    def _ensure_worker(self):
+        """Start (or restart, e.g. under a new event loop) the draining task"""
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._wakeup = self._wakeup or asyncio.Event()
+            return  # No loop yet - the next publish from inside one starts the worker
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self.closed:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            _, event = self._queue.popitem(last=False)
+            self._busy = True
+            try:
+                result = self.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"Error in event subscriber '{self.name}': {e}")
+            finally:
+                self._busy = False
+            self.latencies_ms.append((time.monotonic() - event.published_at) * 1000)
+
+    async def drain(self):
+        """Wait until every queued event has been handled"""
+        while (self._queue or self._busy) and not self.closed:
+            self._ensure_worker()
+            await asyncio.sleep(0)
+
+    def close(self):
+        """Stop delivering; pending events are discarded"""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        if self._task is not None and not self._task.done():
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None  # Closed outside the event loop
+            if self._task is not current:
+                self._task.cancel()
+        if self.on_close is not None:
+            try:
+                self.on_close(self)
+            except Exception as e:
+                print(f"Error closing event subscriber '{self.name}': {e}")
+
+    def get_stats(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "topics": list(self.topics) if self.topics else ["*"],
+            "policy": self.policy,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "maxsize": self.maxsize,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "closed": self.closed,
+            "avg_latency_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0,
+            "p99_latency_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)], 2) if latencies else 0
+        }
+
+
+class EventBus:
+    """
+    Fan-out of published events to per-subscriber queues.
+    publish() is synchronous and O(subscribers): it never awaits a handler.
+    """
+
+    def __init__(self):
+        self.subscriptions: Dict[int, Subscription] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+        self.published: Dict[str, int] = {}
+
+    def subscribe(
+        self,
+        name: str,
+        handler: Handler,
+        topics: Optional[Iterable[str]] = None,
+        maxsize: int = settings.event_queue_size,
+        policy: str = settings.event_overflow_policy,
+        on_close: Optional[Callable[[Subscription], Any]] = None
+    ) -> Subscription:
+        """Register a handler for topics (a topic also matches its sub-topics, e.g. "market")"""
+        subscription = Subscription(name, handler, topics, maxsize, policy, on_close)
+        sub_id = next(self._ids)
+        self.subscriptions[sub_id] = subscription
+
+        user_close = subscription.on_close
+
+        def forget(sub: Subscription):
+            self.subscriptions.pop(sub_id, None)
+            if user_close is not None:
+                user_close(sub)
+
+        subscription.on_close = forget
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscription.close()
+
+    def has_subscribers(self, topic: str) -> bool:
+        return any(sub.matches(topic) for sub in self.subscriptions.values())
+
+    def publish(self, topic: str, payload: Any, key: Optional[str] = None) -> Event:
+        """Hand an event to every matching subscriber's queue (never blocks)"""
+        event = Event(next(self._seq), topic, payload, key)
+        self.published[topic] = self.published.get(topic, 0) + 1
+        for subscription in list(self.subscriptions.values()):
+            if subscription.matches(topic):
+                subscription.offer(event)
+        return event
+
+    def send(self, subscription: Subscription, topic: str, payload: Any, key: Optional[str] = None) -> Event:
+        """Queue an event for a single subscriber (e.g. a reply to one client)"""
+        event = Event(next(self._seq), topic, payload, key)
+        subscription.offer(event)
+        return event
+
+    async def drain(self):
+        """Wait until all subscribers have handled everything published so far"""
+        for subscription in list(self.subscriptions.values()):
+            await subscription.drain()
+
+    def get_stats(self) -> dict:
+        return {
+            "published": dict(self.published),
+            "subscribers": {
+                f"{sub.name}#{sub_id}": sub.get_stats()
+                for sub_id, sub in self.subscriptions.items()
+            }
+        }
+
+
+# Singleton instance
+event_bus = EventBus()
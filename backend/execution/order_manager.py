@@ -11,6 +11,7 @@ from data.data_models import (
 )
 from data.weex_client import weex_client
 from data.ai_log_uploader import ai_log_uploader
+from events.event_bus import event_bus, TRADE
 from config.settings import settings
 
 
@@ -118,6 +119,7 @@ class OrderManager:
             
             self.positions.append(position)
             self.trade_history.append(trade)
+            event_bus.publish(TRADE, trade, key=trade.id)
             
             # Upload AI log for hackathon compliance (non-blocking)
             asyncio.create_task(self._upload_trade_ai_log(
@@ -262,6 +264,7 @@ class OrderManager:
             self.positions = [p for p in self.positions if p.symbol != symbol]
             
             self.trade_history.append(trade)
+            event_bus.publish(TRADE, trade, key=trade.id)
             
             return trade
             
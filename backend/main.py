@@ -49,7 +49,14 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
+    from data.weex_client import weex_client
+    from data.market_data import market_data_service
+    from agents.debate_history import debate_history
     print("🚀 Consensus AI starting up...")
+    debate_history.open()
+    await weex_client.start()
+    if settings.market_data_streaming:
+        await market_data_service.start_streaming()
     print(f"📊 Default symbol: {settings.default_symbol}")
     print(f"⚡ Max leverage: {settings.max_leverage}x")
     print(f"📡 API running at http://{settings.host}:{settings.port}")
@@ -58,8 +65,14 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown"""
-    from agents.debate_engine import debate_engine
-    debate_engine.stop()
+    from agents.debate_scheduler import debate_scheduler
+    from agents.llm_transport import bedrock_transport
+    from data.weex_client import weex_client
+    from data.market_data import market_data_service
+    await debate_scheduler.stop()
+    bedrock_transport.shutdown()
+    await market_data_service.stop_streaming()
+    await weex_client.close()
     print("👋 Consensus AI shutting down...")
 
 
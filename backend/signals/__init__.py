@@ -1,18 +1,21 @@
-from .indicators import (
-    indicator_analyzer, 
-    IndicatorAnalyzer,
-    calculate_rsi,
-    calculate_macd,
-    calculate_bollinger_bands,
-    calculate_atr,
-    calculate_volume_sma,
-    candles_to_df
-)
+from .indicators import indicator_analyzer, IndicatorAnalyzer, PANDAS_FUNCTIONS
+from .streaming_indicators import StreamingIndicatorEngine, IndicatorState
 from .risk_metrics import risk_metrics, RiskMetrics
+from .setup_gate import setup_gate, SetupGate
 
 __all__ = [
     "indicator_analyzer", "IndicatorAnalyzer",
     "calculate_rsi", "calculate_macd", "calculate_bollinger_bands",
     "calculate_atr", "calculate_volume_sma", "candles_to_df",
-    "risk_metrics", "RiskMetrics"
+    "StreamingIndicatorEngine", "IndicatorState",
+    "risk_metrics", "RiskMetrics",
+    "setup_gate", "SetupGate"
 ]
+
+
+def __getattr__(name: str):
+    # pandas indicators are imported on first use (not at all with INDICATOR_BACKEND=numpy)
+    if name in PANDAS_FUNCTIONS:
+        from . import indicators
+        return getattr(indicators, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,111 +1,44 @@
 """
 Technical indicators for trading signals
 """
-import pandas as pd
+import importlib
 import numpy as np
-from typing import List, Tuple
+from typing import List, Union
 from data.data_models import Candle, TechnicalSignal, SignalStrength
+from data.candle_frame import CandleFrame
+from signals.streaming_indicators import StreamingIndicatorEngine
+from signals import indicators_np
+from config.settings import settings
 
 
-def candles_to_df(candles: List[Candle]) -> pd.DataFrame:
-    """Convert candle list to pandas DataFrame"""
-    data = {
-        'timestamp': [c.timestamp for c in candles],
-        'open': [c.open for c in candles],
-        'high': [c.high for c in candles],
-        'low': [c.low for c in candles],
-        'close': [c.close for c in candles],
-        'volume': [c.volume for c in candles]
-    }
-    df = pd.DataFrame(data)
-    df.set_index('timestamp', inplace=True)
-    return df
+# Candle input: a list of Candle models or a columnar CandleFrame
+CandleInput = Union[List[Candle], CandleFrame]
 
+# pandas-backend functions, loaded from signals.indicators_pd on first access
+PANDAS_FUNCTIONS = (
+    "candles_to_df", "calculate_rsi", "calculate_macd", "calculate_bollinger_bands",
+    "calculate_atr", "calculate_volume_sma", "calculate_ema", "calculate_stochastic"
+)
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """Calculate Relative Strength Index"""
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def calculate_macd(
-    df: pd.DataFrame, 
-    fast: int = 12, 
-    slow: int = 26, 
-    signal: int = 9
-) -> Tuple[pd.Series, pd.Series, pd.Series]:
-    """Calculate MACD (line, signal, histogram)"""
-    ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-    ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
-    
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-    histogram = macd_line - signal_line
-    
-    return macd_line, signal_line, histogram
-
-
-def calculate_bollinger_bands(
-    df: pd.DataFrame, 
-    period: int = 20, 
-    std_dev: float = 2.0
-) -> Tuple[pd.Series, pd.Series, pd.Series]:
-    """Calculate Bollinger Bands (upper, middle, lower)"""
-    middle = df['close'].rolling(window=period).mean()
-    std = df['close'].rolling(window=period).std()
-    
-    upper = middle + (std * std_dev)
-    lower = middle - (std * std_dev)
-    
-    return upper, middle, lower
-
-
-def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """Calculate Average True Range"""
-    high_low = df['high'] - df['low']
-    high_close = abs(df['high'] - df['close'].shift(1))
-    low_close = abs(df['low'] - df['close'].shift(1))
-    
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    atr = true_range.rolling(window=period).mean()
-    
-    return atr
-
-
-def calculate_volume_sma(df: pd.DataFrame, period: int = 20) -> pd.Series:
-    """Calculate Volume Simple Moving Average"""
-    return df['volume'].rolling(window=period).mean()
 
-
-def calculate_ema(df: pd.DataFrame, period: int) -> pd.Series:
-    """Calculate Exponential Moving Average"""
-    return df['close'].ewm(span=period, adjust=False).mean()
-
-
-def calculate_stochastic(
-    df: pd.DataFrame, 
-    k_period: int = 14, 
-    d_period: int = 3
-) -> Tuple[pd.Series, pd.Series]:
-    """Calculate Stochastic Oscillator (%K and %D)"""
-    lowest_low = df['low'].rolling(window=k_period).min()
-    highest_high = df['high'].rolling(window=k_period).max()
-    
-    k = 100 * ((df['close'] - lowest_low) / (highest_high - lowest_low))
-    d = k.rolling(window=d_period).mean()
-    
-    return k, d
+def __getattr__(name: str):
+    if name in PANDAS_FUNCTIONS:
+        return getattr(importlib.import_module("signals.indicators_pd"), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class IndicatorAnalyzer:
-    """Analyzes technical indicators and generates signals"""
+    """
+    Analyzes technical indicators and generates signals.
+    backend: "pandas" (Series/rolling) or "numpy" (raw arrays, see indicators_np)
+    """
+    
+    BACKENDS = ("pandas", "numpy")
     
-    def __init__(self):
+    def __init__(self, backend: str = "pandas"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown indicator backend: {backend}")
+        self.backend = backend
         self.rsi_period = 14
         self.macd_fast = 12
         self.macd_slow = 26
@@ -113,13 +46,38 @@ class IndicatorAnalyzer:
         self.bb_period = 20
         self.atr_period = 14
         self.vol_period = 20
+        self.streaming = StreamingIndicatorEngine(self)
+    
+    def analyze_incremental(
+        self,
+        symbol: str,
+        interval: str,
+        frame: CandleFrame
+    ) -> List[TechnicalSignal]:
+        """
+        Same signals as analyze(), but from running per-series state:
+        only bars newer than the last call (plus an amended last bar) are processed.
+        EMAs keep their full history, so MACD can differ marginally from a
+        fresh analyze() over a short window.
+        """
+        self.streaming.sync(symbol, interval, frame)
+        return self.streaming.signals(symbol, interval)
     
-    def analyze(self, candles: List[Candle]) -> List[TechnicalSignal]:
-        """Generate all technical signals from candles"""
+    def analyze(self, candles: CandleInput) -> List[TechnicalSignal]:
+        """Generate all technical signals from candles (list or store columns)"""
         if len(candles) < 30:  # Need enough data
             return []
         
-        df = candles_to_df(candles)
+        if self.backend == "numpy":
+            return self._analyze_numpy(candles)
+        
+        from signals.indicators_pd import (
+            candles_to_df, _column, calculate_rsi, calculate_macd,
+            calculate_bollinger_bands, calculate_volume_sma, calculate_atr
+        )
+        
+        # CandleFrames feed the indicators directly; lists go through pandas
+        df = candles if isinstance(candles, CandleFrame) else candles_to_df(candles)
         signals = []
         
         # RSI Analysis
@@ -141,7 +99,7 @@ class IndicatorAnalyzer:
         # Bollinger Bands Analysis
         upper, middle, lower = calculate_bollinger_bands(df, self.bb_period)
         signals.append(self._analyze_bollinger(
-            df['close'].iloc[-1],
+            _column(df, 'close').iloc[-1],
             upper.iloc[-1],
             middle.iloc[-1],
             lower.iloc[-1]
@@ -150,7 +108,7 @@ class IndicatorAnalyzer:
         # Volume Analysis
         vol_sma = calculate_volume_sma(df, self.vol_period)
         signals.append(self._analyze_volume(
-            df['volume'].iloc[-1],
+            _column(df, 'volume').iloc[-1],
             vol_sma.iloc[-1]
         ))
         
@@ -158,11 +116,37 @@ class IndicatorAnalyzer:
         atr = calculate_atr(df, self.atr_period)
         signals.append(self._analyze_volatility(
             atr.iloc[-1],
-            df['close'].iloc[-1]
+            _column(df, 'close').iloc[-1]
         ))
         
         return signals
     
+    def _analyze_numpy(self, candles: CandleInput) -> List[TechnicalSignal]:
+        """analyze() on raw NumPy columns - no DataFrame/Series construction"""
+        frame = candles if isinstance(candles, CandleFrame) else CandleFrame.from_candles(candles)
+        close, high, low, volume = frame.close, frame.high, frame.low, frame.volume
+        
+        rsi = indicators_np.calculate_rsi(close, self.rsi_period)
+        macd_line, signal_line, histogram = indicators_np.calculate_macd(
+            close, self.macd_fast, self.macd_slow, self.macd_signal
+        )
+        upper, middle, lower = indicators_np.calculate_bollinger_bands(close, self.bb_period)
+        vol_sma = indicators_np.calculate_volume_sma(volume, self.vol_period)
+        atr = indicators_np.calculate_atr(high, low, close, self.atr_period)
+        
+        return [
+            self._analyze_rsi(float(rsi[-1])),
+            self._analyze_macd(
+                float(macd_line[-1]), float(signal_line[-1]), float(histogram[-1]),
+                float(histogram[-2]) if len(histogram) > 1 else 0
+            ),
+            self._analyze_bollinger(
+                float(close[-1]), float(upper[-1]), float(middle[-1]), float(lower[-1])
+            ),
+            self._analyze_volume(float(volume[-1]), float(vol_sma[-1])),
+            self._analyze_volatility(float(atr[-1]), float(close[-1]))
+        ]
+    
     def _analyze_rsi(self, rsi: float) -> TechnicalSignal:
         """Analyze RSI signal"""
         if rsi >= 70:
@@ -357,4 +341,4 @@ class IndicatorAnalyzer:
 
 
 # Singleton instance
-indicator_analyzer = IndicatorAnalyzer()
+indicator_analyzer = IndicatorAnalyzer(backend=settings.indicator_backend)
@@ -0,0 +1,141 @@
+"""
+Pure-NumPy technical indicators (no pandas)
+Same definitions as signals.indicators, on raw float64 arrays; results are
+NaN-padded to the input length like the pandas rolling versions.
+"""
+import numpy as np
+from typing import Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _padded(values: np.ndarray, length: int) -> np.ndarray:
+    """Left-pad a rolling result with NaN to `length`"""
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values
+    return out
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean via cumulative sums (window views when NaNs are present)"""
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+    if np.isnan(x).any():
+        # cumsum would carry a NaN forward forever; pandas only NaNs the windows containing it
+        return _padded(sliding_window_view(x, window).mean(axis=1), n)
+    # Shift by the first value so the running sum stays small (precision)
+    base = x[0]
+    sums = np.concatenate(([0.0], np.cumsum(x - base)))
+    return _padded((sums[window:] - sums[:-window]) / window + base, n)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1) over strided window views"""
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    return _padded(sliding_window_view(x, window).std(axis=1, ddof=1), len(x))
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    return _padded(sliding_window_view(x, window).min(axis=1), len(x))
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    return _padded(sliding_window_view(x, window).max(axis=1), len(x))
+
+
+def ema(x: np.ndarray, span: int) -> np.ndarray:
+    """
+    EMA with pandas ewm(span, adjust=False) semantics (seeded with x[0]),
+    computed as a ufunc accumulate over the recurrence
+    """
+    if not len(x):
+        return np.zeros(0)
+    alpha = 2 / (span + 1)
+    step = np.frompyfunc(lambda prev, value: prev + alpha * (value - prev), 2, 1)
+    return step.accumulate(np.asarray(x, dtype=object)).astype(np.float64)
+
+
+def calculate_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Relative Strength Index (rolling-mean gains/losses, as the pandas version)"""
+    delta = np.diff(close, prepend=close[:1])  # First bar: 0 gain, 0 loss
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def calculate_macd(
+    close: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD (line, signal, histogram)"""
+    macd_line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(macd_line, signal)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def calculate_bollinger_bands(
+    close: np.ndarray,
+    period: int = 20,
+    std_dev: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger Bands (upper, middle, lower)"""
+    middle = rolling_mean(close, period)
+    std = rolling_std(close, period)
+    return middle + std * std_dev, middle, middle - std * std_dev
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range; the first bar has no previous close and uses high - low"""
+    tr = high - low
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([
+            tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)
+        ])
+    return tr
+
+
+def calculate_atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14
+) -> np.ndarray:
+    """Average True Range"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def calculate_volume_sma(volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """Volume Simple Moving Average"""
+    return rolling_mean(volume, period)
+
+
+def calculate_ema(close: np.ndarray, period: int) -> np.ndarray:
+    """Exponential Moving Average"""
+    return ema(close, period)
+
+
+def calculate_stochastic(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_period: int = 14,
+    d_period: int = 3
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic Oscillator (%K and %D)"""
+    lowest_low = rolling_min(low, k_period)
+    highest_high = rolling_max(high, k_period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+    k[~np.isfinite(k)] = np.nan  # Zero-range windows are undefined
+    return k, rolling_mean(k, d_period)
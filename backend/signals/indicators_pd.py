@@ -0,0 +1,126 @@
+"""
+pandas technical indicators (the "pandas" indicator backend)
+Imported on first use by signals.indicators, so the numpy backend never loads pandas.
+"""
+import pandas as pd
+from typing import List, Tuple, Union
+from data.data_models import Candle
+from data.candle_frame import CandleFrame
+
+
+# Candle input: a list of Candle models or a columnar CandleFrame
+CandleInput = Union[List[Candle], CandleFrame]
+
+# Indicator input: a DataFrame or a CandleFrame (used without a DataFrame round-trip)
+FrameLike = Union[pd.DataFrame, CandleFrame]
+
+
+def _column(df: FrameLike, name: str) -> pd.Series:
+    """A price/volume column as a Series (zero-copy for CandleFrame)"""
+    column = df[name]
+    if isinstance(column, pd.Series):
+        return column
+    return pd.Series(column, copy=False)
+
+
+def candles_to_df(candles: CandleInput) -> pd.DataFrame:
+    """Convert candle list (or CandleFrame) to pandas DataFrame"""
+    if isinstance(candles, CandleFrame):
+        df = pd.DataFrame(
+            {name: candles[name] for name in ("open", "high", "low", "close", "volume")},
+            index=pd.to_datetime(candles.timestamp, unit="ms")
+        )
+        df.index.name = "timestamp"
+        return df
+    
+    data = {
+        'timestamp': [c.timestamp for c in candles],
+        'open': [c.open for c in candles],
+        'high': [c.high for c in candles],
+        'low': [c.low for c in candles],
+        'close': [c.close for c in candles],
+        'volume': [c.volume for c in candles]
+    }
+    df = pd.DataFrame(data)
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def calculate_rsi(df: FrameLike, period: int = 14) -> pd.Series:
+    """Calculate Relative Strength Index"""
+    delta = _column(df, 'close').diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+
+def calculate_macd(
+    df: FrameLike, 
+    fast: int = 12, 
+    slow: int = 26, 
+    signal: int = 9
+) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """Calculate MACD (line, signal, histogram)"""
+    ema_fast = _column(df, 'close').ewm(span=fast, adjust=False).mean()
+    ema_slow = _column(df, 'close').ewm(span=slow, adjust=False).mean()
+    
+    macd_line = ema_fast - ema_slow
+    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    histogram = macd_line - signal_line
+    
+    return macd_line, signal_line, histogram
+
+
+def calculate_bollinger_bands(
+    df: FrameLike, 
+    period: int = 20, 
+    std_dev: float = 2.0
+) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """Calculate Bollinger Bands (upper, middle, lower)"""
+    middle = _column(df, 'close').rolling(window=period).mean()
+    std = _column(df, 'close').rolling(window=period).std()
+    
+    upper = middle + (std * std_dev)
+    lower = middle - (std * std_dev)
+    
+    return upper, middle, lower
+
+
+def calculate_atr(df: FrameLike, period: int = 14) -> pd.Series:
+    """Calculate Average True Range"""
+    high_low = _column(df, 'high') - _column(df, 'low')
+    high_close = abs(_column(df, 'high') - _column(df, 'close').shift(1))
+    low_close = abs(_column(df, 'low') - _column(df, 'close').shift(1))
+    
+    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    atr = true_range.rolling(window=period).mean()
+    
+    return atr
+
+
+def calculate_volume_sma(df: FrameLike, period: int = 20) -> pd.Series:
+    """Calculate Volume Simple Moving Average"""
+    return _column(df, 'volume').rolling(window=period).mean()
+
+
+def calculate_ema(df: FrameLike, period: int) -> pd.Series:
+    """Calculate Exponential Moving Average"""
+    return _column(df, 'close').ewm(span=period, adjust=False).mean()
+
+
+def calculate_stochastic(
+    df: FrameLike, 
+    k_period: int = 14, 
+    d_period: int = 3
+) -> Tuple[pd.Series, pd.Series]:
+    """Calculate Stochastic Oscillator (%K and %D)"""
+    lowest_low = _column(df, 'low').rolling(window=k_period).min()
+    highest_high = _column(df, 'high').rolling(window=k_period).max()
+    
+    k = 100 * ((_column(df, 'close') - lowest_low) / (highest_high - lowest_low))
+    d = k.rolling(window=d_period).mean()
+    
+    return k, d
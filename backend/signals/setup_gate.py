@@ -0,0 +1,163 @@
+"""
+Rule-based setup gate
+Scores the market with the God Mode rules (trend, RSI pullback, order book
+imbalance, MACD, volume) before a debate; below the threshold the debate
+short-circuits to HOLD without any LLM call.
+"""
+import time
+from typing import List, Optional
+from data.data_models import MarketData, TechnicalSignal
+from signals import indicators_np
+from config.settings import settings
+
+
+class SetupGate:
+    """
+    Deterministic pre-filter in front of the LLM debate.
+    Scoring follows aggressive_trader.score_setup (0-10 points per side);
+    RSI, MACD histogram and volume ratio come from IndicatorAnalyzer signals.
+    """
+
+    def __init__(
+        self,
+        min_score: int = settings.setup_gate_min_score,
+        enabled: bool = settings.setup_gate_enabled
+    ):
+        self.min_score = min_score
+        self.enabled = enabled
+        self.started_at = time.monotonic()
+
+        # Stats
+        self.evaluated = 0
+        self.skipped = 0
+        self.llm_calls_saved = 0
+        self.seconds_saved = 0.0
+
+    def detect_trend(self, market_data: MarketData) -> str:
+        """EMA20/EMA50 trend on the debate candles (same bands as detect_trend)"""
+        closes = market_data.candle_frame.close
+        if len(closes) < 50:
+            return "UNCLEAR"
+        ema20 = indicators_np.calculate_ema(closes, 20)[-1]
+        ema50 = indicators_np.calculate_ema(closes, 50)[-1]
+        price = closes[-1]
+
+        if price > ema20 * 1.002 and ema20 > ema50 * 1.001:
+            return "UPTREND"
+        elif price < ema20 * 0.998 and ema20 < ema50 * 0.999:
+            return "DOWNTREND"
+        return "SIDEWAYS"
+
+    def order_book_imbalance(self, market_data: MarketData) -> float:
+        """OBI over the snapshot levels: -1.0 (sell pressure) to 1.0 (buy pressure)"""
+        bid_vol = sum(level.quantity for level in market_data.orderbook.bids)
+        ask_vol = sum(level.quantity for level in market_data.orderbook.asks)
+        total = bid_vol + ask_vol
+        return (bid_vol - ask_vol) / total if total else 0.0
+
+    def score(
+        self,
+        market_data: MarketData,
+        signals: List[TechnicalSignal],
+        btc_trend: Optional[str] = None
+    ) -> dict:
+        """Long/short setup scores with the reasons that contributed"""
+        values = {s.name: s.value for s in signals}
+        trend = self.detect_trend(market_data)
+        rsi = values.get("RSI", 50.0)
+        macd_hist = values.get("MACD", 0.0)
+        volume_ratio = values.get("Volume", 1.0)
+        obi = self.order_book_imbalance(market_data)
+
+        long_score = 0
+        short_score = 0
+        reasons = []
+
+        # 1. Macro trend (3 pts)
+        if trend == "UPTREND":
+            long_score += 3
+            reasons.append("Uptrend")
+        elif trend == "DOWNTREND":
+            short_score += 3
+            reasons.append("Downtrend")
+
+        # 2. BTC correlation (alts only, when the caller knows BTC's trend)
+        if btc_trend and "btc" not in market_data.symbol:
+            if trend == "UPTREND" and btc_trend == "DOWNTREND":
+                long_score -= 2
+                reasons.append("Fighting BTC downtrend")
+            elif trend == "DOWNTREND" and btc_trend == "UPTREND":
+                short_score -= 2
+                reasons.append("Fighting BTC uptrend")
+
+        # 3. RSI pullbacks (2 pts)
+        if trend == "UPTREND" and 35 <= rsi <= 55:
+            long_score += 2
+            reasons.append(f"RSI dip ({rsi:.0f})")
+        elif trend == "DOWNTREND" and 45 <= rsi <= 65:
+            short_score += 2
+            reasons.append(f"RSI rally ({rsi:.0f})")
+
+        # 4. Order book imbalance (2 pts)
+        if obi > 0.2:
+            long_score += 2
+            reasons.append(f"Buy pressure (OBI +{obi:.2f})")
+        elif obi < -0.2:
+            short_score += 2
+            reasons.append(f"Sell pressure (OBI {obi:.2f})")
+
+        # 5. MACD & volume (1 pt each)
+        if macd_hist > 0:
+            long_score += 1
+        if macd_hist < 0:
+            short_score += 1
+        if volume_ratio > 1.5:
+            long_score += 1
+            short_score += 1
+            reasons.append("High volume")
+
+        return {
+            "long_score": long_score,
+            "short_score": short_score,
+            "score": max(long_score, short_score),
+            "trend": trend,
+            "reasons": reasons
+        }
+
+    def check(
+        self,
+        market_data: MarketData,
+        signals: List[TechnicalSignal],
+        llm_calls: int = 1,
+        llm_seconds: float = 0.0
+    ) -> dict:
+        """
+        Score the setup and decide whether the debate should run.
+        llm_calls / llm_seconds are what a skipped debate would have cost
+        (they feed the savings stats).
+        """
+        result = self.score(market_data, signals)
+        result["passed"] = not self.enabled or result["score"] >= self.min_score
+        self.evaluated += 1
+        if not result["passed"]:
+            self.skipped += 1
+            self.llm_calls_saved += llm_calls
+            self.seconds_saved += llm_seconds
+        return result
+
+    def get_stats(self) -> dict:
+        hours = max((time.monotonic() - self.started_at) / 3600, 1e-9)
+        return {
+            "enabled": self.enabled,
+            "min_score": self.min_score,
+            "evaluated": self.evaluated,
+            "skipped": self.skipped,
+            "llm_calls_saved": self.llm_calls_saved,
+            "seconds_saved": round(self.seconds_saved, 1),
+            "llm_calls_saved_per_hour": round(self.llm_calls_saved / hours, 1),
+            "seconds_saved_per_hour": round(self.seconds_saved / hours, 1)
+        }
+
+
+# Singleton instance
+setup_gate = SetupGate()
@@ -0,0 +1,342 @@
+"""
+Incremental indicator engine: O(1) work per new or amended bar
+Produces the same TechnicalSignal list as IndicatorAnalyzer.analyze
+"""
+import math
+from collections import deque
+from typing import Optional, List, Dict, Tuple
+from data.data_models import TechnicalSignal
+from data.candle_frame import CandleFrame
+
+
+NAN = float("nan")
+
+
+class _RollingWindow:
+    """
+    Rolling sum / sum-of-squares over `window` bars.
+    Holds the committed (closed) bars; the in-progress bar is passed to
+    mean()/std() so amending it costs nothing. NaN inputs make the result NaN
+    until they leave the window, matching pandas rolling(min_periods=window).
+    """
+
+    RESUM_EVERY = 1000  # Periodic exact resum bounds floating-point drift
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.nans = 0
+        self.shift: Optional[float] = None  # Values are stored relative to this for precision
+        self._commits = 0
+
+    def _shifted(self, value: float) -> float:
+        if self.shift is None and not math.isnan(value):
+            self.shift = value
+        return value - (self.shift or 0.0)
+
+    def commit(self, value: float):
+        """Add a closed bar's value (keeps the last window-1 values)"""
+        if math.isnan(value):
+            self.nans += 1
+            self.values.append(NAN)
+        else:
+            v = self._shifted(value)
+            self.values.append(v)
+            self.sum += v
+            self.sumsq += v * v
+
+        if len(self.values) > self.window - 1:
+            old = self.values.popleft()
+            if math.isnan(old):
+                self.nans -= 1
+            else:
+                self.sum -= old
+                self.sumsq -= old * old
+
+        self._commits += 1
+        if self._commits % self.RESUM_EVERY == 0:
+            finite = [v for v in self.values if not math.isnan(v)]
+            self.sum = math.fsum(finite)
+            self.sumsq = math.fsum(v * v for v in finite)
+
+    def _ready(self, value: float) -> bool:
+        return len(self.values) == self.window - 1 and self.nans == 0 and not math.isnan(value)
+
+    def mean(self, value: float) -> float:
+        """Mean over the committed values plus the in-progress `value`"""
+        if not self._ready(value):
+            return NAN
+        return (self.sum + self._shifted(value)) / self.window + (self.shift or 0.0)
+
+    def std(self, value: float) -> float:
+        """Sample standard deviation (ddof=1) including the in-progress `value`"""
+        if not self._ready(value) or self.window < 2:
+            return NAN
+        v = self._shifted(value)
+        total = self.sum + v
+        var = (self.sumsq + v * v - total * total / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class _RollingExtreme:
+    """Monotonic deque giving the rolling min (or max) in amortized O(1)"""
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self.items: deque = deque()  # (index, value)
+        self.count = 0
+
+    def _dominates(self, a: float, b: float) -> bool:
+        return a >= b if self.is_max else a <= b
+
+    def commit(self, value: float):
+        while self.items and self._dominates(value, self.items[-1][1]):
+            self.items.pop()
+        self.items.append((self.count, value))
+        self.count += 1
+        # Keep only the last window-1 committed bars
+        while self.items and self.items[0][0] <= self.count - self.window:
+            self.items.popleft()
+
+    def value(self, current: float) -> float:
+        """Extreme over the committed window plus the in-progress bar"""
+        if self.count < self.window - 1:
+            return NAN
+        if not self.items:
+            return current
+        best = self.items[0][1]
+        return max(best, current) if self.is_max else min(best, current)
+
+
+class _EMA:
+    """pandas ewm(span, adjust=False) recurrence, seeded with the first value"""
+
+    def __init__(self, span: int):
+        self.alpha = 2 / (span + 1)
+        self.value: Optional[float] = None
+
+    def peek(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return self.value + self.alpha * (x - self.value)
+
+    def commit(self, x: float):
+        self.value = self.peek(x)
+
+
+class IndicatorState:
+    """
+    Running indicator state for one (symbol, interval) series.
+    State covers closed bars; the newest bar stays provisional so repeated
+    updates to it (amendments) are O(1) and exact.
+    """
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        macd_fast: int = 12,
+        macd_slow: int = 26,
+        macd_signal: int = 9,
+        bb_period: int = 20,
+        atr_period: int = 14,
+        vol_period: int = 20,
+        stoch_k: int = 14,
+        stoch_d: int = 3
+    ):
+        self.gain = _RollingWindow(rsi_period)
+        self.loss = _RollingWindow(rsi_period)
+        self.ema_fast = _EMA(macd_fast)
+        self.ema_slow = _EMA(macd_slow)
+        self.macd_signal = _EMA(macd_signal)
+        self.closes = _RollingWindow(bb_period)
+        self.tr = _RollingWindow(atr_period)
+        self.volumes = _RollingWindow(vol_period)
+        self.lows = _RollingExtreme(stoch_k, is_max=False)
+        self.highs = _RollingExtreme(stoch_k, is_max=True)
+        self.stoch_k = _RollingWindow(stoch_d)
+
+        self.prev_close: Optional[float] = None  # Close of the last committed bar
+        self.prev_hist = 0.0  # MACD histogram of the last committed bar
+        self.bars = 0  # Committed + provisional
+        self.last_timestamp: Optional[int] = None
+        self._bar: Optional[Tuple[float, float, float, float]] = None  # Provisional (high, low, close, volume)
+
+    # ==================== Updates ====================
+
+    def update(self, timestamp: int, high: float, low: float, close: float, volume: float):
+        """Feed a bar: same timestamp amends the provisional bar, a newer one closes it"""
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            return
+        if timestamp != self.last_timestamp:
+            if self._bar is not None:
+                self._commit(*self._bar)
+            self.bars += 1
+            self.last_timestamp = timestamp
+        self._bar = (high, low, close, volume)
+
+    def _commit(self, high: float, low: float, close: float, volume: float):
+        gain, loss = self._gain_loss(close)
+        self.gain.commit(gain)
+        self.loss.commit(loss)
+        _, _, hist = self._macd(close)
+        self.ema_fast.commit(close)
+        self.ema_slow.commit(close)
+        self.macd_signal.commit(self.ema_fast.value - self.ema_slow.value)
+        self.prev_hist = hist
+        self.closes.commit(close)
+        self.tr.commit(self._true_range(high, low))
+        self.volumes.commit(volume)
+        self.stoch_k.commit(self._stoch_k(high, low, close))
+        self.lows.commit(low)
+        self.highs.commit(high)
+        self.prev_close = close
+
+    # ==================== Indicator Values (current bar) ====================
+
+    def _gain_loss(self, close: float) -> Tuple[float, float]:
+        # pandas: diff() is NaN on the first bar and where(delta > 0, 0) turns it into 0
+        delta = close - self.prev_close if self.prev_close is not None else 0.0
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    def _macd(self, close: float) -> Tuple[float, float, float]:
+        macd = self.ema_fast.peek(close) - self.ema_slow.peek(close)
+        signal = self.macd_signal.peek(macd)
+        return macd, signal, macd - signal
+
+    def _true_range(self, high: float, low: float) -> float:
+        if self.prev_close is None:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def _stoch_k(self, high: float, low: float, close: float) -> float:
+        lowest = self.lows.value(low)
+        highest = self.highs.value(high)
+        span = highest - lowest
+        if math.isnan(span) or span == 0:
+            return NAN
+        return 100 * (close - lowest) / span
+
+    def rsi(self) -> float:
+        _, _, close, _ = self._bar
+        gain, loss = self._gain_loss(close)
+        avg_gain, avg_loss = self.gain.mean(gain), self.loss.mean(loss)
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            return NAN
+        if avg_loss == 0:
+            return NAN if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def macd(self) -> Tuple[float, float, float, float]:
+        """(macd, signal, histogram, previous histogram)"""
+        macd, signal, hist = self._macd(self._bar[2])
+        return macd, signal, hist, self.prev_hist if self.bars > 1 else 0.0
+
+    def bollinger(self, std_dev: float = 2.0) -> Tuple[float, float, float]:
+        """(upper, middle, lower)"""
+        close = self._bar[2]
+        middle = self.closes.mean(close)
+        std = self.closes.std(close)
+        return middle + std * std_dev, middle, middle - std * std_dev
+
+    def atr(self) -> float:
+        high, low, _, _ = self._bar
+        return self.tr.mean(self._true_range(high, low))
+
+    def volume_sma(self) -> float:
+        return self.volumes.mean(self._bar[3])
+
+    def stochastic(self) -> Tuple[float, float]:
+        """(%K, %D)"""
+        high, low, close, _ = self._bar
+        k = self._stoch_k(high, low, close)
+        return k, self.stoch_k.mean(k)
+
+
+class StreamingIndicatorEngine:
+    """
+    Keeps an IndicatorState per (symbol, interval) and turns it into the
+    same TechnicalSignal list IndicatorAnalyzer.analyze produces.
+    """
+
+    MIN_BARS = 30
+
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+
+    def _new_state(self) -> IndicatorState:
+        a = self.analyzer
+        return IndicatorState(
+            rsi_period=a.rsi_period,
+            macd_fast=a.macd_fast,
+            macd_slow=a.macd_slow,
+            macd_signal=a.macd_signal,
+            bb_period=a.bb_period,
+            atr_period=a.atr_period,
+            vol_period=a.vol_period
+        )
+
+    def state(self, symbol: str, interval: str) -> IndicatorState:
+        key = (symbol, interval)
+        if key not in self._states:
+            self._states[key] = self._new_state()
+        return self._states[key]
+
+    def update_bar(
+        self, symbol: str, interval: str, timestamp: int,
+        high: float, low: float, close: float, volume: float
+    ):
+        """O(1) update for one new or amended bar"""
+        self.state(symbol, interval).update(timestamp, high, low, close, volume)
+
+    def sync(self, symbol: str, interval: str, frame: CandleFrame):
+        """
+        Feed only the bars of `frame` the state has not seen yet (plus the
+        newest seen bar, which may have been amended)
+        """
+        timestamps = frame.timestamp
+        if not len(timestamps):
+            return
+        state = self.state(symbol, interval)
+        if state.last_timestamp is not None and timestamps[0] > state.last_timestamp:
+            # No overlap: bars in between were missed, rebuild from this frame
+            state = self._states[(symbol, interval)] = self._new_state()
+
+        start = 0
+        if state.last_timestamp is not None:
+            start = len(timestamps)
+            while start > 0 and timestamps[start - 1] >= state.last_timestamp:
+                start -= 1
+        for i in range(start, len(timestamps)):
+            state.update(
+                int(timestamps[i]), float(frame.high[i]), float(frame.low[i]),
+                float(frame.close[i]), float(frame.volume[i])
+            )
+
+    def reset(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states = {k: v for k, v in self._states.items() if k[0] != symbol}
+
+    def signals(self, symbol: str, interval: str) -> List[TechnicalSignal]:
+        """Current signals for a series (empty until enough bars)"""
+        state = self._states.get((symbol, interval))
+        if state is None or state.bars < self.MIN_BARS:
+            return []
+
+        a = self.analyzer
+        close, volume = state._bar[2], state._bar[3]
+        macd, signal, hist, prev_hist = state.macd()
+        upper, middle, lower = state.bollinger()
+
+        return [
+            a._analyze_rsi(state.rsi()),
+            a._analyze_macd(macd, signal, hist, prev_hist),
+            a._analyze_bollinger(close, upper, middle, lower),
+            a._analyze_volume(volume, state.volume_sma()),
+            a._analyze_volatility(state.atr(), close)
+        ]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: kline parse + indicator analysis
+List[Candle] + DataFrame path vs the columnar CandleFrame path,
+at 100, 1k and 10k bars.
+
+Usage: python bench_candles.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data.weex_client import parse_candle  # noqa: E402
+from data.candle_frame import CandleFrame  # noqa: E402
+from signals.indicators import indicator_analyzer  # noqa: E402
+
+
+def make_klines(count: int) -> list:
+    """WEEX-style kline rows (numeric strings), oldest first"""
+    rows = []
+    price = 98500.0
+    ts = int(time.time() * 1000) - count * 300_000
+    for i in range(count):
+        close = price * (1 + random.uniform(-0.002, 0.002))
+        rows.append([
+            str(ts + i * 300_000), f"{price:.2f}", f"{max(price, close) + 20:.2f}",
+            f"{min(price, close) - 20:.2f}", f"{close:.2f}", f"{random.uniform(100, 500):.3f}"
+        ])
+        price = close
+    return rows
+
+
+def time_it(fn, repeat: int) -> float:
+    """Best-of mean time per call in milliseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat * 1000)
+    return best
+
+
+def list_path(rows):
+    candles = [parse_candle(item) for item in rows]
+    return indicator_analyzer.analyze(candles)
+
+
+def frame_path(rows):
+    frame = CandleFrame.from_klines(rows)
+    return indicator_analyzer.analyze(frame)
+
+
+def main():
+    print(f"{'bars':>6} {'List[Candle] ms':>16} {'CandleFrame ms':>15} {'speedup':>8}")
+    for count, repeat in ((100, 200), (1_000, 50), (10_000, 5)):
+        rows = make_klines(count)
+        old = time_it(lambda: list_path(rows), repeat)
+        new = time_it(lambda: frame_path(rows), repeat)
+        print(f"{count:>6} {old:>16.3f} {new:>15.3f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: server work per minute of dashboards, polling vs push channels
+Polling: every dashboard calls /api/candles and /api/status every 10 s and
+/api/trades every 30 s. Channels: one shared refresh (candles every 10 s,
+status/positions every 5 s) pushes only what changed to all subscribers.
+The market moves one tick per candle refresh (a new bar every 5th).
+
+Usage: python bench_channels.py
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'backend'))  # Agents load prompts relative to backend/
+os.environ.setdefault("DEBATE_HISTORY_DB_PATH", "")  # Keep bench debates out of the real message log
+
+import api.channels as channels  # noqa: E402
+import api.routes as routes  # noqa: E402
+from api.channels import ChannelHub, CHANNELS  # noqa: E402
+from data.candle_frame import CandleFrame  # noqa: E402
+from data.market_data import generate_mock_ticker  # noqa: E402
+from data.data_models import Candle  # noqa: E402
+
+SYMBOL = "cmt_btcusdt"
+SUBSCRIBE = [f"candles:{SYMBOL}", f"ticker:{SYMBOL}", "trades", "status"]
+
+
+class Market:
+    """Deterministic feed: the last bar ticks on every fetch, a new bar opens every 5th"""
+
+    def __init__(self, bars: int = 100):
+        self.ts = np.arange(bars, dtype=np.int64) * 300_000 + 1_700_000_000_000
+        self.close = 98_500 + np.cumsum(np.sin(np.arange(bars)) * 20)
+        self.fetches = 0
+
+    async def fetch_chart(self, symbol, interval="5m", limit=100):
+        self.fetches += 1
+        if self.fetches % 5 == 0:
+            self.ts = np.append(self.ts[1:], self.ts[-1] + 300_000)
+            self.close = np.append(self.close[1:], self.close[-1])
+        self.close[-1] += 1.5
+        frame = CandleFrame(
+            self.ts.copy(), self.close - 5, self.close + 20, self.close - 20, self.close.copy(), np.full(len(self.ts), 250.0)
+        )
+        price = float(self.close[-1])
+        last = Candle(timestamp=datetime.fromtimestamp(int(self.ts[-1]) / 1000),
+                      open=price - 5, high=price + 20, low=price - 20, close=price, volume=250.0)
+        return frame, generate_mock_ticker(symbol, last)
+
+
+async def polling(dashboards: int) -> dict:
+    """One minute of REST polls from every dashboard"""
+    market = Market()
+    routes.fetch_chart = market.fetch_chart
+    calls, sent = 0, 0
+    start = time.process_time()
+    for second in range(0, 60, 10):
+        for _ in range(dashboards):
+            for response in (
+                await routes.get_candles(SYMBOL),
+                await routes.get_status(),
+                *([await routes.get_trades(50)] if second % 30 == 0 else [])
+            ):
+                sent += len(json.dumps(response, default=str))
+                calls += 1
+    return {"cpu_ms": (time.process_time() - start) * 1000, "work": calls, "frames": calls, "kb": sent / 1024}
+
+
+async def pushed(dashboards: int) -> dict:
+    """One minute of the shared refresh with every dashboard subscribed"""
+    market = Market()
+    channels.fetch_chart = market.fetch_chart
+    frames, sent = 0, 0
+
+    def send(clients, frame):
+        nonlocal frames, sent
+        clients = list(clients)
+        text = json.dumps(frame)  # Serialized once per frame, as ConnectionManager.multicast
+        frames += len(clients)
+        sent += len(text) * len(clients)
+
+    hub = ChannelHub(send)
+    start = time.process_time()
+    for client in range(dashboards):
+        await hub.subscribe(client, SUBSCRIBE)
+    hub._stop()  # Drive the refresh cycle by hand below
+    work = 2  # Initial candles/ticker + status loads
+    for second in range(0, 60, 5):
+        await hub._refresh("status")
+        work += 1
+        if second % 10 == 0:
+            await hub._refresh_market(SYMBOL)
+            work += 1
+    stats = hub.get_stats()
+    return {
+        "cpu_ms": (time.process_time() - start) * 1000, "work": work, "frames": frames, "kb": sent / 1024,
+        "updates": stats["updates"], "unchanged": stats["unchanged"]
+    }
+
+
+def main():
+    print(f"Channels: {', '.join(CHANNELS)}; one minute of dashboard traffic\n")
+    print(f"{'dashboards':>10}  {'path':<9} {'server CPU ms':>13} {'fetch/stat calls':>16} {'frames':>8} {'KB sent':>9}")
+    for dashboards in (1, 10, 100, 1000):
+        for name, run in (("polling", polling), ("channels", pushed)):
+            r = asyncio.run(run(dashboards))
+            print(f"{dashboards:>10}  {name:<9} {r['cpu_ms']:>13.1f} {r['work']:>16} {r['frames']:>8} {r['kb']:>9.1f}")
+    r = asyncio.run(pushed(1))
+    print(f"\nchannel refreshes with no change (nothing sent): {r['unchanged']} of {r['unchanged'] + r['updates']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prompt size per LLM call over consecutive debate cycles
+Old behaviour (last 10 raw turns, full market dumps included) vs the
+token-budgeted ConversationContext. Runs against a local Bedrock stub.
+
+Usage: python bench_context.py [cycles]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'backend'))  # Agents load prompts relative to backend/
+os.environ.setdefault("DEBATE_HISTORY_DB_PATH", "")  # Keep bench debates out of the real message log
+
+from agents.context_manager import ConversationContext, estimate_tokens  # noqa: E402
+from agents.debate_engine import debate_engine  # noqa: E402
+from agents.llm_transport import BedrockTransport  # noqa: E402
+from config.settings import settings  # noqa: E402
+from signals.setup_gate import setup_gate  # noqa: E402
+from bench_llm_transport import SlowBedrockStub, listen, use_transport  # noqa: E402
+
+
+class RawHistory(ConversationContext):
+    """The previous behaviour: the last 10 messages, verbatim"""
+
+    def add_exchange(self, user_message: str, assistant_message: str):
+        for role, content in (("user", user_message), ("assistant", assistant_message)):
+            self.turns.append({"role": role, "content": content, "tokens": estimate_tokens(content)})
+        self.turns = self.turns[-10:]
+
+
+async def run(cycles: int, context_class) -> list:
+    """Bull's prompt tokens for each cycle"""
+    transport = BedrockTransport()
+    transport._client = SlowBedrockStub(0.0)
+    use_transport(transport)
+    agents = (debate_engine.bull, debate_engine.bear, debate_engine.risk)
+    for agent in agents:
+        agent.contexts[settings.default_symbol] = context_class(extract_json=agent._extract_json)
+    tokens = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(cycles):
+            await debate_engine.run_debate_cycle()
+            tokens.append(debate_engine.bull.last_prompt_tokens)
+    return tokens
+
+
+def main():
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    settings.llm_cache_enabled = False
+    setup_gate.enabled = False
+    listen()
+
+    raw = asyncio.run(run(cycles, RawHistory))
+    budgeted = asyncio.run(run(cycles, ConversationContext))
+
+    print(f"Bull prompt tokens per call (budget {settings.llm_context_budget_tokens} history tokens)")
+    print(f"{'cycle':>5} {'raw history':>12} {'budgeted':>9}")
+    for i, (old, new) in enumerate(zip(raw, budgeted), 1):
+        print(f"{i:>5} {old:>12} {new:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: how long a publisher (the debate engine) is held up per event
+Old behaviour (every callback awaited inline) vs the event bus, with one
+fast subscriber and one slow one (e.g. a stalled WebSocket client), plus the
+bus metrics for each overflow policy.
+
+Usage: python bench_event_bus.py [events] [slow_ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from events.event_bus import EventBus, OVERFLOW_POLICIES  # noqa: E402
+
+
+async def fast(payload):
+    pass
+
+
+def make_slow(slow_ms: float):
+    async def slow(payload):
+        await asyncio.sleep(slow_ms / 1000)
+    return slow
+
+
+async def inline(events: int, slow_ms: float) -> list:
+    """The previous _broadcast_message: await each callback in turn"""
+    callbacks = [fast, make_slow(slow_ms)]
+    blocked = []
+    for i in range(events):
+        start = time.perf_counter()
+        for callback in callbacks:
+            await callback(i)
+        blocked.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+    return blocked
+
+
+async def bus(events: int, slow_ms: float, policy: str) -> tuple:
+    event_bus = EventBus()
+    subscriptions = [
+        event_bus.subscribe("fast", lambda e: fast(e.payload), maxsize=32, policy=policy),
+        event_bus.subscribe("slow", lambda e: make_slow(slow_ms)(e.payload), maxsize=32, policy=policy)
+    ]
+    blocked = []
+    for i in range(events):
+        start = time.perf_counter()
+        event_bus.publish("debate.message", i, key=f"symbol-{i % 4}")
+        blocked.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+    await event_bus.drain()
+    return blocked, {sub.name: sub.get_stats() for sub in subscriptions}  # Includes evicted ones
+
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    slow_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 50.0
+    print(f"{events} events every 5 ms; slow subscriber takes {slow_ms:.0f} ms per event\n")
+
+    print(f"{'path':<22} {'p50 ms':>8} {'p99 ms':>8} {'total s':>8}")
+    blocked = asyncio.run(inline(events, slow_ms))
+    print(f"{'inline callbacks':<22} {statistics.median(blocked):>8.3f} "
+          f"{sorted(blocked)[int(len(blocked) * 0.99) - 1]:>8.3f} {sum(blocked) / 1000:>8.2f}")
+
+    results = {}
+    for policy in OVERFLOW_POLICIES:
+        blocked, stats = asyncio.run(bus(events, slow_ms, policy))
+        results[policy] = stats
+        print(f"{'bus (' + policy + ')':<22} {statistics.median(blocked):>8.3f} "
+              f"{sorted(blocked)[int(len(blocked) * 0.99) - 1]:>8.3f} {sum(blocked) / 1000:>8.2f}")
+
+    print(f"\n{'policy':<12} {'subscriber':<8} {'delivered':>9} {'dropped':>8} {'coalesced':>9} "
+          f"{'max depth':>9} {'avg ms':>8} {'closed':>7}")
+    for policy, subscribers in results.items():
+        for name, s in subscribers.items():
+            print(f"{policy:<12} {name:<8} {s['delivered']:>9} {s['dropped']:>8} {s['coalesced']:>9} "
+                  f"{s['max_depth']:>9} {s['avg_latency_ms']:>8.1f} {str(s['closed']):>7}")
+
+
+if __name__ == "__main__":
+    main()
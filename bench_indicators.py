@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark: IndicatorAnalyzer pandas backend vs pure-NumPy backend
+(full analyze() on a CandleFrame) at 100, 1k and 10k bars.
+
+Usage: python bench_indicators.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data.candle_frame import CandleFrame  # noqa: E402
+from signals.indicators import IndicatorAnalyzer  # noqa: E402
+
+
+def make_frame(count: int) -> CandleFrame:
+    """Random-walk candles, oldest first"""
+    rows = []
+    price = 98500.0
+    for i in range(count):
+        close = price * (1 + random.uniform(-0.002, 0.002))
+        rows.append([
+            i * 300_000, price, max(price, close) + 20, min(price, close) - 20,
+            close, random.uniform(100, 500)
+        ])
+        price = close
+    return CandleFrame.from_klines(rows)
+
+
+def time_it(fn, repeat: int) -> float:
+    """Best-of mean time per call in milliseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat * 1000)
+    return best
+
+
+def main():
+    pandas_analyzer = IndicatorAnalyzer(backend="pandas")
+    numpy_analyzer = IndicatorAnalyzer(backend="numpy")
+
+    print(f"{'bars':>6} {'pandas ms':>10} {'numpy ms':>9} {'speedup':>8}  same signals")
+    for count, repeat in ((100, 200), (1_000, 50), (10_000, 5)):
+        frame = make_frame(count)
+        old = time_it(lambda: pandas_analyzer.analyze(frame), repeat)
+        new = time_it(lambda: numpy_analyzer.analyze(frame), repeat)
+        same = (
+            [s.description for s in pandas_analyzer.analyze(frame)]
+            == [s.description for s in numpy_analyzer.analyze(frame)]
+        )
+        print(f"{count:>6} {old:>10.3f} {new:>9.3f} {old / new:>7.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
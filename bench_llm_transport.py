@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Benchmark: API responsiveness while debates are waiting on the LLM
+Runs several debate cycles against a slow local Bedrock stub and probes
+/api/health meanwhile, once with the old inline (blocking) invoke_model
+call and once through the async BedrockTransport.
+
+Also measures time-to-first-visible-text with and without response streaming,
+and debate cycle latency in sequential, parallel and committee debate modes.
+
+Usage: python bench_llm_transport.py [debates] [llm_seconds]
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'backend'))  # Agents load prompts relative to backend/
+os.environ.setdefault("DEBATE_HISTORY_DB_PATH", "")  # Keep bench debates out of the real message log
+
+import httpx  # noqa: E402
+from main import app  # noqa: E402
+from agents.llm_transport import BedrockTransport  # noqa: E402
+from agents.debate_engine import debate_engine  # noqa: E402
+from config.settings import settings  # noqa: E402
+from signals.setup_gate import setup_gate  # noqa: E402
+
+
+# =============================================================================
+# SLOW BEDROCK STUB
+# =============================================================================
+
+class SlowBedrockStub:
+    """Stands in for the bedrock-runtime client: sleeps, then returns a canned reply"""
+
+    REPLIES = {
+        "Bull": {"action": "PROPOSE_LONG", "confidence": 0.8, "suggested_leverage": 5,
+                 "stop_loss_pct": 1.5, "take_profit_pct": 2.5, "reasoning": "stub"},
+        "Bear": {"action": "CHALLENGE", "confidence": 0.6, "reasoning": "stub"},
+        "Risk Manager": {"decision": "REJECT", "reasoning": "stub"}
+    }
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def _reply(self, body: str) -> str:
+        system = json.loads(body)["system"]
+        if "TRADING COMMITTEE in a single reply" in system:
+            reply = {"bull": self.REPLIES["Bull"], "bear": self.REPLIES["Bear"], "risk": self.REPLIES["Risk Manager"]}
+        else:
+            role = "Bull" if "BULL AGENT" in system else "Bear" if "BEAR AGENT" in system else "Risk Manager"
+            reply = self.REPLIES[role]
+        return "```json\n" + json.dumps(reply) + "\n```"
+
+    def invoke_model(self, modelId, body, contentType, accept):
+        time.sleep(self.delay)
+        payload = {"content": [{"text": self._reply(body)}]}
+        return {"body": io.BytesIO(json.dumps(payload).encode())}
+
+    def invoke_model_with_response_stream(self, modelId, body, contentType, accept):
+        """Bedrock-style event stream: the reply in 20 deltas spread over `delay`"""
+        text = self._reply(body)
+        step = max(len(text) // 20, 1)
+
+        def events():
+            for i in range(0, len(text), step):
+                time.sleep(self.delay / 20)
+                delta = {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text[i:i + step]}}
+                yield {"chunk": {"bytes": json.dumps(delta).encode()}}
+            yield {"chunk": {"bytes": json.dumps({"type": "message_stop"}).encode()}}
+
+        return {"body": events()}
+
+
+class BlockingTransport(BedrockTransport):
+    """The previous behaviour: invoke_model called directly on the event loop"""
+
+    async def invoke(self, model_id, request, timeout=None):
+        return self._invoke_sync(model_id, json.dumps(request))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def use_transport(transport: BedrockTransport):
+    for agent in (debate_engine.bull, debate_engine.bear, debate_engine.risk, debate_engine.committee):
+        agent.transport = transport
+
+
+def listen(on_partial=None, on_message=None):
+    """Replace every event bus subscriber (e.g. the WebSocket fan-out) with the given callbacks"""
+    for subscription in list(debate_engine.bus.subscriptions.values()):
+        subscription.close()
+    if on_partial is not None:
+        debate_engine.add_partial_callback(on_partial)
+    if on_message is not None:
+        debate_engine.add_message_callback(on_message)
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event) -> list:
+    """
+    Hit /api/health every 10 ms; latency is measured from when the probe was
+    due, so time spent waiting for a blocked loop counts
+    """
+    latencies = []
+    while not stop.is_set():
+        due = time.perf_counter() + 0.01
+        await asyncio.sleep(0.01)
+        await client.get("/api/health")
+        latencies.append((time.perf_counter() - due) * 1000)
+    return latencies
+
+
+async def run(transport: BedrockTransport, debates: int) -> dict:
+    use_transport(transport)
+    listen()  # No partial listeners -> buffered calls, so the blocking transport is exercised
+    stop = asyncio.Event()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        prober = asyncio.create_task(probe(client, stop))
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await asyncio.gather(*(debate_engine.run_debate_cycle() for _ in range(debates)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        latencies = sorted(await prober)
+
+    return {
+        "probes": len(latencies),
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan"),
+        "max": latencies[-1] if latencies else float("nan"),
+        "wall": elapsed
+    }
+
+
+async def first_output(transport: BedrockTransport, streaming: bool) -> list:
+    """Per agent message: seconds until the UI sees first text vs the final message"""
+    use_transport(transport)
+    settings.llm_streaming = streaming
+    start = time.perf_counter()
+    first, final = {}, {}
+
+    async def on_partial(frame):
+        first.setdefault(frame["message_id"], time.perf_counter() - start)
+
+    async def on_message(message):
+        final[message.message_id] = time.perf_counter() - start
+        first.setdefault(message.message_id, final[message.message_id])
+
+    listen(on_partial, on_message)
+    with contextlib.redirect_stdout(io.StringIO()):
+        await debate_engine.run_debate_cycle()
+        await debate_engine.bus.drain()
+    # Report each message relative to when its agent started (previous final)
+    rows, previous = [], 0.0
+    for message_id, done in final.items():
+        rows.append((first[message_id] - previous, done - previous))
+        previous = done
+    return rows
+
+
+async def cycle_latency(transport: BedrockTransport, mode: str) -> dict:
+    """One debate cycle in the given debate mode; returns the engine's timing stats"""
+    use_transport(transport)
+    debate_engine.debate_mode = mode
+    debate_engine.timing[mode] = {"cycles": 0, "total_seconds": 0.0, "saved_seconds": 0.0}
+    listen()
+    with contextlib.redirect_stdout(io.StringIO()):
+        decision = await debate_engine.run_debate_cycle()
+    stats = debate_engine.get_stats()["cycle_latency"][mode]
+    stats["decision"] = "trade" if decision else "no trade"
+    return stats
+
+
+def main():
+    debates = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    delay = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    print(f"{debates} concurrent debates, {delay:.1f}s per LLM call\n")
+    settings.llm_cache_enabled = False  # Every cycle pays for its model calls
+    settings.debate_pacing_seconds = 0  # Show messages as soon as they are ready
+    setup_gate.enabled = False
+
+    print(f"{'transport':<10} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'wall s':>7}")
+    for name, transport in (
+        ("blocking", BlockingTransport()),
+        ("async", BedrockTransport())
+    ):
+        transport._client = SlowBedrockStub(delay)
+        r = asyncio.run(run(transport, debates))
+        print(f"{name:<10} {r['probes']:>7} {r['p50']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} {r['wall']:>7.2f}")
+
+    print("\nTime to first visible text per agent message (s)")
+    print(f"{'mode':<10} {'first':>7} {'final':>7}")
+    for name, streaming in (("buffered", False), ("streaming", True)):
+        transport = BedrockTransport()
+        transport._client = SlowBedrockStub(delay)
+        for first, done in asyncio.run(first_output(transport, streaming)):
+            print(f"{name:<10} {first:>7.2f} {done:>7.2f}")
+
+    print("\nDebate cycle latency by mode")
+    print(f"{'mode':<10} {'cycle ms':>9} {'saved ms':>9}  outcome")
+    settings.llm_streaming = False
+    for mode in ("sequential", "parallel", "committee"):
+        transport = BedrockTransport()
+        transport._client = SlowBedrockStub(delay)
+        r = asyncio.run(cycle_latency(transport, mode))
+        print(f"{mode:<10} {r['avg_ms']:>9.0f} {r['avg_saved_ms']:>9.0f}  {r['decision']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MarketDataService.get_market_data latency
+Compares a fresh HTTP client per cycle (old behaviour) against the
+shared keep-alive pool, using a local stub of the WEEX market endpoints.
+
+Usage: python bench_market_data.py [iterations]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import socket
+import statistics
+import sys
+import time
+
+from aiohttp import web
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+PORT = _free_port()
+
+# Point the backend at the stub before it reads its settings
+os.environ["WEEX_API_KEY"] = "bench_stub_api_key"
+os.environ["WEEX_BASE_URL"] = f"http://127.0.0.1:{PORT}"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from data.weex_client import weex_client  # noqa: E402
+from data.market_data import market_data_service  # noqa: E402
+
+
+# =============================================================================
+# STUB WEEX SERVER
+# =============================================================================
+
+NOW_MS = int(time.time() * 1000)
+CANDLES = [
+    [str(NOW_MS - (100 - i) * 300_000), "98500", "98600", "98400", "98550", "12.5"]
+    for i in range(100)
+]
+TICKER = {
+    "last": "98550", "best_bid": "98549", "best_ask": "98551",
+    "volume_24h": "123456", "priceChangePercent": "0.5",
+    "high_24h": "99000", "low_24h": "98000"
+}
+DEPTH = {
+    "bids": [[str(98549 - i), "1.0"] for i in range(20)],
+    "asks": [[str(98551 + i), "1.0"] for i in range(20)]
+}
+
+
+async def _ticker(request):
+    return web.json_response(TICKER)
+
+
+async def _candles(request):
+    return web.json_response(CANDLES)
+
+
+async def _depth(request):
+    return web.json_response(DEPTH)
+
+
+async def start_stub() -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get("/capi/v2/market/ticker", _ticker)
+    app.router.add_get("/capi/v2/market/candles", _candles)
+    app.router.add_get("/capi/v2/market/depth", _depth)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    return runner
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(iterations: int, pooled: bool) -> list:
+    samples = []
+    for _ in range(iterations):
+        market_data_service.clear_cache()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await market_data_service.get_market_data("cmt_btcusdt")
+            if not pooled:
+                # Old behaviour: every cycle paid for brand new connections
+                await weex_client.close_http()
+        samples.append((time.perf_counter() - start) * 1000)
+    await weex_client.close_http()
+    return samples
+
+
+async def main(iterations: int):
+    runner = await start_stub()
+    try:
+        # Warm-up (imports, first connection)
+        await run(10, pooled=True)
+
+        results = {
+            "per-cycle client": await run(iterations, pooled=False),
+            "pooled client": await run(iterations, pooled=True),
+        }
+    finally:
+        await runner.cleanup()
+
+    print(f"get_market_data latency over {iterations} iterations (local stub)")
+    print(f"{'mode':<18} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for mode, samples in results.items():
+        print(
+            f"{mode:<18} {percentile(samples, 50):>8.2f} "
+            f"{percentile(samples, 99):>8.2f} {statistics.mean(samples):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 300))
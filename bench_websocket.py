@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Load test: debate broadcast latency vs number of connected dashboards
+Old ConnectionManager (JSON re-serialized per client, sends awaited one
+after another) vs per-client send queues with one serialization per event.
+Each run includes one slow dashboard (200 ms per send), which the new
+manager evicts once a send stalls past WS_SEND_TIMEOUT_SECONDS.
+
+Usage: python bench_websocket.py [broadcasts]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'backend'))  # Agents load prompts relative to backend/
+os.environ.setdefault("DEBATE_HISTORY_DB_PATH", "")  # Keep bench debates out of the real message log
+
+from api.websocket import ConnectionManager  # noqa: E402
+from config.settings import settings  # noqa: E402
+from data.data_models import DebateMessage  # noqa: E402
+
+
+class FakeSocket:
+    """Stands in for a Starlette WebSocket: each send yields to the loop like real socket I/O"""
+
+    def __init__(self, send_seconds: float = 0.0):
+        self.send_seconds = send_seconds
+        self.received = []  # perf_counter time of each frame
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.send_seconds)
+        self.received.append(time.perf_counter())
+
+    async def send_json(self, data: dict):
+        await self.send_text(json.dumps(data))
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+class LegacyConnectionManager:
+    """The previous broadcast: serialize and await send_json per client, in turn"""
+
+    def __init__(self):
+        self.active_connections = []
+
+    async def connect(self, websocket):
+        await websocket.accept()
+        self.active_connections.append(websocket)
+
+    async def broadcast(self, message: DebateMessage):
+        for websocket in self.active_connections:
+            await websocket.send_json(ConnectionManager.message_frame(message))
+
+
+MESSAGE = DebateMessage(
+    agent="Bull", emoji="🐂", confidence=0.72, symbol="cmt_btcusdt", decision="PROPOSE_LONG",
+    message="📈 **PROPOSING LONG** on BTC/USDT\nConfidence: 72%\nLeverage: 15x | SL: 1.0% | TP: 2.5%\n\n" + "x" * 400
+)
+
+
+async def run(manager_class, clients: int, broadcasts: int) -> dict:
+    manager = manager_class()
+    healthy = [FakeSocket() for _ in range(clients)]
+    for websocket in [FakeSocket(send_seconds=0.2)] + healthy:  # Slow dashboard connected first
+        await manager.connect(websocket)
+
+    blocked, delivered = [], []
+    for _ in range(broadcasts):
+        start = time.perf_counter()
+        result = manager.broadcast(MESSAGE)
+        if asyncio.iscoroutine(result):
+            await result
+        blocked.append((time.perf_counter() - start) * 1000)
+        # Wait until every healthy dashboard has the frame
+        while any(len(ws.received) < len(delivered) + 1 for ws in healthy):
+            await asyncio.sleep(0)
+        delivered.append((max(ws.received[len(delivered)] for ws in healthy) - start) * 1000)
+        await asyncio.sleep(0.05)
+
+    return {
+        "blocked": statistics.median(blocked),
+        "delivered": statistics.median(delivered),
+        "evicted": getattr(manager, "evicted", 0)
+    }
+
+
+def main():
+    broadcasts = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    settings.ws_send_timeout_seconds = 0.1
+    print(f"{broadcasts} broadcasts, 50 ms apart; +1 slow dashboard (200 ms/send)\n")
+    print(f"{'clients':>7}  {'manager':<8} {'caller blocked ms':>18} {'last delivery ms':>17} {'evicted':>8}")
+    for clients in (1, 10, 100, 1000):
+        for name, manager_class in (("legacy", LegacyConnectionManager), ("queued", ConnectionManager)):
+            r = asyncio.run(run(manager_class, clients, broadcasts))
+            print(f"{clients:>7}  {name:<8} {r['blocked']:>18.2f} {r['delivered']:>17.2f} {r['evicted']:>8}")
+
+
+if __name__ == "__main__":
+    main()
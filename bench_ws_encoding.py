@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: WebSocket frame encodings - bytes on the wire and CPU per event
+JSON (the default) vs the compact "binary" struct format and, when the
+msgpack package is installed, MessagePack with field ids. Frames are the ones
+/ws/debate actually sends: debate messages and partials, candle snapshots and
+updates, ticker and status channel frames, plus an order-book snapshot.
+Each event is encoded once per encoding in use, whatever the client count.
+
+Usage: python bench_ws_encoding.py [iterations]
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+os.chdir(os.path.join(os.path.dirname(__file__), 'backend'))  # Agents load prompts relative to backend/
+os.environ.setdefault("DEBATE_HISTORY_DB_PATH", "")  # Keep bench debates out of the real message log
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from api import frame_codec  # noqa: E402
+from api.channels import status_state, ticker_state  # noqa: E402
+from api.websocket import ConnectionManager  # noqa: E402
+from data.candle_frame import CandleFrame  # noqa: E402
+from data.data_models import DebateMessage  # noqa: E402
+from data.market_data import generate_mock_candles, generate_mock_ticker, generate_mock_orderbook  # noqa: E402
+
+
+def sample_frames() -> dict:
+    candles = CandleFrame.from_candles(generate_mock_candles()).to_chart_records()
+    ticker = generate_mock_ticker("cmt_btcusdt", generate_mock_candles(count=1)[-1])
+    message = DebateMessage(
+        agent="Bull", emoji="🐂", confidence=0.72, symbol="cmt_btcusdt", decision="PROPOSE_LONG",
+        message_id="3f2b8c1e-5d4a-4c1b-9a7e-2b1c0d9e8f7a", timestamp=datetime.now(),
+        message="📈 **PROPOSING LONG** on BTC/USDT\nConfidence: 72%\nLeverage: 15x | SL: 1.0% | TP: 2.5%\n\n"
+                "Momentum and funding both favour longs; order book bid-heavy near the high."
+    )
+    return {
+        "debate_message": ConnectionManager.message_frame(message),
+        "debate_partial": {
+            "type": "debate_partial", "message_id": message.message_id, "agent": "Bear", "emoji": "🐻",
+            "symbol": "cmt_btcusdt", "message": '{"stance": "CHALLENGE", "confidence": 0.6', "confidence": 0.6,
+            "fields": {"stance": "CHALLENGE", "confidence": 0.6}
+        },
+        "candles snapshot": {
+            "type": "channel_snapshot", "channel": "candles:cmt_btcusdt:5m",
+            "data": {"symbol": "cmt_btcusdt", "interval": "5m", "candles": candles}
+        },
+        "candle update": {
+            "type": "channel_update", "channel": "candles:cmt_btcusdt:5m", "data": {"candles": candles[-1:]}
+        },
+        "orderbook snapshot": {
+            "type": "channel_snapshot", "channel": "orderbook:cmt_btcusdt",
+            "data": jsonable_encoder(generate_mock_orderbook(ticker.last_price))
+        },
+        "ticker update": {
+            "type": "channel_update", "channel": "ticker:cmt_btcusdt",
+            "data": {k: v for k, v in ticker_state(ticker).items() if k in ("last_price", "bid", "ask")}
+        },
+        "status snapshot": {"type": "channel_snapshot", "channel": "status", "data": jsonable_encoder(status_state())}
+    }
+
+
+def decoder(encoding: str):
+    if encoding == frame_codec.BINARY:
+        return frame_codec.decode_binary
+    if encoding == frame_codec.MSGPACK:
+        return lambda data: frame_codec.msgpack.unpackb(data, strict_map_key=False)
+    return json.loads
+
+
+def per_call_us(fn, arg, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    frames = sample_frames()
+    encodings = frame_codec.ENCODINGS
+    if frame_codec.MSGPACK not in encodings:
+        print("(msgpack not installed - pip install msgpack to include it)")
+    print(f"{iterations} encodes/decodes per frame\n")
+    print(f"{'frame':<20} {'encoding':<8} {'bytes':>7} {'vs json':>8} {'encode us':>10} {'decode us':>10}")
+
+    totals = {encoding: [0, 0.0] for encoding in encodings}
+    for name, frame in frames.items():
+        json_bytes = None
+        for encoding in encodings:
+            data = frame_codec.encode(frame, encoding)
+            size = len(data.encode() if isinstance(data, str) else data)
+            json_bytes = json_bytes or size
+            encode_us = per_call_us(lambda f: frame_codec.encode(f, encoding), frame, iterations)
+            decode_us = per_call_us(decoder(encoding), data, iterations)
+            totals[encoding][0] += size
+            totals[encoding][1] += encode_us
+            print(f"{name:<20} {encoding:<8} {size:>7} {size / json_bytes:>7.0%} {encode_us:>10.1f} {decode_us:>10.1f}")
+        print()
+
+    print(f"{'all frames':<20} {'encoding':<8} {'bytes':>7} {'vs json':>8} {'encode us':>10}")
+    for encoding, (size, encode_us) in totals.items():
+        print(f"{'':<20} {encoding:<8} {size:>7} {size / totals['json'][0]:>7.0%} {encode_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
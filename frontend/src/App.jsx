@@ -1,5 +1,17 @@
 import { useState, useEffect, useCallback } from 'react'
 import Dashboard from './components/Dashboard'
+import channelService from './services/ChannelService'
+import FrameDecoder from './services/FrameCodec'
+
+// Insert a debate message, or replace the one with the same message_id
+function upsertMessage(messages, message) {
+    if (!message.message_id) return [...messages, message]
+    const index = messages.findIndex(m => m.message_id === message.message_id)
+    if (index === -1) return [...messages, message]
+    const next = [...messages]
+    next[index] = message
+    return next
+}
 
 function App() {
     const [isConnected, setIsConnected] = useState(false)
@@ -11,16 +23,22 @@ function App() {
 
     // Connect to WebSocket
     useEffect(() => {
-        const websocket = new WebSocket(`ws://${window.location.hostname}:8000/ws/debate`)
+        // Compact binary frames (field-id dictionaries, epoch-ms timestamps); the
+        // server answers with an "encoding" handshake carrying the dictionaries
+        const websocket = new WebSocket(`ws://${window.location.hostname}:8000/ws/debate?encoding=binary`)
+        websocket.binaryType = 'arraybuffer'
+        let decoder = null
 
         websocket.onopen = () => {
             console.log('WebSocket connected')
             setIsConnected(true)
+            channelService.attach(websocket)
         }
 
         websocket.onclose = () => {
             console.log('WebSocket disconnected')
             setIsConnected(false)
+            channelService.detach()
         }
 
         websocket.onerror = (error) => {
@@ -29,10 +47,23 @@ function App() {
 
         websocket.onmessage = (event) => {
             try {
-                const data = JSON.parse(event.data)
+                const data = typeof event.data === 'string'
+                    ? JSON.parse(event.data)
+                    : decoder.decode(event.data)
+
+                if (data.type === 'encoding') {
+                    decoder = data.encoding === 'binary' ? new FrameDecoder(data) : null
+                    return
+                }
+
+                // Market/portfolio push channels (candles, ticker, positions, trades, status)
+                if (channelService.handleMessage(data)) return
 
                 if (data.type === 'debate_message') {
-                    setMessages(prev => [...prev, data])
+                    // Final message replaces its streamed partial (same message_id)
+                    setMessages(prev => upsertMessage(prev, data))
+                } else if (data.type === 'debate_partial') {
+                    setMessages(prev => upsertMessage(prev, { ...data, partial: true }))
                 } else if (data.type === 'status_update') {
                     setStatus(data)
                 } else if (data.type === 'trade_executed') {
@@ -66,9 +97,15 @@ function App() {
         }
     }, [])
 
-    // Fetch initial status
+    // Fetch initial status, then follow pushed status changes
     useEffect(() => {
         fetchStatus()
+        return channelService.subscribe('status', (data) => {
+            setStatus(prev => ({ ...prev, ...data }))
+            if (data.demo_mode !== undefined) {
+                setDemoMode(data.demo_mode)
+            }
+        })
     }, [fetchStatus])
 
     // Control functions
@@ -1,7 +1,7 @@
 import './AgentMessage.css'
 
 function AgentMessage({ message }) {
-    const { agent, emoji, message: content, confidence, timestamp } = message
+    const { agent, emoji, message: content, confidence, timestamp, partial, symbol } = message
 
     const agentClass = agent.toLowerCase().replace(' ', '-')
 
@@ -15,18 +15,23 @@ function AgentMessage({ message }) {
         : ''
 
     return (
-        <div className={`agent-message ${agentClass} animate-slide-in`}>
+        <div className={`agent-message ${agentClass} animate-slide-in${partial ? ' streaming' : ''}`}>
             <div className="message-header">
                 <div className="agent-info">
                     <span className="agent-emoji">{emoji}</span>
                     <span className="agent-name">{agent}</span>
+                    {symbol && (
+                        <span className="symbol-badge">
+                            {symbol.replace('cmt_', '').replace('usdt', '').toUpperCase()}
+                        </span>
+                    )}
                     {confidence !== null && confidence !== undefined && (
                         <span className="confidence-badge">
                             {Math.round(confidence * 100)}% confident
                         </span>
                     )}
                 </div>
-                <span className="message-time">{time}</span>
+                <span className="message-time">{partial ? 'typing…' : time}</span>
             </div>
             <div className="message-content">
                 <FormattedContent content={content} />
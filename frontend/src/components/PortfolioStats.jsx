@@ -1,4 +1,5 @@
 import { useState, useEffect } from 'react'
+import channelService from '../services/ChannelService'
 import './PortfolioStats.css'
 
 function PortfolioStats() {
@@ -20,8 +21,13 @@ function PortfolioStats() {
             }
         }
         fetchStats()
-        const interval = setInterval(fetchStats, 10000) // Refresh every 10s
-        return () => clearInterval(interval)
+        // Pushed whenever trading stats change
+        return channelService.subscribe('status', (data) => {
+            if (data.trading) {
+                setStats(data.trading)
+            }
+            setLoading(false)
+        })
     }, [])
 
     if (loading) {
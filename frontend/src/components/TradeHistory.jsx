@@ -1,11 +1,12 @@
 import { useState, useEffect } from 'react'
+import channelService from '../services/ChannelService'
 import './TradeHistory.css'
 
 function TradeHistory({ trades = [] }) {
     const [localTrades, setLocalTrades] = useState(trades)
     const [filter, setFilter] = useState('all') // all, wins, losses
 
-    // Fetch trade history from API
+    // Fetch trade history from API, then follow the trades channel
     useEffect(() => {
         const fetchTrades = async () => {
             try {
@@ -19,8 +20,8 @@ function TradeHistory({ trades = [] }) {
             }
         }
         fetchTrades()
-        const interval = setInterval(fetchTrades, 30000) // Refresh every 30s
-        return () => clearInterval(interval)
+        // Pushed as trades are opened and closed
+        return channelService.subscribe('trades', (data) => setLocalTrades(data.trades))
     }, [])
 
     const filteredTrades = localTrades.filter(trade => {
@@ -1,7 +1,14 @@
 import { useEffect, useRef, useState } from 'react'
 import { createChart } from 'lightweight-charts'
+import channelService from '../services/ChannelService'
 import './TradingChart.css'
 
+const volumeBar = (c) => ({
+    time: c.time,
+    value: c.volume || Math.random() * 1000 + 500,
+    color: c.close >= c.open ? 'rgba(0, 212, 170, 0.3)' : 'rgba(255, 107, 107, 0.3)',
+})
+
 function TradingChart({ symbol = 'cmt_btcusdt' }) {
     const chartContainerRef = useRef(null)
     const chartRef = useRef(null)
@@ -21,12 +28,7 @@ function TradingChart({ symbol = 'cmt_btcusdt' }) {
 
                 // Update volume
                 if (volumeSeriesRef.current) {
-                    const volumeData = data.candles.map(c => ({
-                        time: c.time,
-                        value: c.volume || Math.random() * 1000 + 500,
-                        color: c.close >= c.open ? 'rgba(0, 212, 170, 0.3)' : 'rgba(255, 107, 107, 0.3)',
-                    }))
-                    volumeSeriesRef.current.setData(volumeData)
+                    volumeSeriesRef.current.setData(data.candles.map(volumeBar))
                 }
 
                 // Update price display
@@ -120,11 +122,26 @@ function TradingChart({ symbol = 'cmt_btcusdt' }) {
         // Fetch initial data
         fetchCandles()
 
-        // Set up periodic refresh every 10 seconds
-        const refreshInterval = setInterval(fetchCandles, 10000)
+        // Then follow pushed bars: a snapshot redraws, an update only touches the changed bars
+        const unsubscribeCandles = channelService.subscribe(`candles:${symbol}:5m`, (data, frame) => {
+            if (frame?.type === 'channel_update') {
+                frame.data.candles.forEach(c => {
+                    candleSeries.update(c)
+                    volumeSeries.update(volumeBar(c))
+                })
+            } else if (data.candles.length > 0) {
+                candleSeries.setData(data.candles)
+                volumeSeries.setData(data.candles.map(volumeBar))
+            }
+        })
+        const unsubscribeTicker = channelService.subscribe(`ticker:${symbol}`, (ticker) => {
+            setLastPrice(ticker.last_price)
+            setPriceChange(ticker.change_pct_24h)
+        })
 
         return () => {
-            clearInterval(refreshInterval)
+            unsubscribeCandles()
+            unsubscribeTicker()
             window.removeEventListener('resize', handleResize)
             chart.remove()
         }
@@ -0,0 +1,109 @@
+/**
+ * ChannelService - Push channels on the debate WebSocket
+ * (candles, ticker, positions, trades, status) instead of REST polling.
+ * A channel_snapshot replaces a channel's state; a channel_update is a delta
+ * merged into it. Handlers receive (state, frame) on every change.
+ */
+
+const isObject = (value) => value !== null && typeof value === 'object' && !Array.isArray(value)
+
+// Merge a status/ticker/positions delta: nested objects merge, null removes a key
+export function mergeDelta(state, delta) {
+    const next = { ...state }
+    for (const [key, value] of Object.entries(delta)) {
+        if (value === null) {
+            delete next[key]
+        } else if (isObject(value) && isObject(next[key])) {
+            next[key] = mergeDelta(next[key], value)
+        } else {
+            next[key] = value
+        }
+    }
+    return next
+}
+
+// Candles and trades deltas carry the new/changed rows instead
+function applyDelta(channel, state, delta) {
+    if (channel.startsWith('candles:')) {
+        const candles = [...state.candles]
+        for (const bar of delta.candles) {
+            if (candles.length && candles[candles.length - 1].time === bar.time) {
+                candles[candles.length - 1] = bar
+            } else {
+                candles.push(bar)
+            }
+        }
+        return { ...state, candles }
+    }
+    if (channel === 'trades') {
+        const ids = new Set(delta.trades.map(t => t.id))
+        return { trades: [...state.trades.filter(t => !ids.has(t.id)), ...delta.trades] }
+    }
+    return mergeDelta(state, delta)
+}
+
+class ChannelService {
+    constructor() {
+        this.socket = null
+        this.handlers = new Map() // channel -> Set of handlers
+        this.state = new Map() // channel -> latest state
+    }
+
+    // Use a (re)connected WebSocket and subscribe to every channel in use
+    attach(socket) {
+        this.socket = socket
+        this.state.clear()
+        this.send('subscribe', [...this.handlers.keys()])
+    }
+
+    detach() {
+        this.socket = null
+    }
+
+    // Returns an unsubscribe function (use as a useEffect cleanup)
+    subscribe(channel, handler) {
+        if (!this.handlers.has(channel)) {
+            this.handlers.set(channel, new Set())
+            this.send('subscribe', [channel])
+        }
+        this.handlers.get(channel).add(handler)
+        if (this.state.has(channel)) {
+            handler(this.state.get(channel), null)
+        }
+
+        return () => {
+            const handlers = this.handlers.get(channel)
+            if (!handlers) return
+            handlers.delete(handler)
+            if (handlers.size === 0) {
+                this.handlers.delete(channel)
+                this.state.delete(channel)
+                this.send('unsubscribe', [channel])
+            }
+        }
+    }
+
+    // Handle a channel frame from the socket; returns false for other messages
+    handleMessage(data) {
+        if (data.type !== 'channel_snapshot' && data.type !== 'channel_update') return false
+
+        const { channel } = data
+        const previous = this.state.get(channel)
+        if (data.type === 'channel_update' && !previous) return true // Snapshot still to come
+
+        const state = data.type === 'channel_snapshot' ? data.data : applyDelta(channel, previous, data.data)
+        this.state.set(channel, state)
+        this.handlers.get(channel)?.forEach(handler => handler(state, data))
+        return true
+    }
+
+    send(type, channels) {
+        if (!channels.length || this.socket?.readyState !== WebSocket.OPEN) return
+        this.socket.send(JSON.stringify({ type, channels }))
+    }
+}
+
+// Singleton instance
+const channelService = new ChannelService()
+
+export default channelService
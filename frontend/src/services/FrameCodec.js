@@ -0,0 +1,101 @@
+/**
+ * FrameCodec - Decoder for the compact "binary" WebSocket encoding
+ * (backend/api/frame_codec.py). Field names and frequent values arrive as
+ * one-byte ids into the dictionaries sent in the {"type": "encoding"}
+ * handshake; timestamps arrive as epoch milliseconds.
+ */
+
+const NULL = 0, FALSE = 1, TRUE = 2, INT = 3, FLOAT = 4, TIME = 5, WORD = 6
+const SHORT_STR = 7, STR = 8, LIST = 9, MAP = 10, TABLE = 11
+const INLINE_KEY = 0xff
+
+const textDecoder = new TextDecoder()
+
+class FrameDecoder {
+    constructor({ fields, values }) {
+        this.fields = fields
+        this.values = values
+    }
+
+    decode(buffer) {
+        this.view = new DataView(buffer)
+        this.bytes = new Uint8Array(buffer)
+        this.pos = 0
+        return this.read()
+    }
+
+    text(length) {
+        const value = textDecoder.decode(this.bytes.subarray(this.pos, this.pos + length))
+        this.pos += length
+        return value
+    }
+
+    key() {
+        const id = this.bytes[this.pos++]
+        if (id !== INLINE_KEY) return this.fields[id]
+        return this.text(this.bytes[this.pos++])
+    }
+
+    read() {
+        const { view } = this
+        const tag = this.bytes[this.pos++]
+        let value
+        switch (tag) {
+            case NULL: return null
+            case FALSE: return false
+            case TRUE: return true
+            case INT:
+                value = view.getInt32(this.pos, true)
+                this.pos += 4
+                return value
+            case FLOAT:
+            case TIME:
+                value = view.getFloat64(this.pos, true)
+                this.pos += 8
+                return value
+            case WORD: return this.values[this.bytes[this.pos++]]
+            case SHORT_STR: return this.text(this.bytes[this.pos++])
+            case STR: {
+                const length = view.getUint32(this.pos, true)
+                this.pos += 4
+                return this.text(length)
+            }
+            case LIST: {
+                const count = view.getUint32(this.pos, true)
+                this.pos += 4
+                const items = new Array(count)
+                for (let i = 0; i < count; i++) items[i] = this.read()
+                return items
+            }
+            case MAP: {
+                const count = view.getUint16(this.pos, true)
+                this.pos += 2
+                const result = {}
+                for (let i = 0; i < count; i++) {
+                    const key = this.key()
+                    result[key] = this.read()
+                }
+                return result
+            }
+            case TABLE: {
+                // Numeric rows (candles, order-book levels) packed as float64 columns
+                const columns = []
+                for (let count = this.bytes[this.pos++]; count > 0; count--) columns.push(this.key())
+                const rows = view.getUint32(this.pos, true)
+                this.pos += 4
+                const result = Array.from({ length: rows }, () => ({}))
+                for (const column of columns) {
+                    for (let i = 0; i < rows; i++) {
+                        result[i][column] = view.getFloat64(this.pos, true)
+                        this.pos += 8
+                    }
+                }
+                return result
+            }
+            default:
+                throw new Error(`Unknown frame tag ${tag} at byte ${this.pos - 1}`)
+        }
+    }
+}
+
+export default FrameDecoder